@@ -34,6 +34,8 @@ router.include_router(ai_insight_router)
 
 @router.on_event("startup")
 async def startup_event():
-    from crud.category import crud_category
+    from core.db import SessionLocal
+    from crud.category import get_crud_category
 
-    crud_category.add_default_categories()
+    with SessionLocal() as db:
+        get_crud_category(db=db).add_default_categories()
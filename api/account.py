@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 
 from api.dependencies.authorization import get_current_user
 from api.dependencies.service import get_account_service
-from models.user import User
+from schemas.user import AuthUser
 from schemas.account import AccountCreate, AccountResponse, AccountWithBalanceResponse
 from services import AccountService
 
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/accounts", tags=["Account"])
 async def create_account(
     data_obj: AccountCreate,
     account_service: AccountService = Depends(get_account_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await account_service.create_account(data_obj=data_obj, user_id=user.id)
 
@@ -24,7 +24,7 @@ async def create_account(
 )
 async def list_accounts(
     account_service: AccountService = Depends(get_account_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await account_service.list_accounts(user_id=user.id)
 
@@ -34,7 +34,7 @@ async def update_account(
     account_id: int,
     data_obj: AccountCreate,  # TODO: UPDATE THE SCHEMA
     account_service: AccountService = Depends(get_account_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await account_service.update_account(
         account_id=account_id, data_obj=data_obj, user_id=user.id
@@ -45,6 +45,6 @@ async def update_account(
 async def delete_account(
     account_id: int,
     account_service: AccountService = Depends(get_account_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await account_service.delete_account(account_id=account_id, user_id=user.id)
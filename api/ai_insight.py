@@ -3,7 +3,7 @@ from fastapi.responses import StreamingResponse
 
 from api.dependencies.authorization import get_current_user
 from api.dependencies.service import get_ai_insight_service
-from models.user import User
+from schemas.user import AuthUser
 from schemas.ai_schemas import NlRequest, NlResponse
 from schemas.chat import SessionChatResponse
 from services.ai_insight import AIInsightService
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/insights", tags=["Insight"])
 @router.post("/query", response_model=NlResponse)
 async def query_insight(
     query: NlRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     ai_insight_service: AIInsightService = Depends(get_ai_insight_service),
 ):
 
@@ -36,7 +36,7 @@ async def query_insight(
 
 @router.post("/create-session", response_model=SessionChatResponse)
 async def create_session(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     ai_insight_service: AIInsightService = Depends(get_ai_insight_service),
 ):
     session_id = await ai_insight_service.create_session(user_id=current_user.id)
@@ -45,7 +45,7 @@ async def create_session(
 
 @router.get("/messages")
 async def get_messages(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     ai_insight_service: AIInsightService = Depends(get_ai_insight_service),
 ):
     messages = await ai_insight_service.get_messages(user_id=current_user.id)
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, status, Request
 
 
-from api.dependencies.authorization import get_current_user
+from api.dependencies.authorization import (
+    get_current_user,
+    get_current_user_profile,
+    invalidate_auth_user,
+)
 from api.dependencies.service import get_auth_service
 from models.user import User
-from schemas.user import RegisterPayload, RegisterResponse
+from schemas.user import AuthUser, RegisterPayload, RegisterResponse, UserUpdate
 from services import AuthService
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -27,6 +31,20 @@ async def register(
     response_model=RegisterResponse,
 )
 async def get_user(
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_user_profile),
 ):
     return user
+
+
+@router.patch(
+    "/me",
+    response_model=RegisterResponse,
+)
+async def update_user(
+    data_obj: UserUpdate,
+    user: AuthUser = Depends(get_current_user),
+    auth_service: AuthService = Depends(get_auth_service),
+):
+    updated_user = await auth_service.update_user(user_id=user.id, data_obj=data_obj)
+    await invalidate_auth_user(user.uid)
+    return updated_user
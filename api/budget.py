@@ -4,6 +4,7 @@ from api.dependencies.authorization import get_current_user
 from api.dependencies.service import get_budget_service
 from schemas.budget import (
     BudgetCreate,
+    BudgetOverviewResponse,
     BudgetResponse,
     BudgetWithAmountResponse,
     TotalBudgetCreate,
@@ -35,7 +36,22 @@ async def retrieve_budgets(
     current_user=Depends(get_current_user),
     budget_service=Depends(get_budget_service),
 ):
-    return await budget_service.calculate_budget(user_id=current_user.id, period=period)
+    return await budget_service.calculate_budget(
+        user_id=current_user.id, period=period, timezone=current_user.timezone
+    )
+
+
+@router.get(
+    "/overview",
+    response_model=BudgetOverviewResponse,
+)
+async def get_budget_overview(
+    current_user=Depends(get_current_user),
+    budget_service=Depends(get_budget_service),
+):
+    return await budget_service.get_budget_overview(
+        user_id=current_user.id, timezone=current_user.timezone
+    )
 
 
 @router.delete(
@@ -63,7 +79,9 @@ async def get_total_budget(
     current_user=Depends(get_current_user),
     budget_service=Depends(get_budget_service),
 ):
-    return await budget_service.get_total_budget(user_id=current_user.id, period=period)
+    return await budget_service.get_total_budget(
+        user_id=current_user.id, period=period, timezone=current_user.timezone
+    )
 
 
 @router.post(
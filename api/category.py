@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, status
 
 from api.dependencies.authorization import get_current_user
 from api.dependencies.service import get_category_service
-from models.user import User
+from schemas.user import AuthUser
 from schemas.category import (
     CategoryCreate,
     CreateCategoryResponse,
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/categories", tags=["Categories"])
 async def create_category(
     category: CategoryCreate,
     category_service: CategoryService = Depends(get_category_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await category_service.create_user_category(category, user.id)
 
@@ -31,7 +31,7 @@ async def create_category(
 )
 async def get_categories(
     category_service: CategoryService = Depends(get_category_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await category_service.get_user_categories(user.id)
 
@@ -44,7 +44,7 @@ async def update_category(
     id: int,
     category: UserCategoryUpdate,
     category_service: CategoryService = Depends(get_category_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await category_service.update_user_category(
         user_id=user.id, data_obj=category, category_id=id
@@ -55,6 +55,6 @@ async def update_category(
 async def delete_category(
     id: int,
     category_service: CategoryService = Depends(get_category_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await category_service.delete_user_category(user_id=user.id, category_id=id)
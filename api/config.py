@@ -1,9 +1,7 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
-from core.externals.exchange_rate.exchangerate_api import (
-    get_exchange_rate,
-)
+from services.exchange_rate import exchange_rate_cache
 
 router = APIRouter(prefix="/config", tags=["Config"])
 
@@ -12,7 +10,7 @@ router = APIRouter(prefix="/config", tags=["Config"])
 async def get_exchange_rates(
     currency_code: str,
 ):
-    return await get_exchange_rate(currency_code)
+    return await exchange_rate_cache.get_rates(currency_code)
 
 
 @router.get("/health")
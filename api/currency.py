@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 
 from api.dependencies.authorization import get_current_user
 from api.dependencies.service import get_currency_service
-from models.user import User
+from schemas.user import AuthUser
 from schemas.currency import (
     CurrencyResponse,
     UserCurrencyCreate,
@@ -22,7 +22,7 @@ router = APIRouter(prefix="/currencies", tags=["Currency"])
 async def add_currency(
     data_obj: UserCurrencyCreate,
     currency_service: CurrencyService = Depends(get_currency_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await currency_service.add_currency(data_obj=data_obj, user_id=user.id)
 
@@ -33,9 +33,9 @@ async def add_currency(
 )
 async def list_currencies(
     currency_service: CurrencyService = Depends(get_currency_service),
-    # user: User = Depends(get_current_user),
+    # user: AuthUser = Depends(get_current_user),
 ):
-    return currency_service.crud_currency.get_all_currencies()
+    return await currency_service.crud_currency.get_all_currencies()
 
 
 @router.get(
@@ -44,9 +44,11 @@ async def list_currencies(
 )
 async def get_user_currencies(
     currency_service: CurrencyService = Depends(get_currency_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
-    return currency_service.crud_user_currency.get_user_currencies(user_id=user.id)
+    return await currency_service.crud_user_currency.get_user_currencies(
+        user_id=user.id
+    )
 
 
 @router.put(
@@ -55,7 +57,7 @@ async def get_user_currencies(
 async def update_default_currency(
     data_obj: UserCurrencyUpdate,
     account_service: CurrencyService = Depends(get_currency_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await account_service.update_default_currency(
         user_id=user.id, data_obj=data_obj
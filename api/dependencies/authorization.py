@@ -1,27 +1,80 @@
+import logging
 from datetime import datetime, timedelta, timezone
-from arq import ArqRedis
 from fastapi import Depends
+from redis.exceptions import RedisError
 
+from core.cache import TTLCache, redis_client
+from core.config import settings
 from core.exceptions import InvalidRequest
 from core.externals.firebase.auth_dep import verify_firebase_token
-from crud.user import CRUDAuthUser, get_crud_auth_user
-from task_queue.main import get_queue_connection
+from crud.user import AsyncCRUDAuthUser, get_async_crud_auth_user
 from models.user import User
+from schemas.user import AuthUser
+from services.user_activity import record_user_activity
+
+logger = logging.getLogger(__name__)
+
+auth_users = TTLCache(
+    maxsize=settings.USER_CONTEXT_LOCAL_MAXSIZE, ttl=settings.USER_CONTEXT_LOCAL_TTL
+)
+
+
+def _auth_user_key(uid: str) -> str:
+    return f"auth_user:{uid}"
+
+
+async def invalidate_auth_user(uid: str):
+    """Drop the cached caller here and in Redis, other processes see the change
+    once their short local entry expires."""
+    auth_users.pop(uid)
+    try:
+        await redis_client.delete(_auth_user_key(uid))
+    except RedisError as e:
+        logger.warning(f"Auth user cache invalidation failed: {e}")
 
 
 async def get_current_user(
     user: dict = Depends(verify_firebase_token),
-    crud_auth_user: CRUDAuthUser = Depends(get_crud_auth_user),
-    queue_connection: ArqRedis = Depends(get_queue_connection),
-) -> User:
-    user_data = crud_auth_user.get_user_by_uid(user["uid"])
-    if not user_data:
-        raise InvalidRequest("User not found")
+    crud_auth_user: AsyncCRUDAuthUser = Depends(get_async_crud_auth_user),
+) -> AuthUser:
+    key = _auth_user_key(user["uid"])
+    user_data = auth_users.get(user["uid"])
+    if user_data is None:
+        try:
+            raw = await redis_client.get(key)
+        except RedisError as e:
+            logger.warning(f"Auth user cache read failed: {e}")
+            raw = None
+        if raw is not None:
+            user_data = AuthUser.model_validate_json(raw)
+    if user_data is None:
+        row = await crud_auth_user.get_auth_user_by_uid(user["uid"])
+        if not row:
+            raise InvalidRequest("User not found")
+        user_data = AuthUser.model_validate(row)
+        try:
+            await redis_client.set(
+                key,
+                user_data.model_dump_json(),
+                ex=settings.USER_CONTEXT_CACHE_TTL,
+            )
+        except RedisError as e:
+            logger.warning(f"Auth user cache write failed: {e}")
+    auth_users.set(user["uid"], user_data)
 
-    if user_data.last_activity_time and datetime.now(
+    if not user_data.last_activity_time or datetime.now(
         timezone.utc
-    ) - user_data.last_activity_time > timedelta(minutes=20):
-        await queue_connection.enqueue_job(
-            "update_user_last_activity", user_id=user_data.id
-        )
+    ) - user_data.last_activity_time > timedelta(
+        seconds=settings.USER_ACTIVITY_INTERVAL
+    ):
+        await record_user_activity(user_data.id)
     return user_data
+
+
+async def get_current_user_profile(
+    user: AuthUser = Depends(get_current_user),
+    crud_auth_user: AsyncCRUDAuthUser = Depends(get_async_crud_auth_user),
+) -> User:
+    """The full user with subscriptions, currencies and categories loaded, for
+    endpoints that return them."""
+    return await crud_auth_user.get_user_profile(user.id)
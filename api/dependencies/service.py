@@ -1,23 +1,26 @@
 from core.externals.mono.mono_client import get_mono_client
 from core.externals.plaid.plaid_client import get_plaid_client
-from crud.account import get_crud_account
+from crud.account import get_async_crud_account, get_crud_account
 from fastapi.params import Depends
-from crud.budget import get_crud_budget
+from crud.budget import get_async_crud_budget, get_async_crud_daily_spend
 from crud.category import (
-    get_crud_category,
-    get_crud_user_category,
+    get_async_crud_category,
+    get_async_crud_user_category,
 )
 from crud.chat import get_crud_chat, get_crud_session
 from crud.currency import (
+    get_async_crud_currency,
+    get_async_crud_user_currency,
     get_crud_currency,
     get_crud_user_currency,
 )
+from crud.outbox import get_async_crud_outbox
 from crud.planner import get_crud_planner
-from crud.rules import get_crud_rules
+from crud.rules import get_async_crud_rules
 from crud.subscription import get_crud_subscription_plan, get_crud_user_subscription
-from crud.summary import get_crud_total_summary
-from crud.transaction import get_crud_transaction
-from crud.user import get_crud_auth_user
+from crud.summary import get_async_crud_total_summary
+from crud.transaction import get_async_crud_transaction
+from crud.user import get_async_crud_auth_user, get_crud_auth_user
 from services import (
     PlannerService,
     TransactionService,
@@ -37,9 +40,9 @@ from task_queue.main import get_queue_connection
 
 
 def get_account_service(
-    crud_account=Depends(get_crud_account),
-    crud_currency=Depends(get_crud_currency),
-    crud_user_currency=Depends(get_crud_user_currency),
+    crud_account=Depends(get_async_crud_account),
+    crud_currency=Depends(get_async_crud_currency),
+    crud_user_currency=Depends(get_async_crud_user_currency),
 ) -> AccountService:
     return AccountService(
         crud_account=crud_account,
@@ -49,7 +52,7 @@ def get_account_service(
 
 
 def get_auth_service(
-    crud_auth_user=Depends(get_crud_auth_user),
+    crud_auth_user=Depends(get_async_crud_auth_user),
     crud_account=Depends(get_crud_account),
     mono_client=Depends(get_mono_client),
     queue_connection=Depends(get_queue_connection),
@@ -67,15 +70,15 @@ def get_auth_service(
 
 
 def get_category_service(
-    crud_category=Depends(get_crud_category),
-    crud_user_category=Depends(get_crud_user_category),
+    crud_category=Depends(get_async_crud_category),
+    crud_user_category=Depends(get_async_crud_user_category),
 ):
     return CategoryService(crud_category, crud_user_category)
 
 
 def get_currency_service(
-    crud_currency=Depends(get_crud_currency),
-    crud_user_currency=Depends(get_crud_user_currency),
+    crud_currency=Depends(get_async_crud_currency),
+    crud_user_currency=Depends(get_async_crud_user_currency),
     queue_connection=Depends(get_queue_connection),
 ) -> CurrencyService:
     return CurrencyService(crud_currency, crud_user_currency, queue_connection)
@@ -102,8 +105,8 @@ def get_external_service(
 
 
 def get_transaction_rule_service(
-    crud_rules=Depends(get_crud_rules),
-    crud_user_category=Depends(get_crud_user_category),
+    crud_rules=Depends(get_async_crud_rules),
+    crud_user_category=Depends(get_async_crud_user_category),
 ) -> TransactionRuleService:
     return TransactionRuleService(
         crud_rules=crud_rules,
@@ -122,27 +125,28 @@ async def get_subscription_service(
 
 
 def get_budget_service(
-    crud_budget=Depends(get_crud_budget),
-    crud_transaction=Depends(get_crud_transaction),
+    crud_budget=Depends(get_async_crud_budget),
+    crud_daily_spend=Depends(get_async_crud_daily_spend),
     currency_service=Depends(get_currency_service),
     category_service=Depends(get_category_service),
 ) -> BudgetService:
     return BudgetService(
         crud_budget=crud_budget,
-        crud_transaction=crud_transaction,
+        crud_daily_spend=crud_daily_spend,
         currency_service=currency_service,
         category_service=category_service,
     )
 
 
 def get_transaction_service(
-    crud_transaction=Depends(get_crud_transaction),
+    crud_transaction=Depends(get_async_crud_transaction),
     queue_connection=Depends(get_queue_connection),
-    crud_user_currency=Depends(get_crud_user_currency),
-    crud_account=Depends(get_crud_account),
-    crud_user_category=Depends(get_crud_user_category),
-    crud_rules=Depends(get_crud_rules),
-    crud_category=Depends(get_crud_category),
+    crud_user_currency=Depends(get_async_crud_user_currency),
+    crud_account=Depends(get_async_crud_account),
+    crud_user_category=Depends(get_async_crud_user_category),
+    crud_rules=Depends(get_async_crud_rules),
+    crud_category=Depends(get_async_crud_category),
+    crud_outbox=Depends(get_async_crud_outbox),
     mono_client=Depends(get_mono_client),
     account_service=Depends(get_account_service),
     currency_service=Depends(get_currency_service),
@@ -157,6 +161,7 @@ def get_transaction_service(
         mono_client=mono_client,
         crud_rules=crud_rules,
         crud_category=crud_category,
+        crud_outbox=crud_outbox,
         account_service=account_service,
         currency_service=currency_service,
         category_service=category_service,
@@ -166,8 +171,8 @@ def get_transaction_service(
 def get_planner_service(
     crud_planner=Depends(get_crud_planner),
     crud_user_currency=Depends(get_crud_user_currency),
-    crud_category=Depends(get_crud_category),
-    crud_user_category=Depends(get_crud_user_category),
+    crud_category=Depends(get_async_crud_category),
+    crud_user_category=Depends(get_async_crud_user_category),
     transaction_service=Depends(get_transaction_service),
     category_service=Depends(get_category_service),
     account_service=Depends(get_account_service),
@@ -186,19 +191,17 @@ def get_planner_service(
 
 
 def get_account_summary_service(
-    crud_total_summary=Depends(get_crud_total_summary),
+    crud_total_summary=Depends(get_async_crud_total_summary),
     account_service=Depends(get_account_service),
-    transaction_service=Depends(get_transaction_service),
 ) -> AccountSummaryService:
     return AccountSummaryService(
         crud_total_summary=crud_total_summary,
         account_service=account_service,
-        transaction_service=transaction_service,
     )
 
 
 def get_ai_insight_service(
-    crud_transaction=Depends(get_crud_transaction),
+    crud_transaction=Depends(get_async_crud_transaction),
     crud_user_currency=Depends(get_crud_user_currency),
     crud_chat=Depends(get_crud_chat),
     crud_session=Depends(get_crud_session),
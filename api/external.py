@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends
 
 from api.dependencies.authorization import get_current_user
 from api.dependencies.service import get_external_service
-from models.user import User
+from schemas.user import AuthUser
 from schemas.account import MonoAccountCreate
 from services.external import ExternalService
 
@@ -12,7 +12,7 @@ router = APIRouter(prefix="", tags=["Plaid Mono"])
 
 @router.post("/plaid/link-token")
 async def plaid_create_link_token(
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     external_service: ExternalService = Depends(get_external_service),
 ):
     result = await external_service.plaid_create_link_token(user)
@@ -23,7 +23,7 @@ async def plaid_create_link_token(
 @router.post("/plaid/exchange-token")
 async def exchange_public_token(
     public_token: str,
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     external_service: ExternalService = Depends(get_external_service),
 ):
     return await external_service.plaid_exchange_public_token(public_token)
@@ -32,7 +32,7 @@ async def exchange_public_token(
 @router.get("/plaid/transactions")
 async def get_transactions(
     access_token: str,
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     external_service: ExternalService = Depends(get_external_service),
 ):
     result = await external_service.get_transactions(access_token)
@@ -47,7 +47,7 @@ async def get_transactions(
 async def exchange_code(
     code: str,
     start_date: date = None,
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     external_service: ExternalService = Depends(get_external_service),
 ):
 
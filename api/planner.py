@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query, status
 from api.dependencies.authorization import get_current_user
 from api.dependencies.service import get_planner_service
-from models.user import User
+from schemas.user import AuthUser
 from schemas.enums import PlannerTypeEnum
 from schemas.planner import (
     PlannerAmountUpdate,
@@ -25,7 +25,7 @@ router = APIRouter(prefix="/planner", tags=["Planner"])
 async def create_planner(
     data: PlannerCreate,
     planner_service: PlannerService = Depends(get_planner_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await planner_service.create_planner(user_id=user.id, data_obj=data)
 
@@ -35,7 +35,7 @@ async def create_planner(
     response_model=list[PlannerResponse],
 )
 async def list_planners(
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     type: PlannerTypeEnum | None = Query(None),
     planner_service: PlannerService = Depends(get_planner_service),
 ):
@@ -48,7 +48,7 @@ async def list_planners(
 )
 async def get_planner(
     id: str,
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     planner_service: PlannerService = Depends(get_planner_service),
 ):
     return await planner_service.get_single_planner(user_id=user.id, id=id)
@@ -58,7 +58,7 @@ async def get_planner(
 async def update_planner_amount(
     id: int,
     data: PlannerAmountUpdate,
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     planner_service: PlannerService = Depends(get_planner_service),
 ):
     return await planner_service.update_planner_amount(
@@ -70,7 +70,7 @@ async def update_planner_amount(
 async def update_planner(
     id: int,
     data: PlannerUpdate,
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     planner_service: PlannerService = Depends(get_planner_service),
 ):
     return await planner_service.update_planner(user_id=user.id, id=id, data_obj=data)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, status
 
 from api.dependencies.authorization import get_current_user
 from api.dependencies.service import get_transaction_rule_service
-from models.user import User
+from schemas.user import AuthUser
 from schemas.rules import RuleCreate, RuleResponse
 from services.rules import TransactionRuleService
 
@@ -16,7 +16,7 @@ router = APIRouter(prefix="/rules", tags=["Rules"])
 )
 async def create_rule(
     rule_data: RuleCreate,
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     service: TransactionRuleService = Depends(get_transaction_rule_service),
 ):
     return await service.create_rule(data_obj=rule_data, user_id=user.id)
@@ -27,7 +27,7 @@ async def create_rule(
     response_model=list[RuleResponse],
 )
 async def list_rules(
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     service: TransactionRuleService = Depends(get_transaction_rule_service),
 ):
     return await service.list_rules_by_user_id(user_id=user.id)
@@ -39,7 +39,7 @@ async def list_rules(
 )
 async def delete_rule(
     rule_id: int,
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     service: TransactionRuleService = Depends(get_transaction_rule_service),
 ):
     await service.delete_rule(rule_id=rule_id, user_id=user.id)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, status
 
 from api.dependencies.authorization import get_current_user
 from api.dependencies.service import get_subscription_service
-from models.user import User
+from schemas.user import AuthUser
 from schemas.subscription import (
     SubscriptionPlanResponse,
     UserSubscriptionCreate,
@@ -32,7 +32,7 @@ async def list_subscriptions(
 )
 async def create_subscription(
     data_obj: UserSubscriptionCreate,
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
     subscription_service: SubscriptionService = Depends(get_subscription_service),
 ):
     return await subscription_service.create_subscription(
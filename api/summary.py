@@ -1,7 +1,7 @@
 from datetime import date
 from fastapi import Depends, APIRouter, Query
 from api.dependencies.authorization import get_current_user
-from models.user import User
+from schemas.user import AuthUser
 from schemas.summary import SummaryResponse
 from services import AccountSummaryService
 from api.dependencies.service import get_account_summary_service
@@ -21,6 +21,6 @@ async def get_account_summary(
     account_summary_service: AccountSummaryService = Depends(
         get_account_summary_service
     ),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await account_summary_service.get_account_summary(user_id=user.id, date=date)
@@ -1,10 +1,16 @@
 from datetime import date
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 
 from api.dependencies.authorization import get_current_user
 from api.dependencies.service import get_transaction_service
-from models.user import User
-from schemas.transaction import TransactionCreate, TransactionResponse
+from schemas.user import AuthUser
+from schemas.transaction import (
+    TransactionCreate,
+    TransactionPageResponse,
+    TransactionResponse,
+)
 from services.transaction import TransactionService
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
@@ -18,7 +24,7 @@ router = APIRouter(prefix="/transactions", tags=["Transactions"])
 async def create_transaction(
     transaction_data: TransactionCreate,
     transaction_service: TransactionService = Depends(get_transaction_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await transaction_service.create_transaction(transaction_data, user.id)
 
@@ -32,11 +38,49 @@ async def get_user_transactions(
         date.today(), description="Date to filter the summary by (YYYY-MM-DD)"
     ),
     transaction_service: TransactionService = Depends(get_transaction_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await transaction_service.list_user_transactions(user.id, date)
 
 
+@router.get(
+    "/paginated",
+    response_model=TransactionPageResponse,
+)
+async def get_user_transactions_page(
+    date: date = Query(
+        date.today(), description="Date to filter the summary by (YYYY-MM-DD)"
+    ),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor returned by the previous page"
+    ),
+    transaction_service: TransactionService = Depends(get_transaction_service),
+    user: AuthUser = Depends(get_current_user),
+):
+    return await transaction_service.list_user_transactions_page(
+        user.id, date, limit=limit, cursor=cursor
+    )
+
+
+@router.get("/stream")
+async def stream_user_transactions(
+    date: date = Query(
+        date.today(), description="Date to filter the summary by (YYYY-MM-DD)"
+    ),
+    transaction_service: TransactionService = Depends(get_transaction_service),
+    user: AuthUser = Depends(get_current_user),
+):
+    async def ndjson():
+        async for transaction in transaction_service.stream_user_transactions(
+            user.id, date
+        ):
+            yield TransactionResponse.model_validate(transaction).model_dump_json()
+            yield "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 @router.get(
     "/account/{account_id}",
     response_model=list[TransactionResponse],
@@ -44,7 +88,7 @@ async def get_user_transactions(
 async def get_transactions_by_account(
     account_id: int,
     transaction_service: TransactionService = Depends(get_transaction_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await transaction_service.get_one_account_transactions(account_id, user.id)
 
@@ -56,7 +100,7 @@ async def get_transactions_by_account(
 async def get_transaction(
     transaction_id: int,
     transaction_service: TransactionService = Depends(get_transaction_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     return await transaction_service.get_single_transaction(transaction_id, user.id)
 
@@ -65,6 +109,6 @@ async def get_transaction(
 async def delete_transaction(
     transaction_id: int,
     transaction_service: TransactionService = Depends(get_transaction_service),
-    user: User = Depends(get_current_user),
+    user: AuthUser = Depends(get_current_user),
 ):
     await transaction_service.delete_transaction(transaction_id, user.id)
@@ -10,6 +10,12 @@ class KafkaConfig(BaseSettings):
     KAFKA_SERVICE_CERT: str = ""
     KAFKA_SERVICE_KEY: str = ""
     KAFKA_URL: str = ""
+    KAFKA_LINGER_MS: int = 20
+    KAFKA_BATCH_SIZE: int = 64 * 1024
+    KAFKA_COMPRESSION_TYPE: str = "lz4"
+    KAFKA_QUEUE_MAX_MESSAGES: int = 100_000
+    KAFKA_QUEUE_FULL_TIMEOUT: float = 5.0
+    KAFKA_FLUSH_TIMEOUT: float = 10.0
 
     class Config:
         env_file = env_path
@@ -20,6 +26,8 @@ class Settings(BaseSettings):
     DATABASE_URL: str = ""
     MONO_BASE_URL: str = "https://api.withmono.com/v2"
     MONO_SECRET_KEY: str = ""
+    # Transaction pages requested from Mono at once during a sync
+    MONO_PAGE_CONCURRENCY: int = 4
     FIREBASE_ADMIN_SDK_JSON_PATH: str = ""
     FIREBASE_SERVICE_ACCOUNT_JSON: str = ""
 
@@ -28,6 +36,26 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: str = ""
+    REDIS_MAX_CONNECTIONS: int = 50
+
+    # Shared clients for Mono, Plaid, exchange rates and the AI service
+    HTTP_TIMEOUT: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_MAX_RETRIES: int = 2
+    HTTP_RETRY_BACKOFF: float = 0.5
+    HTTP_RETRY_BACKOFF_MAX: float = 5.0
+
+    USER_CONTEXT_CACHE_TTL: int = 300
+    USER_CONTEXT_LOCAL_TTL: float = 5.0
+    USER_CONTEXT_LOCAL_MAXSIZE: int = 10_000
+    USER_CONTEXT_REFRESH_INTERVAL: float = 5.0
+    AUTH_TOKEN_CACHE_TTL: float = 300.0
+    AUTH_TOKEN_CACHE_MAXSIZE: int = 10_000
+    # Seconds between last_activity_time writes for the same user
+    USER_ACTIVITY_INTERVAL: int = 20 * 60
 
     PLAID_CLIENT_ID: str = ""
     PLAID_SECRET: str = ""
@@ -38,6 +66,21 @@ class Settings(BaseSettings):
 
     EXCHANGE_API_KEY: str = ""
     EXCHANGE_RATE_BASE_URL: str = "https://v6.exchangerate-api.com/v6/"
+    # The worker refreshes rates hourly; older tables are served while refreshing
+    EXCHANGE_RATE_STALE_AFTER: float = 2 * 60 * 60
+    EXCHANGE_RATE_LOCAL_TTL: float = 60.0
+    EXCHANGE_RATE_CACHE_TTL: int = 7 * 24 * 60 * 60
+    # How far back the nightly job rebuilds daily_spend from transactions
+    DAILY_SPEND_RECONCILE_DAYS: int = 35
+    # Users per reconcile job, each job has to finish within arq's job_timeout
+    DAILY_SPEND_RECONCILE_CHUNK_SIZE: int = 200
+    # Fractions of a budget that trigger an alert when spend crosses them
+    BUDGET_ALERT_THRESHOLDS: list[float] = [0.8, 1.0]
+    BUDGET_ALERT_BATCH_SIZE: int = 500
+    BUDGET_ALERT_POLL_TIMEOUT: float = 1.0
+    # Per-user running totals are reseeded from daily_spend this often
+    BUDGET_ALERT_STATE_TTL: int = 10 * 60
+    BUDGET_ALERT_STATE_MAXSIZE: int = 100_000
 
     KAFKA_CONFIG: KafkaConfig = KafkaConfig()
 
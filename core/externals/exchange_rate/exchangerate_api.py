@@ -1,12 +1,11 @@
-from httpx import AsyncClient
-
 from core import settings
 from core.exceptions import InvalidRequest
+from core.http import get_http_client
 
 
 class ExchangeRateClient:
     def __init__(self):
-        self.client = AsyncClient(base_url=settings.EXCHANGE_RATE_BASE_URL)
+        self.client = get_http_client("exchange_rate", settings.EXCHANGE_RATE_BASE_URL)
         self.api_key = settings.EXCHANGE_API_KEY
 
     async def get_exchange_rate(self, target_currency_code: str) -> dict:
@@ -1,14 +1,39 @@
+import asyncio
+import hashlib
+import logging
+import time
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 import firebase_admin
-from firebase_admin import auth
+from firebase_admin import auth, _token_gen
+from core.cache import TTLCache
+from core.config import settings
 from .firebase_init import init_firebase
 
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer(auto_error=False)
 firebase_app = init_firebase()
 
+# Verified claims keyed by token hash, kept until the token expires (capped so
+# a disabled user is locked out within AUTH_TOKEN_CACHE_TTL)
+verified_tokens = TTLCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_MAXSIZE, ttl=settings.AUTH_TOKEN_CACHE_TTL
+)
+
+
+def warm_public_keys():
+    """Fetch Google's signing certs into the verifier's HTTP cache ahead of the
+    first request, so it isn't paid by whoever authenticates first."""
+    try:
+        token_verifier = auth._get_client(firebase_app)._token_verifier
+        token_verifier.request(_token_gen.ID_TOKEN_CERT_URI)
+    except Exception as e:
+        logger.warning(f"Could not pre-fetch Firebase public keys: {e}")
+
 
-def verify_firebase_token(
+async def verify_firebase_token(
     creds: HTTPAuthorizationCredentials = Depends(security),
     check_revoked: bool = False,
 ):
@@ -19,15 +44,27 @@ def verify_firebase_token(
         )
 
     token = creds.credentials
+    token_hash = hashlib.sha256(token.encode()).digest()
+    if not check_revoked:
+        decoded = verified_tokens.get(token_hash)
+        if decoded is not None and decoded["exp"] > time.time():
+            return decoded
+
     try:
-        decoded = auth.verify_id_token(
-            token, app=firebase_app, check_revoked=check_revoked
+        # Signature checks and the occasional cert refresh block, keep them
+        # off the event loop
+        decoded = await asyncio.to_thread(
+            auth.verify_id_token, token, app=firebase_app, check_revoked=check_revoked
         )
-        # decoded contains uid, email, etc.
-        return decoded
     except Exception:
 
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired Firebase ID token",
         )
+
+    # decoded contains uid, email, etc.
+    ttl = min(decoded["exp"] - time.time(), settings.AUTH_TOKEN_CACHE_TTL)
+    if ttl > 0:
+        verified_tokens.set(token_hash, decoded, ttl=ttl)
+    return decoded
@@ -1,16 +1,19 @@
+import asyncio
+import math
 from datetime import date
-from httpx import AsyncClient
+from typing import AsyncIterator
 
 from dateutil.relativedelta import relativedelta
 from core import settings
 from core.exceptions import InvalidRequest
+from core.http import get_http_client
 from core.externals.schema import MonoTransactionSchema
 from schemas.account import MonoAccountResponse
 
 
 class MonoClient:
     def __init__(self):
-        self.client = AsyncClient(base_url=settings.MONO_BASE_URL)
+        self.client = get_http_client("mono", settings.MONO_BASE_URL)
         self.header = {"mono-sec-key": settings.MONO_SECRET_KEY}
 
     async def exchange_code(self, code: str):
@@ -37,26 +40,80 @@ class MonoClient:
         # print(f"Return data: {rsp.json()}")
         return MonoAccountResponse(**rsp.json().get("data", {}))
 
-    async def get_transactions(
+    async def _get_transaction_page(
+        self, account_id: str, start_str: str, end_str: str, page: int
+    ) -> dict:
+        rsp = await self.client.get(
+            url=f"/accounts/{account_id}/transactions",
+            params={
+                "start_date": start_str,
+                "end_date": end_str,
+                "paginate": "true",
+                "page": page,
+            },
+            headers=self.header,
+        )
+        if rsp.status_code != 200:
+            raise InvalidRequest(
+                message=rsp.json().get("message", "Failed to retrieve transactions")
+            )
+        return rsp.json()
+
+    async def get_transaction_pages(
         self,
         account_id: str,
         start_date: date = None,
-        end_date: date = date.today(),
-    ):
+        end_date: date = None,
+    ) -> AsyncIterator[list[MonoTransactionSchema]]:
+        """Yield the account's transactions a page at a time.
+
+        The first page is yielded before the rest are requested. Later pages
+        are fetched MONO_PAGE_CONCURRENCY at a time and yielded as they
+        arrive, so only that many are ever held in memory.
+        """
         if not start_date:
             start_date = date.today() - relativedelta(months=1)
         start_str = start_date.strftime("%d-%m-%Y")
-        end_str = end_date.strftime("%d-%m-%Y")
+        end_str = (end_date or date.today()).strftime("%d-%m-%Y")
 
-        rsp = await self.client.get(
-            url=f"/accounts/{account_id}/transactions?start_date={start_str}&end_date={end_str}",
-            headers={"mono-sec-key": settings.MONO_SECRET_KEY},
+        first_page = await self._get_transaction_page(
+            account_id, start_str, end_str, page=1
         )
-        if rsp.status_code != 200:
-            raise InvalidRequest(
-                message=rsp.json().get("message", "Failed to retrieve transactions")
-            )
-        return [MonoTransactionSchema(**tx) for tx in rsp.json().get("data", {})]
+        data = first_page.get("data") or []
+        if not data:
+            return
+        yield [MonoTransactionSchema(**tx) for tx in data]
+
+        total = (first_page.get("meta") or {}).get("total") or len(data)
+        page_count = math.ceil(total / len(data))
+        next_page = 2
+        pending = set()
+        try:
+            while next_page <= page_count or pending:
+                while (
+                    next_page <= page_count
+                    and len(pending) < settings.MONO_PAGE_CONCURRENCY
+                ):
+                    pending.add(
+                        asyncio.create_task(
+                            self._get_transaction_page(
+                                account_id, start_str, end_str, page=next_page
+                            )
+                        )
+                    )
+                    next_page += 1
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield [
+                        MonoTransactionSchema(**tx)
+                        for tx in task.result().get("data") or []
+                    ]
+        finally:
+            # The consumer stopped early or a page failed
+            for task in pending:
+                task.cancel()
 
 
 def get_mono_client() -> MonoClient:
@@ -1,7 +1,7 @@
-import httpx
 from datetime import datetime, timedelta
 from core.config import settings
 from core.exceptions import InvalidRequest
+from core.http import get_http_client
 from core.externals.schema import (
     PlaidAccountResponse,
     PlaidExchangeTokenResponse,
@@ -13,7 +13,7 @@ class PlaidClient:
     def __init__(self):
         self.env = settings.PLAID_ENV
         self.base_url = self._get_base_url()
-        self.client = httpx.AsyncClient(base_url=self.base_url)
+        self.client = get_http_client("plaid", self.base_url)
         self.client_id = settings.PLAID_CLIENT_ID
         self.secret = settings.PLAID_SECRET
 
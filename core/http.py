@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import random
+from typing import Optional
+
+import httpx
+import logfire
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Safe to resend even if the first attempt reached the server
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+requests_sent = logfire.metric_counter(
+    "http.client.requests", unit="1", description="Requests sent to external APIs"
+)
+connections_opened = logfire.metric_counter(
+    "http.client.connections_opened",
+    unit="1",
+    description="New connections opened, requests minus these reused a pooled one",
+)
+request_retries = logfire.metric_counter(
+    "http.client.retries", unit="1", description="Requests retried after a failure"
+)
+
+
+class RetryTransport(httpx.AsyncHTTPTransport):
+    """Pooled transport that retries transient failures with jittered backoff.
+
+    Connection failures are retried for every method, since nothing reached
+    the server. Timeouts, dropped connections and 429/5xx gateway responses
+    are only retried for idempotent methods.
+    """
+
+    def __init__(self, name: str, max_retries: int, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+        self.max_retries = max_retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attributes = {"client": self.name}
+
+        async def trace(event_name: str, info: dict):
+            if event_name == "connection.connect_tcp.complete":
+                connections_opened.add(1, attributes)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            requests_sent.add(1, attributes)
+            try:
+                response = await super().handle_async_request(request)
+            except httpx.ConnectError:
+                if attempt >= self.max_retries:
+                    raise
+            except (httpx.TimeoutException, httpx.RemoteProtocolError):
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+            else:
+                if (
+                    not idempotent
+                    or response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.max_retries
+                ):
+                    return response
+                await response.aclose()
+
+            attempt += 1
+            request_retries.add(1, attributes)
+            # Full jitter keeps retries from many workers from lining up
+            backoff = min(
+                settings.HTTP_RETRY_BACKOFF_MAX,
+                settings.HTTP_RETRY_BACKOFF * 2 ** (attempt - 1),
+            )
+            logger.warning(
+                f"Retrying {request.method} {request.url.path} on {self.name} "
+                f"(attempt {attempt} of {self.max_retries})"
+            )
+            await asyncio.sleep(random.uniform(0, backoff))
+
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(
+    name: str, base_url: str, timeout: Optional[float] = None
+) -> httpx.AsyncClient:
+    """The process-wide client for one external API, created on first use.
+
+    Shared by the API and the worker so connections are kept alive and reused
+    instead of paying TCP and TLS setup on every call.
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(
+                timeout or settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT
+            ),
+            transport=RetryTransport(
+                name=name,
+                max_retries=settings.HTTP_MAX_RETRIES,
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+                ),
+            ),
+        )
+        _clients[name] = client
+    return client
+
+
+async def close_http_clients():
+    clients = list(_clients.values())
+    _clients.clear()
+    await asyncio.gather(*(client.aclose() for client in clients))
@@ -0,0 +1,5 @@
+from core import settings
+
+BUDGET_ALERT = (
+    "budget.alert.dev" if settings.ENVIRONMENT == "dev" else "budget.alert.prod"
+)
@@ -1,10 +1,13 @@
 from typing import Optional
-from core.db import get_db
-from crud.base import CRUDBase
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.db import get_async_db, get_db
+from crud.base import AsyncCRUDBase, CRUDBase
 from models.account import Account
 from models.currency import UserCurrency
 from schemas.enums import AccountTypeEnum
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import Session, joinedload
 
 
 class CRUDAccount(CRUDBase[Account]):
@@ -58,11 +61,60 @@ class CRUDAccount(CRUDBase[Account]):
         )
 
 
-db_session = next(get_db())
+class AsyncCRUDAccount(AsyncCRUDBase[Account]):
 
+    def _get_account_query_by_user_id(self, user_id: int):
+        return select(Account).filter(
+            Account.user_id == user_id,
+            Account.is_deleted == False,
+        )
 
-def get_crud_account() -> CRUDAccount:
+    async def get_by_account_number(self, account_number: str) -> Optional[Account]:
+        return await self._first(
+            select(Account).filter(
+                Account.account_number == account_number,
+                Account.is_deleted == False,
+            )
+        )
+
+    async def get_accounts(self, user_id: int) -> list[Account]:
+        return await self._all(self._get_account_query_by_user_id(user_id))
+
+    async def get_public_accounts(self, user_id: int) -> list[Account]:
+        return await self._all(
+            self._get_account_query_by_user_id(user_id)
+            .filter(Account.account_type != AccountTypeEnum.DEFAULT_PRIVATE)
+            .options(
+                joinedload(Account.user_currency).joinedload(UserCurrency.currency)
+            )
+        )
+
+    async def get_account_by_id(
+        self, account_id: int, user_id: int
+    ) -> Optional[Account]:
+        return await self._first(
+            self._get_account_query_by_user_id(user_id).filter(
+                Account.id == account_id,
+                Account.account_type != AccountTypeEnum.DEFAULT_PRIVATE,
+            )
+        )
+
+    async def get_automatic_accounts(self, user_id: int) -> list[Account]:
+        return await self._all(
+            self._get_account_query_by_user_id(user_id).filter(
+                Account.account_type == AccountTypeEnum.AUTOMATIC,
+            )
+        )
+
+
+def get_crud_account(db: Session = Depends(get_db)) -> CRUDAccount:
     return CRUDAccount(
         model=Account,
-        db=db_session,
+        db=db,
     )
+
+
+def get_async_crud_account(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDAccount:
+    return AsyncCRUDAccount(model=Account, db=db)
@@ -2,7 +2,9 @@ from typing import Type, TypeVar, Generic
 
 from pydantic import BaseModel
 
-from core.db import get_db, Base
+from core.db import Base
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -12,7 +14,7 @@ class CRUDBase(Generic[ModelType]):
     def __init__(
         self,
         model: Type[ModelType],
-        db: Session = next(get_db()),
+        db: Session,
     ):
         self.db = db
         self.model = model
@@ -68,3 +70,88 @@ class CRUDBase(Generic[ModelType]):
         existing_obj.delete(synchronize_session=False)
         self.db.commit()
         return None
+
+
+class AsyncCRUDBase(Generic[ModelType]):
+    def __init__(
+        self,
+        model: Type[ModelType],
+        db: AsyncSession,
+    ):
+        self.db = db
+        self.model = model
+
+    async def create(self, data_obj: dict, commit: bool = True) -> ModelType:
+        if isinstance(data_obj, BaseModel):
+            data_obj = data_obj.model_dump()
+
+        data_obj = self.model(**data_obj)
+        try:
+            self.db.add(data_obj)
+            # commit=False only flushes, leaving the caller's transaction open
+            if commit:
+                await self.db.commit()
+            else:
+                await self.db.flush()
+            await self.db.refresh(data_obj)
+        except Exception:
+            await self.db.rollback()
+            raise
+        return data_obj
+
+    async def get(self, id: int) -> ModelType | None:
+        return await self._first(self._get_query_by_id(id))
+
+    async def _all(self, query) -> list[ModelType]:
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def _first(self, query) -> ModelType | None:
+        result = await self.db.execute(query)
+        return result.scalars().first()
+
+    async def bulk_insert(
+        self, data_obj: list[dict], commit: bool = True
+    ) -> list[ModelType]:
+        data_list = [self.model(**data) for data in data_obj]
+        try:
+            self.db.add_all(data_list)
+            if commit:
+                await self.db.commit()
+            else:
+                await self.db.flush()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        return data_list
+
+    def _get_query_by_id(self, id: int):
+        return select(self.model).filter(self.model.id == id)
+
+    async def update(self, id: int, data_obj: dict) -> ModelType | None:
+        if isinstance(data_obj, BaseModel):
+            data_obj = data_obj.model_dump(exclude_unset=True)
+
+        if not await self.get(id):
+            return None
+
+        await self.db.execute(
+            update(self.model).where(self.model.id == id).values(**data_obj)
+        )
+        await self.db.commit()
+        return await self._first(
+            self._get_query_by_id(id).execution_options(populate_existing=True)
+        )
+
+    async def delete(self, id):
+        if not await self.get(id):
+            return None
+
+        await self.db.execute(
+            delete(self.model)
+            .where(self.model.id == id)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return None
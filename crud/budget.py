@@ -1,48 +1,296 @@
-from typing import Optional
-from sqlalchemy.orm import joinedload
+from datetime import date
+from typing import Iterable, Optional
+from fastapi import Depends
+from sqlalchemy import and_, case, func, or_, select, tuple_, union
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, joinedload
 
-from core.db import get_db
-from crud.base import CRUDBase
-from models.budget import Budget
+from core.db import get_async_db, get_db
+from crud.base import AsyncCRUDBase, CRUDBase
+from models.account import Account
+from models.budget import Budget, DailySpend
 
 from models.currency import UserCurrency
-from schemas.enums import BudgetPeriodEnum, BudgetTypeEnum
+from models.transaction import Transaction
+from models.user import User
+from schemas.enums import BudgetPeriodEnum, BudgetTypeEnum, TransactionTypeEnum
+
+# Shared with the daily_spend triggers, which hold it per user while writing
+DAILY_SPEND_LOCK = "daily_spend"
+
+# daily_spend rows are in their transactions' currency, like amount_in_default
+SpendCurrency = aliased(UserCurrency, name="spend_currency")
+spent_in_default = DailySpend.spent / SpendCurrency.exchange_rate
 
 
 class CRUDBudget(CRUDBase[Budget]):
-    def get_budgets_by_user_id(self, user_id: int) -> list[Budget]:
-        return self.db.query(Budget).filter(Budget.user_id == user_id).all()
+    def get_alert_budgets(self, user_ids: Iterable[int]):
+        # Everything the alert consumer needs per budget, for many users at once
+        return self.db.execute(
+            select(
+                Budget.id,
+                Budget.user_id,
+                Budget.category_id,
+                Budget.name,
+                Budget.period,
+                Budget.type,
+                Budget.amount,
+                UserCurrency.exchange_rate,
+                User.timezone,
+            )
+            .join(UserCurrency, UserCurrency.id == Budget.user_currency_id)
+            .join(User, User.id == Budget.user_id)
+            .filter(Budget.user_id.in_(user_ids))
+        ).all()
+
+    def get_daily_spend(self, user_ids: Iterable[int], since: date):
+        # Per day and category, in the default currency
+        return self.db.execute(
+            select(
+                DailySpend.user_id,
+                DailySpend.category_id,
+                DailySpend.day,
+                func.sum(spent_in_default).label("spent"),
+            )
+            .join(SpendCurrency, SpendCurrency.id == DailySpend.user_currency_id)
+            .filter(DailySpend.user_id.in_(user_ids), DailySpend.day >= since)
+            .group_by(DailySpend.user_id, DailySpend.category_id, DailySpend.day)
+        ).all()
+
+    def get_currency_rates(self, user_ids: Iterable[int]):
+        return self.db.execute(
+            select(
+                UserCurrency.user_id, UserCurrency.id, UserCurrency.exchange_rate
+            ).filter(UserCurrency.user_id.in_(user_ids))
+        ).all()
+
+    def get_last_transaction_ids(self, user_ids: Iterable[int]) -> dict[int, int]:
+        return dict(
+            self.db.execute(
+                select(Transaction.user_id, func.max(Transaction.id))
+                .filter(Transaction.user_id.in_(user_ids))
+                .group_by(Transaction.user_id)
+            ).all()
+        )
+
+    def get_total_budget(self, user_id: int, period: BudgetPeriodEnum) -> list[Budget]:
+        return (
+            self.db.query(Budget)
+            .filter(
+                Budget.user_id == user_id,
+                Budget.period == period,
+            )
+            .all()
+        )
+
+
+def get_crud_budget(db: Session = Depends(get_db)) -> CRUDBudget:
+    return CRUDBudget(model=Budget, db=db)
+
+
+class AsyncCRUDBudget(AsyncCRUDBase[Budget]):
+    def _with_relationships(self, query):
+        return query.options(
+            joinedload(Budget.user_currency).joinedload(UserCurrency.currency),
+            joinedload(Budget.category),
+        )
+
+    async def get_budget_by_id(self, budget_id: int) -> Optional[Budget]:
+        return await self._first(
+            self._with_relationships(self._get_query_by_id(budget_id))
+        )
+
+    async def get_budgets_by_user_id(self, user_id: int) -> list[Budget]:
+        return await self._all(
+            self._with_relationships(select(Budget).filter(Budget.user_id == user_id))
+        )
 
-    def get_budget_by_period(
+    async def get_budget_by_period(
         self,
         user_id: int,
         period: BudgetPeriodEnum,
         type: Optional[BudgetTypeEnum] = None,
     ) -> Optional[list[Budget]]:
-        query = self.db.query(Budget).filter(
+        query = select(Budget).filter(
             Budget.user_id == user_id, Budget.period == period
         )
         if type:
-            query = query.filter(Budget.type == type)
-            return query.one_or_none()
-        return query.options(
-            joinedload(Budget.user_currency).joinedload(UserCurrency.currency),
-            joinedload(Budget.category),
-        ).all()
+            result = await self.db.execute(query.filter(Budget.type == type))
+            return result.scalars().one_or_none()
+        return await self._all(self._with_relationships(query))
 
-    def get_total_budget(self, user_id: int, period: BudgetPeriodEnum) -> list[Budget]:
-        return (
-            self.db.query(Budget)
+
+def get_async_crud_budget(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDBudget:
+    return AsyncCRUDBudget(model=Budget, db=db)
+
+
+class AsyncCRUDDailySpend(AsyncCRUDBase[DailySpend]):
+    async def get_spend_by_period(
+        self, user_id: int, bounds: dict[BudgetPeriodEnum, tuple[date, date]]
+    ) -> tuple[dict[int, int], dict[BudgetPeriodEnum, int]]:
+        """Spend for every budget of the user in its own period and currency,
+        keyed by budget id, and the user's total spend per period in the
+        default currency.
+
+        bounds maps each period to its (start, end) local days. All periods
+        come out of one aggregate over daily_spend, one FILTER per period.
+        """
+        columns = [
+            func.coalesce(
+                func.sum(spent_in_default).filter(
+                    DailySpend.day >= start, DailySpend.day < end
+                ),
+                0,
+            ).label(period.value)
+            for period, (start, end) in bounds.items()
+        ]
+        # The rollup row, with a NULL category, is the total over categories
+        spend = (
+            select(DailySpend.category_id, *columns)
+            .join(SpendCurrency, SpendCurrency.id == DailySpend.user_currency_id)
             .filter(
-                Budget.user_id == user_id,
-                Budget.period == period,
+                DailySpend.user_id == user_id,
+                DailySpend.day >= min(start for start, _ in bounds.values()),
+                DailySpend.day < max(end for _, end in bounds.values()),
             )
-            .all()
+            .group_by(func.rollup(DailySpend.category_id))
+            .subquery()
+        )
+        period_spent = case(
+            *((Budget.period == period, spend.c[period.value]) for period in bounds),
+            else_=0,
         )
+        budgets = Budget.__table__.join(
+            UserCurrency, UserCurrency.id == Budget.user_currency_id
+        )
+        query = select(
+            spend.c.category_id,
+            *(
+                func.round(spend.c[period.value]).label(period.value)
+                for period in bounds
+            ),
+            Budget.id.label("budget_id"),
+            func.round(period_spent * UserCurrency.exchange_rate).label("spent"),
+        ).select_from(
+            spend.outerjoin(
+                budgets,
+                and_(
+                    Budget.user_id == user_id,
+                    Budget.period.in_(list(bounds)),
+                    case(
+                        (
+                            Budget.type == BudgetTypeEnum.TOTAL,
+                            spend.c.category_id.is_(None),
+                        ),
+                        else_=spend.c.category_id == Budget.category_id,
+                    ),
+                ),
+            )
+        )
+        result = await self.db.execute(query)
+
+        budget_spend = {}
+        totals = {period: 0 for period in bounds}
+        for row in result.all():
+            if row.category_id is None:
+                totals = {period: int(row._mapping[period.value]) for period in bounds}
+            if row.budget_id is not None:
+                budget_spend[row.budget_id] = int(row.spent)
+        return budget_spend, totals
+
+    async def get_users_to_reconcile(self, since: date) -> list[int]:
+        query = union(
+            select(Transaction.user_id).filter(Transaction.local_date >= since),
+            select(DailySpend.user_id).filter(DailySpend.day >= since),
+        )
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
 
+    async def reconcile(self, user_id: int, since: date) -> int:
+        """Rebuild the user's rows from since onwards out of transactions,
+        returning how many were wrong. Commits.
 
-db_session = next(get_db())
+        The exclusive lock waits for in-flight writes for the user and holds
+        new ones back until the commit, so none are lost or counted twice.
+        """
+        await self.db.execute(
+            select(func.pg_advisory_xact_lock(func.hashtext(DAILY_SPEND_LOCK), user_id))
+        )
+        category_id = func.coalesce(Transaction.category_id, 0)
+        actual = (
+            select(
+                Transaction.user_id,
+                category_id.label("category_id"),
+                Transaction.local_date.label("day"),
+                Transaction.user_currency_id,
+                func.sum(func.coalesce(Transaction.amount_in_default, 0)).label(
+                    "spent"
+                ),
+                func.count().label("transaction_count"),
+            )
+            .join(
+                Account,
+                and_(Account.id == Transaction.account_id, Account.is_deleted == False),
+            )
+            .filter(
+                Transaction.user_id == user_id,
+                Transaction.transaction_type == TransactionTypeEnum.EXPENSE,
+                Transaction.local_date >= since,
+            )
+            .group_by(
+                Transaction.user_id,
+                category_id,
+                Transaction.local_date,
+                Transaction.user_currency_id,
+            )
+        )
+        current = actual.subquery()
+        stale = await self.db.execute(
+            DailySpend.__table__.delete().where(
+                DailySpend.user_id == user_id,
+                DailySpend.day >= since,
+                tuple_(
+                    DailySpend.category_id, DailySpend.day, DailySpend.user_currency_id
+                ).not_in(
+                    select(
+                        current.c.category_id, current.c.day, current.c.user_currency_id
+                    )
+                ),
+            )
+        )
+        statement = insert(DailySpend).from_select(
+            [
+                "user_id",
+                "category_id",
+                "day",
+                "user_currency_id",
+                "spent",
+                "transaction_count",
+            ],
+            actual,
+        )
+        fixed = await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["user_id", "category_id", "day", "user_currency_id"],
+                set_={
+                    "spent": statement.excluded.spent,
+                    "transaction_count": statement.excluded.transaction_count,
+                },
+                where=or_(
+                    DailySpend.spent != statement.excluded.spent,
+                    DailySpend.transaction_count
+                    != statement.excluded.transaction_count,
+                ),
+            )
+        )
+        await self.db.commit()
+        return stale.rowcount + fixed.rowcount
 
 
-def get_crud_budget() -> CRUDBudget:
-    return CRUDBudget(model=Budget, db=db_session)
+def get_async_crud_daily_spend(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDDailySpend:
+    return AsyncCRUDDailySpend(model=DailySpend, db=db)
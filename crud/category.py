@@ -1,7 +1,10 @@
-from sqlalchemy.orm import joinedload
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
-from core.db import get_db
-from crud.base import CRUDBase
+from core.db import get_async_db, get_db
+from crud.base import AsyncCRUDBase, CRUDBase
 from models.category import Category, UserCategory
 from schemas.category import DefaultCategoryCreate
 from utils.helper import get_default_categories
@@ -20,67 +23,83 @@ class CRUDCategory(CRUDBase[Category]):
                 )
                 self.create(data_obj)
 
-    def get_uncategorized_income_and_expense(self) -> tuple[Category, Category]:
-        return (
-            self.db.query(Category)
-            .filter(Category.name == "Uncategorized Income")
-            .one(),
-            self.db.query(Category)
-            .filter(Category.name == "Uncategorized Expense")
-            .one(),
-        )
-
     def get_default_categories(self):
         return self.db.query(Category).filter(Category.is_default == True).all()
 
 
 class CRUDUserCategory(CRUDBase[UserCategory]):
+    pass
+
+
+class AsyncCRUDCategory(AsyncCRUDBase[Category]):
+
+    async def _get_by_name(self, name: str) -> Category:
+        result = await self.db.execute(select(Category).filter(Category.name == name))
+        return result.scalar_one()
+
+    async def get_uncategorized_income_and_expense(self) -> tuple[Category, Category]:
+        return (
+            await self._get_by_name("Uncategorized Income"),
+            await self._get_by_name("Uncategorized Expense"),
+        )
+
+
+class AsyncCRUDUserCategory(AsyncCRUDBase[UserCategory]):
 
     def _get_category_query_by_user_id(self, user_id: int):
-        return self.db.query(UserCategory).filter(UserCategory.user_id == user_id)
+        return select(UserCategory).filter(UserCategory.user_id == user_id)
 
-    def check_user_category_name_exists(self, user_id: int, name: str) -> bool:
+    async def check_user_category_name_exists(self, user_id: int, name: str) -> bool:
         return (
-            self._get_category_query_by_user_id(user_id)
-            .filter(UserCategory.category.has(name=name))
-            .first()
+            await self._first(
+                self._get_category_query_by_user_id(user_id).filter(
+                    UserCategory.category.has(name=name)
+                )
+            )
             is not None
         )
 
-    def get_user_categories(self, user_id: int) -> list[UserCategory]:
-        return (
-            self._get_category_query_by_user_id(user_id)
-            .options(joinedload(UserCategory.category))
-            .all()
+    async def get_user_categories(self, user_id: int) -> list[UserCategory]:
+        return await self._all(
+            self._get_category_query_by_user_id(user_id).options(
+                joinedload(UserCategory.category)
+            )
         )
 
-    def get_user_category_by_id(
+    async def get_user_category_by_id(
         self, user_id: int, category_id: int
     ) -> UserCategory | None:
-        return (
+        return await self._first(
             self._get_category_query_by_user_id(user_id)
             .filter(UserCategory.id == category_id)
             .options(joinedload(UserCategory.category))
-            .first()
         )
 
-    def get_user_category_by_category_id(self, user_id: int, category_id: int):
-        return (
+    async def get_user_category_by_category_id(
+        self, user_id: int, category_id: int
+    ) -> UserCategory | None:
+        return await self._first(
             self._get_category_query_by_user_id(user_id)
             .filter(UserCategory.category_id == category_id)
             .options(joinedload(UserCategory.category))
-            .first()
         )
 
 
-db_session = next(get_db())
+def get_crud_category(db: Session = Depends(get_db)):
+    return CRUDCategory(model=Category, db=db)
+
 
-crud_category = CRUDCategory(Category)
+def get_crud_user_category(db: Session = Depends(get_db)):
+    return CRUDUserCategory(model=UserCategory, db=db)
 
 
-def get_crud_category():
-    return crud_category
+def get_async_crud_category(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDCategory:
+    return AsyncCRUDCategory(model=Category, db=db)
 
 
-def get_crud_user_category():
-    return CRUDUserCategory(model=UserCategory, db=db_session)
+def get_async_crud_user_category(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDUserCategory:
+    return AsyncCRUDUserCategory(model=UserCategory, db=db)
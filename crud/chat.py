@@ -1,3 +1,5 @@
+from fastapi import Depends
+from sqlalchemy.orm import Session as DBSession
 from core.db import get_db
 from crud.base import CRUDBase
 from models.chat import ChatMessage, Session
@@ -27,12 +29,9 @@ class CRUDSession(CRUDBase[Session]):
         return session
 
 
-db_session = next(get_db())
+def get_crud_chat(db: DBSession = Depends(get_db)) -> CRUDChat:
+    return CRUDChat(ChatMessage, db=db)
 
 
-def get_crud_chat() -> CRUDChat:
-    return CRUDChat(ChatMessage, db=db_session)
-
-
-def get_crud_session() -> CRUDSession:
-    return CRUDSession(Session, db=db_session)
+def get_crud_session(db: DBSession = Depends(get_db)) -> CRUDSession:
+    return CRUDSession(Session, db=db)
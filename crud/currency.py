@@ -1,8 +1,11 @@
 from typing import List, Optional
-from core.db import get_db
-from crud.base import CRUDBase
+from fastapi import Depends
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.db import get_async_db, get_db
+from crud.base import AsyncCRUDBase, CRUDBase
 from models.currency import Currency, UserCurrency
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import Session, joinedload
 
 from schemas.currency import UserCurrencyUpdate
 
@@ -58,12 +61,74 @@ class CRUDUserCurrency(CRUDBase[UserCurrency]):
         return data_obj.model_dump()
 
 
-db_session = next(get_db())
+class AsyncCRUDCurrency(AsyncCRUDBase[Currency]):
+    async def get_currency_by_code(self, code: str) -> Optional[Currency]:
+        return await self._first(select(Currency).filter(Currency.code == code.upper()))
 
+    async def get_currency_by_id(self, id: int) -> Optional[Currency]:
+        return await self._first(select(Currency).filter(Currency.id == id))
 
-def get_crud_currency():
-    return CRUDCurrency(model=Currency, db=db_session)
+    async def get_all_currencies(self) -> List[Currency]:
+        return await self._all(select(Currency))
 
 
-def get_crud_user_currency():
-    return CRUDUserCurrency(model=UserCurrency, db=db_session)
+class AsyncCRUDUserCurrency(AsyncCRUDBase[UserCurrency]):
+    def _get_user_currency_query_by_user_id(self, user_id: int):
+        return (
+            select(UserCurrency)
+            .filter(UserCurrency.user_id == user_id)
+            .options(joinedload(UserCurrency.currency))
+        )
+
+    async def get_user_currencies(self, user_id: int):
+        return await self._all(self._get_user_currency_query_by_user_id(user_id))
+
+    async def get_user_currency(self, user_id: int, user_currency_id: int):
+        return await self._first(
+            self._get_user_currency_query_by_user_id(user_id).filter(
+                UserCurrency.id == user_currency_id
+            )
+        )
+
+    async def get_user_currency_by_currency_id(self, user_id: int, currency_id: int):
+        return await self._first(
+            self._get_user_currency_query_by_user_id(user_id).filter(
+                UserCurrency.currency_id == currency_id
+            )
+        )
+
+    async def get_user_default_currency(self, user_id: int):
+        return await self._first(
+            self._get_user_currency_query_by_user_id(user_id).filter(
+                UserCurrency.is_default == True
+            )
+        )
+
+    async def update_by_user_id(self, user_id: int, data_obj: UserCurrencyUpdate):
+        await self.db.execute(
+            update(UserCurrency)
+            .where(UserCurrency.user_id == user_id)
+            .values(**data_obj.model_dump(exclude_unset=True))
+        )
+        await self.db.commit()
+        return data_obj.model_dump()
+
+
+def get_crud_currency(db: Session = Depends(get_db)):
+    return CRUDCurrency(model=Currency, db=db)
+
+
+def get_crud_user_currency(db: Session = Depends(get_db)):
+    return CRUDUserCurrency(model=UserCurrency, db=db)
+
+
+def get_async_crud_currency(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDCurrency:
+    return AsyncCRUDCurrency(model=Currency, db=db)
+
+
+def get_async_crud_user_currency(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDUserCurrency:
+    return AsyncCRUDUserCurrency(model=UserCurrency, db=db)
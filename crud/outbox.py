@@ -0,0 +1,53 @@
+from typing import Union
+from fastapi import Depends
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.db import get_async_db
+from crud.base import AsyncCRUDBase
+from models.outbox import OutboxEvent
+
+
+class AsyncCRUDOutbox(AsyncCRUDBase[OutboxEvent]):
+    async def add_events(
+        self,
+        topic: str,
+        events: list[Union[dict, BaseModel]],
+        commit: bool = True,
+    ) -> list[OutboxEvent]:
+        return await self.bulk_insert(
+            [
+                {
+                    "topic": topic,
+                    "payload": (
+                        event.model_dump(mode="json")
+                        if isinstance(event, BaseModel)
+                        else event
+                    ),
+                }
+                for event in events
+            ],
+            commit=commit,
+        )
+
+    async def claim_pending_events(self, limit: int) -> list[OutboxEvent]:
+        # Rows stay locked until the caller commits, so concurrent relays skip them
+        return await self._all(
+            select(OutboxEvent)
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+    async def delete_events(self, event_ids: list[int]) -> None:
+        if event_ids:
+            await self.db.execute(
+                delete(OutboxEvent).where(OutboxEvent.id.in_(event_ids))
+            )
+        await self.db.commit()
+
+
+def get_async_crud_outbox(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDOutbox:
+    return AsyncCRUDOutbox(model=OutboxEvent, db=db)
@@ -1,5 +1,6 @@
 from sqlalchemy import Column
-from sqlalchemy.orm import joinedload
+from fastapi import Depends
+from sqlalchemy.orm import Session, joinedload
 from core.db import get_db
 from crud.base import CRUDBase
 from models.currency import UserCurrency
@@ -30,8 +31,5 @@ class CRUDPlanner(CRUDBase[Planner]):
         )
 
 
-db_session = next(get_db())
-
-
-def get_crud_planner():
-    return CRUDPlanner(model=Planner, db=db_session)
+def get_crud_planner(db: Session = Depends(get_db)):
+    return CRUDPlanner(model=Planner, db=db)
@@ -1,26 +1,28 @@
-from core.db import get_db
-from crud.base import CRUDBase
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.db import get_async_db
+from crud.base import AsyncCRUDBase
 from models.rules import TransactionRule
 
 
-class CRUDRules(CRUDBase[TransactionRule]):
-    def list_rules_by_user_id(self, user_id: int):
-        return (
-            self.db.query(TransactionRule)
-            .filter(TransactionRule.user_id == user_id)
-            .all()
+class AsyncCRUDRules(AsyncCRUDBase[TransactionRule]):
+    async def list_rules_by_user_id(self, user_id: int) -> list[TransactionRule]:
+        return await self._all(
+            select(TransactionRule).filter(TransactionRule.user_id == user_id)
         )
 
-    def list_rules_by_beneficiary_name(self, beneficiary_name: str):
-        return (
-            self.db.query(TransactionRule)
-            .filter(TransactionRule.beneficiary_name == beneficiary_name.lower())
-            .all()
+    async def list_rules_by_beneficiary_name(
+        self, beneficiary_name: str
+    ) -> list[TransactionRule]:
+        return await self._all(
+            select(TransactionRule).filter(
+                TransactionRule.beneficiary_name == beneficiary_name.lower()
+            )
         )
 
 
-db_session = next(get_db())
-
-
-def get_crud_rules():
-    return CRUDRules(model=TransactionRule, db=db_session)
+def get_async_crud_rules(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDRules:
+    return AsyncCRUDRules(model=TransactionRule, db=db)
@@ -1,5 +1,6 @@
 from typing import Optional
-from sqlalchemy.orm import joinedload
+from fastapi import Depends
+from sqlalchemy.orm import Session, joinedload
 from core.db import get_db
 from crud.base import CRUDBase
 from models.user import SubscriptionPlan, UserSubscription
@@ -30,12 +31,9 @@ class CRUDSubscriptionPlan(CRUDBase[SubscriptionPlan]):
         )
 
 
-db_session = next(get_db())
+def get_crud_user_subscription(db: Session = Depends(get_db)) -> CRUDUserSubscription:
+    return CRUDUserSubscription(model=UserSubscription, db=db)
 
 
-def get_crud_user_subscription() -> CRUDUserSubscription:
-    return CRUDUserSubscription(model=UserSubscription, db=db_session)
-
-
-def get_crud_subscription_plan() -> CRUDSubscriptionPlan:
-    return CRUDSubscriptionPlan(model=SubscriptionPlan, db=db_session)
+def get_crud_subscription_plan(db: Session = Depends(get_db)) -> CRUDSubscriptionPlan:
+    return CRUDSubscriptionPlan(model=SubscriptionPlan, db=db)
@@ -1,22 +1,92 @@
 from datetime import date
-from core.db import get_db
-from crud.base import CRUDBase
-from models.views import TotalSummary
+from fastapi import Depends
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from core.db import get_async_db
+from crud.base import AsyncCRUDBase
+from models.account import Account
+from models.currency import Currency, UserCurrency
+from models.summary import MonthlySummary
 
 
-class CRUDTotalSummary(CRUDBase[TotalSummary]):
-    def get_total_summary(self, user_id: int, date: date):
-        query = (
-            self.db.query(TotalSummary)
-            .filter(TotalSummary.user_id == user_id, TotalSummary.month == date.month)
-            .filter(TotalSummary.year == date.year)
-            .first()
-        )
-        return query
+class AsyncCRUDTotalSummary(AsyncCRUDBase[MonthlySummary]):
+    async def get_total_summary(self, user_id: int, date: date):
+        # Rollup rows are per currency, convert them to the default one here
+        default_currency = aliased(UserCurrency)
+        account_currency = aliased(UserCurrency)
+        rate = default_currency.exchange_rate / UserCurrency.exchange_rate
 
+        total_balance = (
+            select(
+                func.coalesce(
+                    func.round(
+                        func.sum(
+                            Account.amount
+                            * (
+                                default_currency.exchange_rate
+                                / account_currency.exchange_rate
+                            )
+                        )
+                    ),
+                    0,
+                )
+            )
+            .join(account_currency, account_currency.id == Account.user_currency_id)
+            .filter(Account.user_id == user_id, Account.is_deleted == False)
+            .scalar_subquery()
+        )
+        net_total = func.round(
+            func.sum(
+                (MonthlySummary.total_income - MonthlySummary.total_expense) * rate
+            )
+        )
 
-db_session = next(get_db())
+        query = (
+            select(
+                MonthlySummary.user_id,
+                default_currency.id.label("default_user_currency_id"),
+                Currency.code.label("default_currency_code"),
+                MonthlySummary.month,
+                MonthlySummary.year,
+                func.round(func.sum(MonthlySummary.total_income * rate)).label(
+                    "total_income"
+                ),
+                func.round(func.sum(MonthlySummary.total_expense * rate)).label(
+                    "total_expense"
+                ),
+                net_total.label("net_total"),
+                total_balance.label("total_balance"),
+                func.round(total_balance + net_total).label("total_cash_at_hand"),
+            )
+            .join(UserCurrency, UserCurrency.id == MonthlySummary.user_currency_id)
+            .join(
+                default_currency,
+                and_(
+                    default_currency.user_id == MonthlySummary.user_id,
+                    default_currency.is_default == True,
+                ),
+            )
+            .join(Currency, Currency.id == default_currency.currency_id)
+            .filter(
+                MonthlySummary.user_id == user_id,
+                MonthlySummary.year == date.year,
+                MonthlySummary.month == date.month,
+            )
+            .group_by(
+                MonthlySummary.user_id,
+                MonthlySummary.year,
+                MonthlySummary.month,
+                default_currency.id,
+                default_currency.exchange_rate,
+                Currency.code,
+            )
+        )
+        result = await self.db.execute(query)
+        return result.mappings().first()
 
 
-def get_crud_total_summary() -> CRUDTotalSummary:
-    return CRUDTotalSummary(model=TotalSummary, db=db_session)
+def get_async_crud_total_summary(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDTotalSummary:
+    return AsyncCRUDTotalSummary(model=MonthlySummary, db=db)
@@ -1,19 +1,40 @@
 from datetime import datetime, date
-from core.db import get_db
-from crud.base import CRUDBase
+from typing import AsyncIterator, Optional, Sequence
+from dateutil.relativedelta import relativedelta
+from fastapi import Depends
+from core.db import get_async_db
+from crud.base import AsyncCRUDBase
 from models.currency import UserCurrency
 from models.transaction import Transaction
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
-from sqlalchemy import extract
-
-from schemas.enums import AccountTypeEnum, TransactionTypeEnum
-
-
-class CRUDTransaction(CRUDBase[Transaction]):
+from sqlalchemy import Integer, any_, bindparam, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+# Row layout expected by insert_mono_transactions
+MONO_TRANSACTION_COLUMNS = (
+    "mono_transaction_id",
+    "mono_type",
+    "narration",
+    "amount",
+    "amount_in_default",
+    "balance",
+    "transaction_type",
+    "category_id",
+    "account_id",
+    "user_currency_id",
+    "user_id",
+    "date",
+)
+# Rows per INSERT, keeps a 10k+ row backfill from becoming one huge statement
+MONO_INSERT_CHUNK_SIZE = 5000
+
+
+class AsyncCRUDTransaction(AsyncCRUDBase[Transaction]):
 
     def _get_transaction_query_by_user_id(self, user_id: int):
         return (
-            self.db.query(Transaction)
+            select(Transaction)
             .filter(
                 Transaction.user_id == user_id,
                 Transaction.account.has(is_deleted=False),
@@ -26,40 +47,112 @@ class CRUDTransaction(CRUDBase[Transaction]):
             .order_by(Transaction.id.desc())
         )
 
-    def get_user_transactions_by_id(self, user_id: int, date: date):
-        month = date.month
-        year = date.year
-        return (
-            self._get_transaction_query_by_user_id(user_id)
-            .filter(
-                extract("month", Transaction.created_at) == month,
-                extract("year", Transaction.created_at) == year,
-            )
-            .all()
+    def _get_transaction_query_by_month(self, user_id: int, date: date):
+        # Half-open range so (user_id, date) indexes can be used, unlike extract()
+        month_start = datetime(date.year, date.month, 1)
+        month_end = month_start + relativedelta(months=1)
+        return self._get_transaction_query_by_user_id(user_id).filter(
+            Transaction.date >= month_start,
+            Transaction.date < month_end,
         )
 
-    def get_all_transactions_by_user_id(self, user_id: int):
-        return self._get_transaction_query_by_user_id(user_id).all()
+    async def get_user_transactions_by_id(self, user_id: int, date: date):
+        return await self._all(self._get_transaction_query_by_month(user_id, date))
 
-    def get_transaction_by_id(self, transaction_id: int, user_id: int):
-        return (
-            self._get_transaction_query_by_user_id(user_id)
-            .filter(Transaction.id == transaction_id)
-            .first()
+    async def get_user_transactions_page(
+        self,
+        user_id: int,
+        date: date,
+        limit: int,
+        cursor: Optional[tuple[datetime, int]] = None,
+    ) -> list[Transaction]:
+        query = (
+            self._get_transaction_query_by_month(user_id, date)
+            .order_by(None)
+            .order_by(Transaction.date.desc(), Transaction.id.desc())
+        )
+        if cursor:
+            query = query.filter(tuple_(Transaction.date, Transaction.id) < cursor)
+        return await self._all(query.limit(limit))
+
+    async def stream_user_transactions(
+        self, user_id: int, date: date, batch_size: int = 500
+    ) -> AsyncIterator[Transaction]:
+        query = (
+            self._get_transaction_query_by_month(user_id, date)
+            .order_by(None)
+            .order_by(Transaction.date.desc(), Transaction.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(query)
+        async for transaction in result.scalars():
+            yield transaction
+
+    async def get_transactions_by_ids(self, user_id: int, transaction_ids: list[int]):
+        # One array parameter rather than one per id, backfills can pass tens
+        # of thousands
+        return await self._all(
+            self._get_transaction_query_by_user_id(user_id).filter(
+                Transaction.id == any_(literal(transaction_ids, ARRAY(Integer)))
+            )
         )
 
-    def get_automatic_transactions(self, user_id: int):
-        return (
-            self._get_transaction_query_by_user_id(user_id)
-            .filter(Transaction.account.has(account_type=AccountTypeEnum.AUTOMATIC))
-            .all()
+    async def get_transaction_by_id(self, transaction_id: int, user_id: int):
+        return await self._first(
+            self._get_transaction_query_by_user_id(user_id).filter(
+                Transaction.id == transaction_id
+            )
         )
 
-    def get_transactions_by_account_id(self, account_id: int, user_id: int):
-        return (
-            self._get_transaction_query_by_user_id(user_id)
-            .filter(Transaction.account_id == account_id)
-            .all()
+    async def insert_mono_transactions(
+        self, rows: Sequence[tuple], chunk_size: int = MONO_INSERT_CHUNK_SIZE
+    ) -> list[int]:
+        """Insert synced rows laid out as MONO_TRANSACTION_COLUMNS, skipping
+        ones already stored for the account.
+
+        Each chunk goes out as one INSERT ... SELECT unnest(...) with a single
+        array parameter per column, so the statement text never changes and
+        asyncpg reuses its prepared statement. Flushes only; returns the ids
+        of the rows actually inserted.
+        """
+        table = Transaction.__table__
+        columns = [table.c[name] for name in MONO_TRANSACTION_COLUMNS]
+        statement = (
+            insert(table)
+            .from_select(
+                columns,
+                select(
+                    *[
+                        func.unnest(
+                            bindparam(column.name, type_=ARRAY(column.type))
+                        ).label(column.name)
+                        for column in columns
+                    ]
+                ),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[table.c.account_id, table.c.mono_transaction_id]
+            )
+            .returning(table.c.id)
+        )
+        ids = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            result = await self.db.execute(
+                statement,
+                {
+                    name: list(values)
+                    for name, values in zip(MONO_TRANSACTION_COLUMNS, zip(*chunk))
+                },
+            )
+            ids.extend(result.scalars().all())
+        return ids
+
+    async def get_transactions_by_account_id(self, account_id: int, user_id: int):
+        return await self._all(
+            self._get_transaction_query_by_user_id(user_id).filter(
+                Transaction.account_id == account_id
+            )
         )
 
     def _get_transaction_object_by_category_id(self, category_id: int, user_id: int):
@@ -67,10 +160,12 @@ class CRUDTransaction(CRUDBase[Transaction]):
             Transaction.category_id == category_id,
         )
 
-    def get_transaction_by_category_id(self, category_id: int, user_id: int):
-        return self._get_transaction_object_by_category_id(category_id, user_id).all()
+    async def get_transaction_by_category_id(self, category_id: int, user_id: int):
+        return await self._all(
+            self._get_transaction_object_by_category_id(category_id, user_id)
+        )
 
-    def get_transactions_by_category_id(
+    async def get_transactions_by_category_id(
         self,
         user_id: int,
         category_id: int,
@@ -78,40 +173,10 @@ class CRUDTransaction(CRUDBase[Transaction]):
         query = self._get_transaction_object_by_category_id(
             user_id=user_id, category_id=category_id
         )
-        return query.all()
-
-    def get_transactions_by_category_ids(
-        self,
-        user_id: int,
-        category_ids: list[int],
-        transaction_date: datetime = None,
-    ) -> list[Transaction]:
-        query = self._get_transaction_query_by_user_id(user_id).filter(
-            Transaction.category_id.in_(category_ids),
-            Transaction.date >= transaction_date,
-        )
-        if transaction_date:
-            query = query.filter(Transaction.date >= transaction_date)
-        return query.all()
-
-    async def get_transaction_by_type_and_date(
-        self,
-        user_id: int,
-        transaction_date: datetime,
-        type: TransactionTypeEnum,
-    ):
-        return (
-            self._get_transaction_query_by_user_id(user_id)
-            .filter(
-                Transaction.date >= transaction_date,
-                Transaction.transaction_type == type,
-            )
-            .all()
-        )
-
-
-db_session = next(get_db())
+        return await self._all(query)
 
 
-def get_crud_transaction() -> CRUDTransaction:
-    return CRUDTransaction(model=Transaction, db=db_session)
+def get_async_crud_transaction(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDTransaction:
+    return AsyncCRUDTransaction(model=Transaction, db=db)
@@ -1,9 +1,15 @@
+from datetime import datetime
 from typing import Optional
-from sqlalchemy.orm import joinedload
-from core.db import get_db
-from crud.base import CRUDBase
+from fastapi import Depends
+from sqlalchemy import Date, cast, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from core.db import get_async_db, get_db
+from crud.base import AsyncCRUDBase, CRUDBase
+from crud.budget import DAILY_SPEND_LOCK
 from models.category import UserCategory
 from models.currency import UserCurrency
+from models.transaction import Transaction
 from models.user import User
 
 
@@ -11,19 +17,89 @@ class CRUDAuthUser(CRUDBase[User]):
     def get_by_email(self, email: str) -> Optional[User]:
         return self.db.query(User).filter(User.email == email).first()
 
-    def get_user_by_uid(self, uid: str) -> User | None:
-        return (
-            self.db.query(User)
-            .filter(User.uid == uid)
-            .options(joinedload(User.subscriptions))
-            .options(joinedload(User.currencies).joinedload(UserCurrency.currency))
-            .options(joinedload(User.categories).joinedload(UserCategory.category))
-            .first()
+    def update_last_activity(
+        self, activity: dict[int, datetime]
+    ) -> dict[int, Optional[datetime]]:
+        """Bulk-write last_activity_time, returning each user's previous value."""
+        previous = dict(
+            self.db.query(User.id, User.last_activity_time).filter(
+                User.id.in_(activity)
+            )
         )
+        if not previous:
+            return previous
+        self.db.execute(
+            update(User),
+            [
+                {"id": user_id, "last_activity_time": activity[user_id]}
+                for user_id in previous
+            ],
+        )
+        self.db.commit()
+        return previous
+
+
+def get_crud_auth_user(db: Session = Depends(get_db)) -> CRUDAuthUser:
+    return CRUDAuthUser(model=User, db=db)
+
+
+class AsyncCRUDAuthUser(AsyncCRUDBase[User]):
+    async def get_auth_user_by_uid(self, uid: str):
+        result = await self.db.execute(
+            select(
+                User.id,
+                User.uid,
+                User.email,
+                User.name,
+                User.timezone,
+                User.last_activity_time,
+            ).where(User.uid == uid)
+        )
+        return result.first()
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._first(select(User).filter(User.email == email))
 
+    async def update_timezone(self, user_id: int, timezone: str) -> Optional[User]:
+        """Set the user's timezone and move their transactions onto its
+        calendar days, which the daily_spend triggers follow. Returns the
+        user's profile.
 
-db_session = next(get_db())
+        Takes the user's exclusive daily_spend lock first, so a transaction
+        being written meanwhile is either re-stamped here or waits and reads
+        the new timezone.
+        """
+        await self.db.execute(
+            select(func.pg_advisory_xact_lock(func.hashtext(DAILY_SPEND_LOCK), user_id))
+        )
+        local_date = cast(
+            func.timezone(timezone, func.timezone("UTC", Transaction.date)), Date
+        )
+        await self.db.execute(
+            update(User).where(User.id == user_id).values(timezone=timezone)
+        )
+        await self.db.execute(
+            update(Transaction)
+            .where(Transaction.user_id == user_id, Transaction.local_date != local_date)
+            .values(local_date=local_date)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return await self.get_user_profile(user_id)
+
+    async def get_user_profile(self, id: int) -> User | None:
+        # selectinload keeps currencies and categories from multiplying
+        # each other the way a single joined query does
+        return await self._first(
+            self._get_query_by_id(id).options(
+                selectinload(User.subscriptions),
+                selectinload(User.currencies).selectinload(UserCurrency.currency),
+                selectinload(User.categories).selectinload(UserCategory.category),
+            )
+        )
 
 
-def get_crud_auth_user() -> CRUDAuthUser:
-    return CRUDAuthUser(model=User, db=db_session)
+def get_async_crud_auth_user(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCRUDAuthUser:
+    return AsyncCRUDAuthUser(model=User, db=db)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -5,9 +6,12 @@ import logfire
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api import router
-from services.kafka_producer import producer
+from services.kafka_producer import close_producer
+from task_queue.main import close_queue_pool, open_queue_pool
 from core import settings
+from core.externals.firebase.auth_dep import warm_public_keys
 from core.externals.firebase.firebase_init import init_firebase
+from core.http import close_http_clients
 
 
 logfire.configure(service_name="monetraserver", environment=settings.ENVIRONMENT)
@@ -17,8 +21,12 @@ logfire.info(f"Starting Monetra Server in {settings.ENVIRONMENT} environment..."
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     init_firebase()
+    await asyncio.to_thread(warm_public_keys)
+    await open_queue_pool()
     yield
-    producer.flush()
+    await close_queue_pool()
+    await close_http_clients()
+    close_producer()
 
 
 app = FastAPI(lifespan=lifespan)
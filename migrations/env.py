@@ -15,6 +15,9 @@ import models.category
 import models.planner
 import models.rules
 import models.chat
+import models.summary
+import models.outbox
+import models.budget
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,50 @@
+"""Added unique mono transaction index
+
+Revision ID: 339b9c6e71d5
+Revises: d8a7abd8e056
+Create Date: 2026-10-18 08:24:37.190544
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "339b9c6e71d5"
+down_revision: Union[str, Sequence[str], None] = "d8a7abd8e056"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the first copy of anything a past sync stored twice, otherwise the
+    # index can't be built
+    op.execute("""
+        DELETE FROM transactions t
+        USING transactions d
+        WHERE t.account_id = d.account_id
+          AND t.mono_transaction_id = d.mono_transaction_id
+          AND t.id > d.id
+        """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_transactions_account_id_mono_transaction_id",
+            "transactions",
+            ["account_id", "mono_transaction_id"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_transactions_account_id_mono_transaction_id",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
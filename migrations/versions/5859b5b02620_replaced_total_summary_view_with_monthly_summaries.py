@@ -0,0 +1,225 @@
+"""Replaced total_summary view with monthly_summaries
+
+Revision ID: 5859b5b02620
+Revises: f26a4f3d809d
+Create Date: 2026-10-18 09:12:40.318274
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5859b5b02620"
+down_revision: Union[str, Sequence[str], None] = "f26a4f3d809d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "monthly_summaries",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("user_currency_id", sa.Integer(), nullable=False),
+        sa.Column("total_income", sa.BigInteger(), nullable=False),
+        sa.Column("total_expense", sa.BigInteger(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["user_currency_id"], ["users_currencies.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("user_id", "year", "month", "user_currency_id"),
+    )
+
+    # Statement level, so a bulk insert folds into one upsert per
+    # (user, month, currency) instead of one per row. Transition tables
+    # can't be shared between events, hence a trigger per event.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION apply_monthly_summary_delta() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                INSERT INTO monthly_summaries AS ms
+                    (user_id, year, month, user_currency_id,
+                     total_income, total_expense, transaction_count)
+                SELECT
+                    user_id,
+                    EXTRACT(YEAR FROM date)::int,
+                    EXTRACT(MONTH FROM date)::int,
+                    user_currency_id,
+                    -SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END),
+                    -SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END),
+                    -COUNT(*)
+                FROM old_rows
+                GROUP BY 1, 2, 3, 4
+                ORDER BY 1, 2, 3, 4
+                ON CONFLICT (user_id, year, month, user_currency_id) DO UPDATE SET
+                    total_income = ms.total_income + EXCLUDED.total_income,
+                    total_expense = ms.total_expense + EXCLUDED.total_expense,
+                    transaction_count = ms.transaction_count + EXCLUDED.transaction_count;
+
+                DELETE FROM monthly_summaries ms
+                USING (SELECT DISTINCT user_id FROM old_rows) o
+                WHERE ms.user_id = o.user_id AND ms.transaction_count = 0;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO monthly_summaries AS ms
+                    (user_id, year, month, user_currency_id,
+                     total_income, total_expense, transaction_count)
+                SELECT
+                    user_id,
+                    EXTRACT(YEAR FROM date)::int,
+                    EXTRACT(MONTH FROM date)::int,
+                    user_currency_id,
+                    SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END),
+                    SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END),
+                    COUNT(*)
+                FROM new_rows
+                GROUP BY 1, 2, 3, 4
+                ORDER BY 1, 2, 3, 4
+                ON CONFLICT (user_id, year, month, user_currency_id) DO UPDATE SET
+                    total_income = ms.total_income + EXCLUDED.total_income,
+                    total_expense = ms.total_expense + EXCLUDED.total_expense,
+                    transaction_count = ms.transaction_count + EXCLUDED.transaction_count;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+    op.execute("""
+        CREATE TRIGGER transactions_monthly_summary_insert
+        AFTER INSERT ON transactions
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION apply_monthly_summary_delta();
+
+        CREATE TRIGGER transactions_monthly_summary_update
+        AFTER UPDATE ON transactions
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION apply_monthly_summary_delta();
+
+        CREATE TRIGGER transactions_monthly_summary_delete
+        AFTER DELETE ON transactions
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION apply_monthly_summary_delta();
+        """)
+
+    # Backfill under a lock so no transaction slips in between the
+    # aggregate and the triggers going live
+    op.execute("LOCK TABLE transactions IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+        INSERT INTO monthly_summaries
+            (user_id, year, month, user_currency_id,
+             total_income, total_expense, transaction_count)
+        SELECT
+            user_id,
+            EXTRACT(YEAR FROM date)::int,
+            EXTRACT(MONTH FROM date)::int,
+            user_currency_id,
+            SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END),
+            SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END),
+            COUNT(*)
+        FROM transactions
+        GROUP BY 1, 2, 3, 4
+        """)
+
+    op.execute("DROP VIEW IF EXISTS total_summary CASCADE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE VIEW total_summary AS
+        WITH transaction_summary AS (
+            SELECT
+                u.id AS user_id,
+                EXTRACT(MONTH FROM t.date) AS month,
+                EXTRACT(YEAR FROM t.date) AS year,
+                ROUND(SUM(
+                    CASE WHEN t.transaction_type = 'income'
+                    THEN (t.amount * (udc.exchange_rate / uc.exchange_rate))
+                    ELSE 0 END
+                )) AS total_income,
+                ROUND(SUM(
+                    CASE WHEN t.transaction_type = 'expense'
+                    THEN (t.amount * (udc.exchange_rate / uc.exchange_rate))
+                    ELSE 0 END
+                )) AS total_expense,
+                ROUND(SUM(
+                    CASE 
+                        WHEN t.transaction_type = 'income'
+                        THEN (t.amount * (udc.exchange_rate / uc.exchange_rate))
+                        WHEN t.transaction_type = 'expense'
+                        THEN -(t.amount * (udc.exchange_rate / uc.exchange_rate))
+                        ELSE 0
+                    END
+                )) AS net_total
+            FROM users u
+            JOIN users_currencies udc 
+                ON udc.user_id = u.id AND udc.is_default = TRUE
+            LEFT JOIN transactions t 
+                ON t.user_id = u.id
+            LEFT JOIN users_currencies uc 
+                ON uc.id = t.user_currency_id
+            GROUP BY 
+                u.id, udc.exchange_rate,
+                EXTRACT(MONTH FROM t.date), 
+                EXTRACT(YEAR FROM t.date)
+        ),
+        account_summary AS (
+            SELECT
+                a.user_id,
+                ROUND(SUM(
+                    CASE WHEN a.is_deleted = FALSE
+                    THEN (a.amount * (udc.exchange_rate / auc.exchange_rate))
+                    ELSE 0 END
+                )) AS total_balance
+            FROM accounts a
+            JOIN users u 
+                ON a.user_id = u.id
+            JOIN users_currencies udc 
+                ON udc.user_id = u.id AND udc.is_default = TRUE
+            LEFT JOIN users_currencies auc 
+                ON auc.id = a.user_currency_id
+            GROUP BY 
+                a.user_id, udc.exchange_rate
+        )
+        SELECT
+            u.id AS user_id,
+            udc.id AS default_user_currency_id,
+            dc.code AS default_currency_code,
+            ts.month,
+            ts.year,
+            COALESCE(ts.total_income, 0) AS total_income,
+            COALESCE(ts.total_expense, 0) AS total_expense,
+            COALESCE(ts.net_total, 0) AS net_total,
+            COALESCE(asum.total_balance, 0) AS total_balance,
+            ROUND(COALESCE(asum.total_balance, 0) + COALESCE(ts.net_total, 0)) AS total_cash_at_hand
+        FROM users u
+        JOIN users_currencies udc 
+            ON udc.user_id = u.id AND udc.is_default = TRUE
+        JOIN currencies dc 
+            ON dc.id = udc.currency_id
+        LEFT JOIN transaction_summary ts 
+            ON ts.user_id = u.id
+        LEFT JOIN account_summary asum 
+            ON asum.user_id = u.id
+        ORDER BY ts.year, ts.month;
+        """)
+
+    op.execute(
+        "DROP TRIGGER IF EXISTS transactions_monthly_summary_delete ON transactions"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS transactions_monthly_summary_update ON transactions"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS transactions_monthly_summary_insert ON transactions"
+    )
+    op.execute("DROP FUNCTION IF EXISTS apply_monthly_summary_delta()")
+    op.drop_table("monthly_summaries")
@@ -0,0 +1,246 @@
+"""Added currency to daily_spend
+
+Revision ID: 7109e64cde86
+Revises: a6d7ff97597d
+Create Date: 2026-10-18 09:03:20.100753
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7109e64cde86"
+down_revision: Union[str, Sequence[str], None] = "a6d7ff97597d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def spend_columns(by_currency: bool) -> tuple[str, str, str]:
+    """The daily_spend key, as inserted, as selected from transactions t,
+    and the GROUP BY / ORDER BY positions."""
+    if by_currency:
+        return (
+            "user_id, category_id, day, user_currency_id",
+            "t.user_id, COALESCE(t.category_id, 0), t.local_date, t.user_currency_id",
+            "1, 2, 3, 4",
+        )
+    return (
+        "user_id, category_id, day",
+        "t.user_id, COALESCE(t.category_id, 0), t.local_date",
+        "1, 2, 3",
+    )
+
+
+def daily_spend_functions(by_currency: bool) -> str:
+    key, selected, positions = spend_columns(by_currency)
+    return f"""
+        CREATE OR REPLACE FUNCTION apply_daily_spend_delta() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM pg_advisory_xact_lock_shared(hashtext('daily_spend'), user_id)
+                FROM (SELECT DISTINCT user_id FROM old_rows ORDER BY 1) u;
+
+                INSERT INTO daily_spend AS ds ({key}, spent, transaction_count)
+                SELECT
+                    {selected},
+                    -SUM(COALESCE(t.amount_in_default, 0)),
+                    -COUNT(*)
+                FROM old_rows t
+                JOIN accounts a ON a.id = t.account_id AND a.is_deleted = FALSE
+                WHERE t.transaction_type = 'expense'
+                GROUP BY {positions}
+                ORDER BY {positions}
+                ON CONFLICT ({key}) DO UPDATE SET
+                    spent = ds.spent + EXCLUDED.spent,
+                    transaction_count = ds.transaction_count + EXCLUDED.transaction_count;
+
+                DELETE FROM daily_spend ds
+                USING (SELECT DISTINCT user_id FROM old_rows) o
+                WHERE ds.user_id = o.user_id AND ds.transaction_count = 0;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM pg_advisory_xact_lock_shared(hashtext('daily_spend'), user_id)
+                FROM (SELECT DISTINCT user_id FROM new_rows ORDER BY 1) u;
+
+                INSERT INTO daily_spend AS ds ({key}, spent, transaction_count)
+                SELECT
+                    {selected},
+                    SUM(COALESCE(t.amount_in_default, 0)),
+                    COUNT(*)
+                FROM new_rows t
+                JOIN accounts a ON a.id = t.account_id AND a.is_deleted = FALSE
+                WHERE t.transaction_type = 'expense'
+                GROUP BY {positions}
+                ORDER BY {positions}
+                ON CONFLICT ({key}) DO UPDATE SET
+                    spent = ds.spent + EXCLUDED.spent,
+                    transaction_count = ds.transaction_count + EXCLUDED.transaction_count;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION apply_account_daily_spend() RETURNS trigger AS $$
+        DECLARE
+            direction int := CASE WHEN NEW.is_deleted IS FALSE THEN 1 ELSE -1 END;
+        BEGIN
+            PERFORM pg_advisory_xact_lock_shared(hashtext('daily_spend'), NEW.user_id);
+
+            INSERT INTO daily_spend AS ds ({key}, spent, transaction_count)
+            SELECT
+                {selected},
+                direction * SUM(COALESCE(t.amount_in_default, 0)),
+                direction * COUNT(*)
+            FROM transactions t
+            WHERE t.account_id = NEW.id AND t.transaction_type = 'expense'
+            GROUP BY {positions}
+            ORDER BY {positions}
+            ON CONFLICT ({key}) DO UPDATE SET
+                spent = ds.spent + EXCLUDED.spent,
+                transaction_count = ds.transaction_count + EXCLUDED.transaction_count;
+
+            DELETE FROM daily_spend
+            WHERE user_id = NEW.user_id AND transaction_count = 0;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+
+def rebuild_daily_spend(by_currency: bool) -> str:
+    key, selected, positions = spend_columns(by_currency)
+    return f"""
+        INSERT INTO daily_spend ({key}, spent, transaction_count)
+        SELECT
+            {selected},
+            SUM(COALESCE(t.amount_in_default, 0)),
+            COUNT(*)
+        FROM transactions t
+        JOIN accounts a ON a.id = t.account_id AND a.is_deleted = FALSE
+        WHERE t.transaction_type = 'expense'
+        GROUP BY {positions};
+        """
+
+
+MONO_BATCH_SIZE = 10_000
+
+# Mono syncs stored amount_in_default already divided by the account's rate,
+# every other writer and reader keeps it in the transaction's own currency
+MONO_AMOUNT_FIX = """
+    UPDATE transactions
+    SET amount_in_default = amount
+    WHERE mono_transaction_id IS NOT NULL
+      AND amount_in_default IS DISTINCT FROM amount
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Committed batch by batch so writers only ever wait on one batch's rows.
+    # The triggers stay on, disabling them is table wide and would drop the
+    # deltas of concurrent writes. daily_spend is rebuilt below anyway and
+    # monthly_summaries keys on amount, so its deltas cancel out.
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        low, high = bind.execute(
+            sa.text("SELECT MIN(id), MAX(id) FROM transactions")
+        ).one()
+        for start in range(low or 0, (high or 0) + 1, MONO_BATCH_SIZE):
+            bind.execute(
+                sa.text(MONO_AMOUNT_FIX + " AND id >= :start AND id < :end"),
+                {"start": start, "end": start + MONO_BATCH_SIZE},
+            )
+
+    # Writes wait until the rollup is rebuilt under its new key, reads don't.
+    # Mono rows synced since the batches are picked up first.
+    op.execute("LOCK TABLE transactions, accounts IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(MONO_AMOUNT_FIX)
+
+    op.execute("DELETE FROM daily_spend")
+    op.add_column(
+        "daily_spend",
+        sa.Column("user_currency_id", sa.Integer(), nullable=False),
+    )
+    op.create_foreign_key(
+        "daily_spend_user_currency_id_fkey",
+        "daily_spend",
+        "users_currencies",
+        ["user_currency_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.drop_constraint("daily_spend_pkey", "daily_spend", type_="primary")
+    op.create_primary_key(
+        "daily_spend_pkey",
+        "daily_spend",
+        ["user_id", "category_id", "day", "user_currency_id"],
+    )
+    op.execute(daily_spend_functions(by_currency=True))
+    op.execute(rebuild_daily_spend(by_currency=True))
+
+    # The reconcile aggregate now groups by currency too, keep it index-only
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_transactions_user_id_local_date",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            "ix_transactions_user_id_local_date",
+            "transactions",
+            ["user_id", "local_date"],
+            postgresql_include=[
+                "category_id",
+                "transaction_type",
+                "amount_in_default",
+                "account_id",
+                "user_currency_id",
+            ],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_transactions_user_id_local_date",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            "ix_transactions_user_id_local_date",
+            "transactions",
+            ["user_id", "local_date"],
+            postgresql_include=[
+                "category_id",
+                "transaction_type",
+                "amount_in_default",
+                "account_id",
+            ],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    # Mono amounts stay in their own currency, the old rollup just sums them
+    op.execute("LOCK TABLE transactions, accounts IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("DELETE FROM daily_spend")
+    op.drop_constraint("daily_spend_pkey", "daily_spend", type_="primary")
+    op.drop_constraint(
+        "daily_spend_user_currency_id_fkey", "daily_spend", type_="foreignkey"
+    )
+    op.drop_column("daily_spend", "user_currency_id")
+    op.create_primary_key(
+        "daily_spend_pkey", "daily_spend", ["user_id", "category_id", "day"]
+    )
+    op.execute(daily_spend_functions(by_currency=False))
+    op.execute(rebuild_daily_spend(by_currency=False))
@@ -0,0 +1,207 @@
+"""Added user timezone and transaction local_date
+
+Revision ID: a6d7ff97597d
+Revises: d4bacbc2f02a
+Create Date: 2026-10-18 12:06:52.218114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a6d7ff97597d"
+down_revision: Union[str, Sequence[str], None] = "d4bacbc2f02a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def daily_spend_functions(day: str) -> str:
+    """The daily_spend trigger functions, bucketing transactions by day."""
+    return f"""
+        CREATE OR REPLACE FUNCTION apply_daily_spend_delta() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM pg_advisory_xact_lock_shared(hashtext('daily_spend'), user_id)
+                FROM (SELECT DISTINCT user_id FROM old_rows ORDER BY 1) u;
+
+                INSERT INTO daily_spend AS ds
+                    (user_id, category_id, day, spent, transaction_count)
+                SELECT
+                    t.user_id,
+                    COALESCE(t.category_id, 0),
+                    t.{day},
+                    -SUM(COALESCE(t.amount_in_default, 0)),
+                    -COUNT(*)
+                FROM old_rows t
+                JOIN accounts a ON a.id = t.account_id AND a.is_deleted = FALSE
+                WHERE t.transaction_type = 'expense'
+                GROUP BY 1, 2, 3
+                ORDER BY 1, 2, 3
+                ON CONFLICT (user_id, category_id, day) DO UPDATE SET
+                    spent = ds.spent + EXCLUDED.spent,
+                    transaction_count = ds.transaction_count + EXCLUDED.transaction_count;
+
+                DELETE FROM daily_spend ds
+                USING (SELECT DISTINCT user_id FROM old_rows) o
+                WHERE ds.user_id = o.user_id AND ds.transaction_count = 0;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM pg_advisory_xact_lock_shared(hashtext('daily_spend'), user_id)
+                FROM (SELECT DISTINCT user_id FROM new_rows ORDER BY 1) u;
+
+                INSERT INTO daily_spend AS ds
+                    (user_id, category_id, day, spent, transaction_count)
+                SELECT
+                    t.user_id,
+                    COALESCE(t.category_id, 0),
+                    t.{day},
+                    SUM(COALESCE(t.amount_in_default, 0)),
+                    COUNT(*)
+                FROM new_rows t
+                JOIN accounts a ON a.id = t.account_id AND a.is_deleted = FALSE
+                WHERE t.transaction_type = 'expense'
+                GROUP BY 1, 2, 3
+                ORDER BY 1, 2, 3
+                ON CONFLICT (user_id, category_id, day) DO UPDATE SET
+                    spent = ds.spent + EXCLUDED.spent,
+                    transaction_count = ds.transaction_count + EXCLUDED.transaction_count;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION apply_account_daily_spend() RETURNS trigger AS $$
+        DECLARE
+            direction int := CASE WHEN NEW.is_deleted IS FALSE THEN 1 ELSE -1 END;
+        BEGIN
+            PERFORM pg_advisory_xact_lock_shared(hashtext('daily_spend'), NEW.user_id);
+
+            INSERT INTO daily_spend AS ds
+                (user_id, category_id, day, spent, transaction_count)
+            SELECT
+                t.user_id,
+                COALESCE(t.category_id, 0),
+                t.{day},
+                direction * SUM(COALESCE(t.amount_in_default, 0)),
+                direction * COUNT(*)
+            FROM transactions t
+            WHERE t.account_id = NEW.id AND t.transaction_type = 'expense'
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+            ON CONFLICT (user_id, category_id, day) DO UPDATE SET
+                spent = ds.spent + EXCLUDED.spent,
+                transaction_count = ds.transaction_count + EXCLUDED.transaction_count;
+
+            DELETE FROM daily_spend
+            WHERE user_id = NEW.user_id AND transaction_count = 0;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+
+def rebuild_daily_spend(day: str) -> str:
+    return f"""
+        DELETE FROM daily_spend;
+        INSERT INTO daily_spend
+            (user_id, category_id, day, spent, transaction_count)
+        SELECT
+            t.user_id,
+            COALESCE(t.category_id, 0),
+            t.{day},
+            SUM(COALESCE(t.amount_in_default, 0)),
+            COUNT(*)
+        FROM transactions t
+        JOIN accounts a ON a.id = t.account_id AND a.is_deleted = FALSE
+        WHERE t.transaction_type = 'expense'
+        GROUP BY 1, 2, 3;
+        """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "timezone", sa.String(), nullable=False, server_default=sa.text("'UTC'")
+        ),
+    )
+    op.add_column("transactions", sa.Column("local_date", sa.Date(), nullable=True))
+
+    # date is UTC, local_date is the day it fell on for the user. The shared
+    # lock waits out a timezone change in progress before reading it.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_transaction_local_date() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock_shared(hashtext('daily_spend'), NEW.user_id);
+            NEW.local_date := (
+                NEW.date AT TIME ZONE 'UTC'
+                AT TIME ZONE (SELECT timezone FROM users WHERE id = NEW.user_id)
+            )::date;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER transactions_local_date
+        BEFORE INSERT OR UPDATE OF date, user_id ON transactions
+        FOR EACH ROW EXECUTE FUNCTION set_transaction_local_date();
+        """)
+    op.execute(daily_spend_functions("local_date"))
+
+    # Rebucket everything under a lock, the rollup is rebuilt below rather
+    # than through its triggers. Writes to transactions and accounts wait
+    # for the whole rewrite, so run this in a maintenance window.
+    op.execute("LOCK TABLE transactions, accounts IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        "ALTER TABLE transactions DISABLE TRIGGER transactions_daily_spend_update"
+    )
+    op.execute("""
+        UPDATE transactions t
+        SET local_date = (t.date AT TIME ZONE 'UTC' AT TIME ZONE u.timezone)::date
+        FROM users u
+        WHERE u.id = t.user_id
+        """)
+    op.execute(
+        "ALTER TABLE transactions ENABLE TRIGGER transactions_daily_spend_update"
+    )
+    op.alter_column("transactions", "local_date", nullable=False)
+    op.execute(rebuild_daily_spend("local_date"))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_user_id_local_date",
+            "transactions",
+            ["user_id", "local_date"],
+            postgresql_include=[
+                "category_id",
+                "transaction_type",
+                "amount_in_default",
+                "account_id",
+            ],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_transactions_user_id_local_date",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute(daily_spend_functions("date::date"))
+    op.execute("LOCK TABLE transactions, accounts IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(rebuild_daily_spend("date::date"))
+    op.execute("DROP TRIGGER IF EXISTS transactions_local_date ON transactions")
+    op.execute("DROP FUNCTION IF EXISTS set_transaction_local_date()")
+    op.drop_column("transactions", "local_date")
+    op.drop_column("users", "timezone")
@@ -0,0 +1,172 @@
+"""Added daily_spend rollup
+
+Revision ID: d4bacbc2f02a
+Revises: 339b9c6e71d5
+Create Date: 2026-10-18 10:41:07.512930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d4bacbc2f02a"
+down_revision: Union[str, Sequence[str], None] = "339b9c6e71d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_spend",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("spent", sa.BigInteger(), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "category_id", "day"),
+    )
+
+    # Same shape as apply_monthly_summary_delta. The shared advisory lock per
+    # user lets reconcile_daily_spend recompute a user without racing writers.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION apply_daily_spend_delta() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM pg_advisory_xact_lock_shared(hashtext('daily_spend'), user_id)
+                FROM (SELECT DISTINCT user_id FROM old_rows ORDER BY 1) u;
+
+                INSERT INTO daily_spend AS ds
+                    (user_id, category_id, day, spent, transaction_count)
+                SELECT
+                    t.user_id,
+                    COALESCE(t.category_id, 0),
+                    t.date::date,
+                    -SUM(COALESCE(t.amount_in_default, 0)),
+                    -COUNT(*)
+                FROM old_rows t
+                JOIN accounts a ON a.id = t.account_id AND a.is_deleted = FALSE
+                WHERE t.transaction_type = 'expense'
+                GROUP BY 1, 2, 3
+                ORDER BY 1, 2, 3
+                ON CONFLICT (user_id, category_id, day) DO UPDATE SET
+                    spent = ds.spent + EXCLUDED.spent,
+                    transaction_count = ds.transaction_count + EXCLUDED.transaction_count;
+
+                DELETE FROM daily_spend ds
+                USING (SELECT DISTINCT user_id FROM old_rows) o
+                WHERE ds.user_id = o.user_id AND ds.transaction_count = 0;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM pg_advisory_xact_lock_shared(hashtext('daily_spend'), user_id)
+                FROM (SELECT DISTINCT user_id FROM new_rows ORDER BY 1) u;
+
+                INSERT INTO daily_spend AS ds
+                    (user_id, category_id, day, spent, transaction_count)
+                SELECT
+                    t.user_id,
+                    COALESCE(t.category_id, 0),
+                    t.date::date,
+                    SUM(COALESCE(t.amount_in_default, 0)),
+                    COUNT(*)
+                FROM new_rows t
+                JOIN accounts a ON a.id = t.account_id AND a.is_deleted = FALSE
+                WHERE t.transaction_type = 'expense'
+                GROUP BY 1, 2, 3
+                ORDER BY 1, 2, 3
+                ON CONFLICT (user_id, category_id, day) DO UPDATE SET
+                    spent = ds.spent + EXCLUDED.spent,
+                    transaction_count = ds.transaction_count + EXCLUDED.transaction_count;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+    op.execute("""
+        CREATE TRIGGER transactions_daily_spend_insert
+        AFTER INSERT ON transactions
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION apply_daily_spend_delta();
+
+        CREATE TRIGGER transactions_daily_spend_update
+        AFTER UPDATE ON transactions
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION apply_daily_spend_delta();
+
+        CREATE TRIGGER transactions_daily_spend_delete
+        AFTER DELETE ON transactions
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION apply_daily_spend_delta();
+        """)
+
+    # Deleting an account takes its transactions out of every budget
+    op.execute("""
+        CREATE OR REPLACE FUNCTION apply_account_daily_spend() RETURNS trigger AS $$
+        DECLARE
+            direction int := CASE WHEN NEW.is_deleted IS FALSE THEN 1 ELSE -1 END;
+        BEGIN
+            PERFORM pg_advisory_xact_lock_shared(hashtext('daily_spend'), NEW.user_id);
+
+            INSERT INTO daily_spend AS ds
+                (user_id, category_id, day, spent, transaction_count)
+            SELECT
+                user_id,
+                COALESCE(category_id, 0),
+                date::date,
+                direction * SUM(COALESCE(amount_in_default, 0)),
+                direction * COUNT(*)
+            FROM transactions
+            WHERE account_id = NEW.id AND transaction_type = 'expense'
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+            ON CONFLICT (user_id, category_id, day) DO UPDATE SET
+                spent = ds.spent + EXCLUDED.spent,
+                transaction_count = ds.transaction_count + EXCLUDED.transaction_count;
+
+            DELETE FROM daily_spend
+            WHERE user_id = NEW.user_id AND transaction_count = 0;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+    op.execute("""
+        CREATE TRIGGER accounts_daily_spend
+        AFTER UPDATE OF is_deleted ON accounts
+        FOR EACH ROW
+        WHEN ((OLD.is_deleted IS FALSE) IS DISTINCT FROM (NEW.is_deleted IS FALSE))
+        EXECUTE FUNCTION apply_account_daily_spend();
+        """)
+
+    op.execute("LOCK TABLE transactions, accounts IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+        INSERT INTO daily_spend
+            (user_id, category_id, day, spent, transaction_count)
+        SELECT
+            t.user_id,
+            COALESCE(t.category_id, 0),
+            t.date::date,
+            SUM(COALESCE(t.amount_in_default, 0)),
+            COUNT(*)
+        FROM transactions t
+        JOIN accounts a ON a.id = t.account_id AND a.is_deleted = FALSE
+        WHERE t.transaction_type = 'expense'
+        GROUP BY 1, 2, 3
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS accounts_daily_spend ON accounts")
+    op.execute("DROP TRIGGER IF EXISTS transactions_daily_spend_delete ON transactions")
+    op.execute("DROP TRIGGER IF EXISTS transactions_daily_spend_update ON transactions")
+    op.execute("DROP TRIGGER IF EXISTS transactions_daily_spend_insert ON transactions")
+    op.execute("DROP FUNCTION IF EXISTS apply_account_daily_spend()")
+    op.execute("DROP FUNCTION IF EXISTS apply_daily_spend_delta()")
+    op.drop_table("daily_spend")
@@ -0,0 +1,59 @@
+"""Added transaction user date indexes
+
+Revision ID: f26a4f3d809d
+Revises: ac7eb211ff9e
+Create Date: 2026-10-18 08:02:11.412870
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f26a4f3d809d"
+down_revision: Union[str, Sequence[str], None] = "ac7eb211ff9e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, but it doesn't lock writes
+    # on transactions while the indexes build
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_user_id_date_id",
+            "transactions",
+            ["user_id", sa.text("date DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_transactions_user_id_category_id_date",
+            "transactions",
+            ["user_id", "category_id", "date"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_transactions_user_id_category_id_date",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_transactions_user_id_date_id",
+            table_name="transactions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -8,6 +8,8 @@ from . import (
     rules,
     budget,
     chat,
+    summary,
+    outbox,
 )
 from core.db import engine
 
@@ -1,4 +1,13 @@
-from sqlalchemy import TIMESTAMP, Column, ForeignKey, Integer, String, text
+from sqlalchemy import (
+    TIMESTAMP,
+    BigInteger,
+    Column,
+    Date,
+    ForeignKey,
+    Integer,
+    String,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from core.db import Base
@@ -25,3 +34,32 @@ class Budget(Base):
     updated_at = Column(TIMESTAMP(timezone=True), nullable=True, onupdate=text("now()"))
     category = relationship("Category")
     user_currency = relationship("UserCurrency")
+
+
+class DailySpend(Base):
+    """Per user, per category, per day, per currency expense rollup for
+    budgets.
+
+    day is the user's local calendar day (transactions.local_date), so a
+    budget period is a range of rows. spent sums amount_in_default, which is
+    in the transaction's own currency: divide by user_currency_id's
+    exchange_rate for the default currency. category_id is 0 for
+    uncategorised transactions and transactions on deleted accounts are left
+    out. Maintained by triggers on transactions and
+    accounts, and corrected by the reconcile_daily_spend job.
+    """
+
+    __tablename__ = "daily_spend"
+
+    user_id = Column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
+    category_id = Column(Integer, primary_key=True, nullable=False)
+    day = Column(Date, primary_key=True, nullable=False)
+    user_currency_id = Column(
+        ForeignKey("users_currencies.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    spent = Column(BigInteger, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
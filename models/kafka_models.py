@@ -1,8 +1,8 @@
 from datetime import date
-from typing import ClassVar
+from typing import ClassVar, Optional
 from pydantic import BaseModel, Field, model_validator
 
-from schemas.enums import TransactionTypeEnum
+from schemas.enums import BudgetPeriodEnum, TransactionTypeEnum
 
 
 class TransactionDoc(BaseModel):
@@ -17,4 +17,21 @@ class TransactionDoc(BaseModel):
     category: str
     currency: str
     amount: int
+    amount_in_default: int = 0
+    user_currency_id: Optional[int] = None
+    # The user's calendar day, which budget periods are counted in
+    local_date: Optional[date] = None
     date_utc: str = date.today().isoformat().replace("+00:00", "Z")
+
+
+class BudgetAlert(BaseModel):
+    user_id: int
+    budget_id: int
+    category_id: int
+    name: str
+    period: BudgetPeriodEnum
+    period_start: date
+    # The fraction of the budget that spend just crossed
+    threshold: float
+    spent: int
+    amount: int
@@ -0,0 +1,23 @@
+from sqlalchemy import TIMESTAMP, BigInteger, Column, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from core.db import Base
+
+
+class OutboxEvent(Base):
+    """Event waiting to be relayed to Kafka.
+
+    Written in the same database transaction as the change it describes and
+    deleted by the relay once the broker has acknowledged it.
+    """
+
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, primary_key=True)
+    topic = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+    )
@@ -0,0 +1,28 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer
+
+from core.db import Base
+
+
+class MonthlySummary(Base):
+    """Per user, per month income/expense rollup of transactions.
+
+    Amounts are kept in the transaction's own currency (one row per user
+    currency) and converted at read time, so exchange rate changes don't
+    invalidate anything. Maintained by triggers on transactions.
+    """
+
+    __tablename__ = "monthly_summaries"
+
+    user_id = Column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
+    year = Column(Integer, primary_key=True, nullable=False)
+    month = Column(Integer, primary_key=True, nullable=False)
+    user_currency_id = Column(
+        ForeignKey("users_currencies.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    total_income = Column(BigInteger, nullable=False, default=0)
+    total_expense = Column(BigInteger, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
@@ -1,12 +1,18 @@
+from datetime import timezone
+
 from sqlalchemy import (
     TIMESTAMP,
     BigInteger,
     Boolean,
     Column,
+    Date,
     DateTime,
+    FetchedValue,
     ForeignKey,
+    Index,
     Integer,
     String,
+    TypeDecorator,
     text,
 )
 from sqlalchemy.orm import relationship
@@ -14,8 +20,57 @@ from sqlalchemy.orm import relationship
 from core.db import Base
 
 
+class NaiveDateTime(TypeDecorator):
+    """DateTime stored as naive UTC, aware values are converted on bind.
+
+    asyncpg refuses aware datetimes for TIMESTAMP WITHOUT TIME ZONE.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and getattr(value, "tzinfo", None) is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index(
+            "ix_transactions_user_id_date_id",
+            "user_id",
+            text("date DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_transactions_user_id_category_id_date",
+            "user_id",
+            "category_id",
+            "date",
+        ),
+        # Covers budget spend over a range of local days without the heap
+        Index(
+            "ix_transactions_user_id_local_date",
+            "user_id",
+            "local_date",
+            postgresql_include=[
+                "category_id",
+                "transaction_type",
+                "amount_in_default",
+                "account_id",
+                "user_currency_id",
+            ],
+        ),
+        # Mono can return a transaction again on a later sync
+        Index(
+            "uq_transactions_account_id_mono_transaction_id",
+            "account_id",
+            "mono_transaction_id",
+            unique=True,
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(
@@ -37,7 +92,9 @@ class Transaction(Base):
         Integer, ForeignKey("users_currencies.id"), nullable=False
     )
     balance = Column(Integer, nullable=True, default=0)
-    date = Column(DateTime, nullable=False)
+    date = Column(NaiveDateTime, nullable=False)
+    # The user's calendar day for date, set by the transactions_local_date trigger
+    local_date = Column(Date, nullable=False, server_default=FetchedValue())
     is_paid = Column(Boolean, nullable=False, default=True)
     # OPTIONALS
     notes = Column(String, nullable=True)
@@ -21,6 +21,8 @@ class User(Base):
     email = Column(String, unique=True, index=True)
     name = Column(String, nullable=False)
     mono_customer_id = Column(String, nullable=True)
+    # IANA name, budget periods follow the user's calendar
+    timezone = Column(String, nullable=False, server_default=text("'UTC'"))
     last_activity_time = Column(
         TIMESTAMP(timezone=True), nullable=True, onupdate=text("now()")
     )
@@ -36,3 +36,13 @@ class BudgetWithAmountResponse(BudgetResponse):
 class TotalBudgetResponse(BaseModel):
     total_budget: int
     total_spent: int
+
+
+class BudgetPeriodOverview(TotalBudgetResponse):
+    budgets: list[BudgetWithAmountResponse] = []
+
+
+class BudgetOverviewResponse(BaseModel):
+    daily: BudgetPeriodOverview
+    weekly: BudgetPeriodOverview
+    monthly: BudgetPeriodOverview
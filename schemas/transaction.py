@@ -36,6 +36,11 @@ class TransactionResponse(ReturnBaseModel, TransactionCreate):
     category: CreateCategoryResponse
 
 
+class TransactionPageResponse(BaseModel):
+    transactions: list[TransactionResponse]
+    next_cursor: Optional[str] = None
+
+
 class MonoTransactionCreate(TransactionBase):
     mono_transaction_id: str
     mono_type: Optional[str] = None
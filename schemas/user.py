@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from schemas.category import UserCategoryResponse
 from schemas.currency import UserCurrencyResponse
@@ -10,12 +10,31 @@ from schemas.subscription import UserSubscriptionResponse
 class RegisterPayload(BaseModel):
     id_token: str
     name: str
+    timezone: Optional[str] = None
 
 
 class RegisterCreate(BaseModel):
     name: str
     email: str
     uid: str
+    timezone: str = "UTC"
+
+
+class UserUpdate(BaseModel):
+    timezone: str
+
+
+class AuthUser(BaseModel):
+    """The authenticated caller, without any of the user's relationships."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    uid: str
+    email: Optional[str] = None
+    name: str
+    timezone: str = "UTC"
+    last_activity_time: Optional[datetime] = None
 
 
 class RegisterResponse(BaseModel):
@@ -23,6 +42,7 @@ class RegisterResponse(BaseModel):
     uid: str
     email: str
     name: str
+    timezone: str
     created_at: datetime
     updated_at: Optional[datetime] = None
     subscription: Optional[UserSubscriptionResponse] = None
@@ -0,0 +1,201 @@
+"""Time the /summary service work against a user's transaction history size.
+
+Creates a throwaway user, grows their history to each requested size and
+times AccountSummaryService.get_account_summary next to the full-history
+load the endpoint used to do (every transaction fetched, converted to a
+dict and summed in Python). The user and their data are removed afterwards.
+
+    python scripts/benchmark_account_summary.py --rows 1000 10000 100000
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import joinedload
+
+from core.db import AsyncSessionLocal, async_engine, engine
+from crud.account import get_async_crud_account
+from crud.currency import get_async_crud_currency, get_async_crud_user_currency
+from crud.summary import get_async_crud_total_summary
+from models.currency import UserCurrency
+from models.transaction import Transaction
+from services.account import AccountService
+from services.summary import AccountSummaryService
+from utils.helper import convert_sql_models_to_dict
+
+
+def create_user(conn) -> int:
+    uid = f"benchmark-{uuid.uuid4().hex}"
+    user_id = conn.execute(
+        text(
+            "INSERT INTO users (uid, email, name) VALUES (:uid, :email, 'Benchmark') "
+            "RETURNING id"
+        ),
+        {"uid": uid, "email": f"{uid}@example.com"},
+    ).scalar_one()
+    for code, rate, is_default in [("USD", 1, True), ("NGN", 1500, False)]:
+        user_currency_id = conn.execute(
+            text("""
+                INSERT INTO users_currencies (user_id, currency_id, exchange_rate, is_default)
+                SELECT :user_id, id, :rate, :is_default FROM currencies WHERE code = :code
+                RETURNING id
+                """),
+            {"user_id": user_id, "rate": rate, "is_default": is_default, "code": code},
+        ).scalar_one()
+        conn.execute(
+            text("""
+                INSERT INTO accounts
+                    (user_id, name, user_currency_id, amount, amount_in_default,
+                     account_type, account_category, is_deleted)
+                VALUES (:user_id, :name, :user_currency_id, 100000, 100000,
+                        'manual', 'balance', FALSE)
+                """),
+            {"user_id": user_id, "name": code, "user_currency_id": user_currency_id},
+        )
+    return user_id
+
+
+def add_transactions(conn, user_id: int, rows: int):
+    # Three years of history, alternating between the user's two accounts
+    conn.execute(
+        text("""
+            INSERT INTO transactions
+                (user_id, amount, amount_in_default, transaction_type, account_id,
+                 user_currency_id, date, is_paid)
+            SELECT
+                :user_id,
+                (random() * 100000)::bigint,
+                (random() * 100000)::bigint,
+                CASE WHEN g % 3 = 0 THEN 'income' ELSE 'expense' END,
+                a.id,
+                a.user_currency_id,
+                now()::timestamp - random() * interval '3 years',
+                TRUE
+            FROM generate_series(1, :rows) g
+            JOIN LATERAL (
+                SELECT id, user_currency_id FROM accounts
+                WHERE user_id = :user_id
+                ORDER BY id OFFSET g % 2 LIMIT 1
+            ) a ON TRUE
+            """),
+        {"user_id": user_id, "rows": rows},
+    )
+    conn.execute(text("ANALYZE transactions"))
+
+
+def delete_user(conn, user_id: int):
+    for table in ["transactions", "accounts", "users_currencies"]:
+        conn.execute(
+            text(f"DELETE FROM {table} WHERE user_id = :user_id"), {"user_id": user_id}
+        )
+    conn.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
+
+
+async def full_history_totals(user_id: int):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Transaction)
+            .filter(
+                Transaction.user_id == user_id,
+                Transaction.account.has(is_deleted=False),
+            )
+            .options(
+                joinedload(Transaction.category),
+                joinedload(Transaction.user_currency).joinedload(UserCurrency.currency),
+                joinedload(Transaction.account),
+            )
+        )
+        transactions = list(result.scalars().all())
+        transactions = [convert_sql_models_to_dict(t) for t in transactions]
+        income = sum(
+            Decimal(t["amount_in_default"])
+            for t in transactions
+            if t["transaction_type"] == "income"
+        )
+        expense = sum(
+            Decimal(t["amount_in_default"])
+            for t in transactions
+            if t["transaction_type"] == "expense"
+        )
+        return income, expense
+
+
+async def account_summary(user_id: int):
+    async with AsyncSessionLocal() as db:
+        account_summary_service = AccountSummaryService(
+            crud_total_summary=get_async_crud_total_summary(db=db),
+            account_service=AccountService(
+                crud_account=get_async_crud_account(db=db),
+                crud_currency=get_async_crud_currency(db=db),
+                crud_user_currency=get_async_crud_user_currency(db=db),
+            ),
+        )
+        return await account_summary_service.get_account_summary(
+            user_id=user_id, date=date.today()
+        )
+
+
+async def measure(func, user_id: int, iterations: int) -> list[float]:
+    await func(user_id)  # warm up the pool and statement cache
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func(user_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, rows: int, timings: list[float]):
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(
+        f"{label:<20} rows={rows:<9} p50={statistics.median(timings):9.2f}ms "
+        f"p95={p95:9.2f}ms"
+    )
+
+
+async def run(user_id: int, sizes: list[int], iterations: int):
+    seeded = 0
+    for rows in sorted(sizes):
+        with engine.begin() as conn:
+            add_transactions(conn, user_id, rows - seeded)
+        seeded = rows
+        report(
+            "full history",
+            rows,
+            await measure(full_history_totals, user_id, iterations),
+        )
+        report(
+            "account summary", rows, await measure(account_summary, user_id, iterations)
+        )
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        user_id = create_user(conn)
+    try:
+        asyncio.run(run(user_id, args.rows, args.iterations))
+    finally:
+        with engine.begin() as conn:
+            delete_user(conn, user_id)
+
+
+if __name__ == "__main__":
+    main()
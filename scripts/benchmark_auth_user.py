@@ -0,0 +1,144 @@
+"""Time the per-request user lookup done by authorization.
+
+Creates a throwaway user with --currencies currencies and --categories
+categories and times the old eager-loaded lookup (subscriptions, currencies
+and categories joined in one query) next to the AuthUser principal that
+get_current_user now loads, and the opt-in profile used by /auth/me. The
+user and their data are removed afterwards.
+
+    python scripts/benchmark_auth_user.py --currencies 20 --categories 100
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.orm import joinedload
+
+from core.db import AsyncSessionLocal, SessionLocal, async_engine, engine
+from crud.user import get_async_crud_auth_user
+from models.category import UserCategory
+from models.currency import UserCurrency
+from models.user import User
+from schemas.user import AuthUser
+
+
+def create_user(conn, currencies: int, categories: int) -> tuple[int, str]:
+    uid = f"benchmark-{uuid.uuid4().hex}"
+    user_id = conn.execute(
+        text(
+            "INSERT INTO users (uid, email, name) VALUES (:uid, :email, 'Benchmark') "
+            "RETURNING id"
+        ),
+        {"uid": uid, "email": f"{uid}@example.com"},
+    ).scalar_one()
+    conn.execute(
+        text("""
+            INSERT INTO users_currencies (user_id, currency_id, exchange_rate, is_default)
+            SELECT :user_id, id, 1, row_number() OVER (ORDER BY id) = 1
+            FROM currencies ORDER BY id LIMIT :currencies
+            """),
+        {"user_id": user_id, "currencies": currencies},
+    )
+    conn.execute(
+        text("""
+            WITH new_categories AS (
+                INSERT INTO categories (name, type, is_default)
+                SELECT :prefix || g, 'expense', FALSE
+                FROM generate_series(1, :categories) g
+                RETURNING id
+            )
+            INSERT INTO users_categories (user_id, category_id)
+            SELECT :user_id, id FROM new_categories
+            """),
+        {"user_id": user_id, "categories": categories, "prefix": uid},
+    )
+    return user_id, uid
+
+
+def delete_user(conn, user_id: int, uid: str):
+    conn.execute(
+        text("DELETE FROM categories WHERE name LIKE :prefix"), {"prefix": f"{uid}%"}
+    )
+    for table in ["users_categories", "users_currencies"]:
+        conn.execute(
+            text(f"DELETE FROM {table} WHERE user_id = :user_id"), {"user_id": user_id}
+        )
+    conn.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
+
+
+async def eager_user(uid: str):
+    # What get_current_user used to run, blocking, on every request
+    with SessionLocal() as db:
+        return (
+            db.query(User)
+            .filter(User.uid == uid)
+            .options(joinedload(User.subscriptions))
+            .options(joinedload(User.currencies).joinedload(UserCurrency.currency))
+            .options(joinedload(User.categories).joinedload(UserCategory.category))
+            .first()
+        )
+
+
+async def auth_user(uid: str):
+    async with AsyncSessionLocal() as db:
+        row = await get_async_crud_auth_user(db=db).get_auth_user_by_uid(uid)
+        return AuthUser.model_validate(row)
+
+
+async def user_profile(uid: str):
+    async with AsyncSessionLocal() as db:
+        crud_auth_user = get_async_crud_auth_user(db=db)
+        row = await crud_auth_user.get_auth_user_by_uid(uid)
+        return await crud_auth_user.get_user_profile(row.id)
+
+
+async def measure(func, uid: str, iterations: int) -> list[float]:
+    await func(uid)  # warm up the pool and statement cache
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func(uid)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]):
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(f"{label:<20} p50={statistics.median(timings):8.2f}ms p95={p95:8.2f}ms")
+
+
+async def run(uid: str, iterations: int):
+    report("eager user", await measure(eager_user, uid, iterations))
+    report("auth principal", await measure(auth_user, uid, iterations))
+    report("profile (opt-in)", await measure(user_profile, uid, iterations))
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--currencies", type=int, default=20)
+    parser.add_argument("--categories", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        user_id, uid = create_user(conn, args.currencies, args.categories)
+    try:
+        asyncio.run(run(uid, args.iterations))
+    finally:
+        with engine.begin() as conn:
+            delete_user(conn, user_id, uid)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Measure rows/sec for writing a Mono sync batch into transactions.
+
+Creates a throwaway user and account, then inserts --rows synthetic synced
+rows through the old per-row path (a MonoTransactionCreate validated and
+dumped per row, then ORM objects flushed by bulk_insert) and through
+AsyncCRUDTransaction.insert_mono_transactions. Each run is rolled back, and
+the user is removed afterwards.
+
+    python scripts/benchmark_mono_insert.py --rows 1000 10000 50000
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from core.db import AsyncSessionLocal, async_engine, engine
+from crud.transaction import get_async_crud_transaction
+from schemas.transaction import MonoTransactionCreate
+
+
+def create_user(conn) -> tuple[int, int, int]:
+    uid = f"benchmark-{uuid.uuid4().hex}"
+    user_id = conn.execute(
+        text(
+            "INSERT INTO users (uid, email, name) VALUES (:uid, :email, 'Benchmark') "
+            "RETURNING id"
+        ),
+        {"uid": uid, "email": f"{uid}@example.com"},
+    ).scalar_one()
+    user_currency_id = conn.execute(
+        text("""
+            INSERT INTO users_currencies (user_id, currency_id, exchange_rate, is_default)
+            SELECT :user_id, id, 1, TRUE FROM currencies WHERE code = 'NGN'
+            RETURNING id
+            """),
+        {"user_id": user_id},
+    ).scalar_one()
+    account_id = conn.execute(
+        text("""
+            INSERT INTO accounts
+                (user_id, name, user_currency_id, amount, amount_in_default,
+                 account_type, account_category, is_deleted)
+            VALUES (:user_id, 'Mono', :user_currency_id, 0, 0,
+                    'automatic', 'balance', FALSE)
+            RETURNING id
+            """),
+        {"user_id": user_id, "user_currency_id": user_currency_id},
+    ).scalar_one()
+    return user_id, user_currency_id, account_id
+
+
+def delete_user(conn, user_id: int):
+    for table in ["accounts", "users_currencies"]:
+        conn.execute(
+            text(f"DELETE FROM {table} WHERE user_id = :user_id"), {"user_id": user_id}
+        )
+    conn.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
+
+
+def make_rows(rows: int, user_id: int, user_currency_id: int, account_id: int):
+    # Laid out as MONO_TRANSACTION_COLUMNS
+    start = datetime(2024, 1, 1)
+    category_id = 1
+    return [
+        (
+            f"bench-{uuid.uuid4().hex}",
+            "debit" if i % 2 else "credit",
+            f"NIP/KUDA/PERSON {i % 50}/X",
+            1000 + i,
+            1000 + i,
+            0,
+            "expense" if i % 2 else "income",
+            category_id,
+            account_id,
+            user_currency_id,
+            user_id,
+            start + timedelta(minutes=i),
+        )
+        for i in range(rows)
+    ]
+
+
+async def orm_insert(rows: list[tuple]):
+    # The path create_mono_transactions used before
+    async with AsyncSessionLocal() as db:
+        data = [
+            MonoTransactionCreate(
+                mono_transaction_id=row[0],
+                mono_type=row[1],
+                narration=row[2],
+                amount=row[3],
+                amount_in_default=row[4],
+                balance=row[5],
+                transaction_type=row[6],
+                category_id=row[7],
+                account_id=row[8],
+                user_currency_id=row[9],
+                user_id=row[10],
+                date=row[11],
+            ).model_dump()
+            for row in rows
+        ]
+        await get_async_crud_transaction(db=db).bulk_insert(data, commit=False)
+        await db.rollback()
+
+
+async def core_insert(rows: list[tuple]):
+    async with AsyncSessionLocal() as db:
+        await get_async_crud_transaction(db=db).insert_mono_transactions(rows)
+        await db.rollback()
+
+
+async def measure(label: str, func, rows: list[tuple]):
+    start = time.perf_counter()
+    await func(rows)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<16} rows={len(rows):<8} {elapsed * 1000:10.1f}ms "
+        f"{len(rows) / elapsed:12.0f} rows/sec"
+    )
+
+
+async def run(ids: tuple[int, int, int], sizes: list[int]):
+    await core_insert(make_rows(100, *ids))  # warm up the pool
+    for size in sizes:
+        rows = make_rows(size, *ids)
+        await measure("orm bulk_insert", orm_insert, rows)
+        await measure("core unnest", core_insert, rows)
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        ids = create_user(conn)
+    try:
+        asyncio.run(run(ids, args.rows))
+    finally:
+        with engine.begin() as conn:
+            delete_user(conn, ids[0])
+
+
+if __name__ == "__main__":
+    main()
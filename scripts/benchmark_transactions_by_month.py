@@ -0,0 +1,174 @@
+"""Compare query plans for the monthly transaction listing.
+
+Seeds a scratch copy of the transaction tables in its own schema (the real
+tables are never touched), then runs EXPLAIN ANALYZE on the old
+extract(month/year) filter and on the half-open date range filter used by
+AsyncCRUDTransaction, before and after adding the composite indexes.
+
+    python scripts/benchmark_transactions_by_month.py --rows 10000000
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+from datetime import date
+
+from sqlalchemy import extract, text
+from sqlalchemy.dialects import postgresql
+
+from core.db import engine
+from crud.transaction import AsyncCRUDTransaction
+from models.transaction import Transaction
+
+SCHEMA = "bench_transactions"
+
+
+def seed(conn, rows: int, users: int):
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    for table in ["currencies", "users_currencies", "categories", "accounts"]:
+        conn.execute(
+            text(
+                f"CREATE TABLE {SCHEMA}.{table} "
+                f"(LIKE public.{table} INCLUDING DEFAULTS INCLUDING INDEXES)"
+            )
+        )
+    # Only the indexes transactions had before the composite ones were added
+    conn.execute(
+        text(
+            f"CREATE TABLE {SCHEMA}.transactions "
+            "(LIKE public.transactions INCLUDING DEFAULTS)"
+        )
+    )
+    conn.execute(text(f"ALTER TABLE {SCHEMA}.transactions ADD PRIMARY KEY (id)"))
+    conn.execute(
+        text(f"CREATE INDEX ON {SCHEMA}.transactions (user_id)"),
+    )
+
+    conn.execute(
+        text(
+            f"INSERT INTO {SCHEMA}.currencies (id, code, name) VALUES (1, 'USD', 'US Dollar')"
+        )
+    )
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO {SCHEMA}.categories (id, name, type, is_default)
+            SELECT g, 'Category ' || g, 'expense', TRUE FROM generate_series(1, 20) g
+            """
+        )
+    )
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO {SCHEMA}.users_currencies (id, user_id, currency_id, exchange_rate, is_default)
+            SELECT g, g, 1, 1, TRUE FROM generate_series(1, :users) g
+            """
+        ),
+        {"users": users},
+    )
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO {SCHEMA}.accounts
+                (id, user_id, name, user_currency_id, amount, amount_in_default,
+                 account_type, account_category, is_deleted)
+            SELECT g, g, 'Account', g, 0, 0, 'manual', 'balance', FALSE
+            FROM generate_series(1, :users) g
+            """
+        ),
+        {"users": users},
+    )
+    # Three years of history spread over every user
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO {SCHEMA}.transactions
+                (id, user_id, amount, amount_in_default, transaction_type,
+                 category_id, account_id, user_currency_id, date, is_paid)
+            SELECT
+                g,
+                (g % :users) + 1,
+                (random() * 100000)::bigint,
+                (random() * 100000)::bigint,
+                CASE WHEN g % 3 = 0 THEN 'income' ELSE 'expense' END,
+                (g % 20) + 1,
+                (g % :users) + 1,
+                (g % :users) + 1,
+                now()::timestamp - random() * interval '3 years',
+                TRUE
+            FROM generate_series(1, :rows) g
+            """
+        ),
+        {"rows": rows, "users": users},
+    )
+    conn.execute(text(f"ANALYZE {SCHEMA}.transactions"))
+
+
+def add_indexes(conn):
+    conn.execute(
+        text(
+            f"CREATE INDEX ON {SCHEMA}.transactions (user_id, date DESC, id DESC)"
+        )
+    )
+    conn.execute(
+        text(f"CREATE INDEX ON {SCHEMA}.transactions (user_id, category_id, date)")
+    )
+    conn.execute(text(f"ANALYZE {SCHEMA}.transactions"))
+
+
+def explain(conn, label: str, query):
+    compiled = query.compile(dialect=postgresql.psycopg2.dialect())
+    plan = conn.exec_driver_sql(
+        "EXPLAIN (ANALYZE, BUFFERS) " + str(compiled), compiled.params
+    ).all()
+    print(f"\n=== {label} ===")
+    for (line,) in plan:
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema")
+    args = parser.parse_args()
+
+    crud_transaction = AsyncCRUDTransaction(model=Transaction, db=None)
+    user_id, month = 42, date.today()
+    old_query = crud_transaction._get_transaction_query_by_user_id(user_id).filter(
+        extract("month", Transaction.date) == month.month,
+        extract("year", Transaction.date) == month.year,
+    )
+    new_query = (
+        crud_transaction._get_transaction_query_by_month(user_id, month)
+        .order_by(None)
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+    )
+
+    with engine.connect() as conn:
+        print(f"Seeding {args.rows} transactions for {args.users} users...")
+        with conn.begin():
+            seed(conn, rows=args.rows, users=args.users)
+        try:
+            with conn.begin():
+                conn.execute(text(f"SET LOCAL search_path TO {SCHEMA}"))
+                explain(conn, "extract(), user_id index only", old_query)
+                explain(conn, "date range, user_id index only", new_query)
+            with conn.begin():
+                add_indexes(conn)
+            with conn.begin():
+                conn.execute(text(f"SET LOCAL search_path TO {SCHEMA}"))
+                explain(conn, "extract(), composite indexes", old_query)
+                explain(conn, "date range, composite indexes", new_query)
+        finally:
+            if not args.keep:
+                with conn.begin():
+                    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,15 @@
 from decimal import ROUND_HALF_UP, Decimal
 from sqlalchemy import Column
 from core.exceptions import MissingResource
-from crud.account import CRUDAccount
+from crud.account import AsyncCRUDAccount
 from crud.currency import (
-    CRUDCurrency,
-    CRUDUserCurrency,
+    AsyncCRUDCurrency,
+    AsyncCRUDUserCurrency,
 )
 from models.account import Account
 from schemas.account import AccountCreate
 from schemas.enums import AccountCategoryEnum, AccountTypeEnum
+from services.user_context import ACCOUNTS, user_context_cache
 from utils.currency_conversion import to_minor_units
 from utils.helper import convert_sql_models_to_dict, extract_beneficiary
 
@@ -16,9 +17,9 @@ from utils.helper import convert_sql_models_to_dict, extract_beneficiary
 class AccountService:
     def __init__(
         self,
-        crud_account: CRUDAccount,
-        crud_user_currency: CRUDUserCurrency,
-        crud_currency: CRUDCurrency,
+        crud_account: AsyncCRUDAccount,
+        crud_user_currency: AsyncCRUDUserCurrency,
+        crud_currency: AsyncCRUDCurrency,
     ):
         self.crud_account = crud_account
         self.crud_user_currency = crud_user_currency
@@ -37,22 +38,26 @@ class AccountService:
             data_obj.credit_amount = 0
 
         # Check user currency
-        user_currency = self.crud_user_currency.get_user_currency(
+        user_currency = await self.crud_user_currency.get_user_currency(
             user_id, data_obj.user_currency_id
         )
         if not user_currency:
-            user_currency = self.crud_user_currency.get_user_default_currency(user_id)
+            user_currency = await self.crud_user_currency.get_user_default_currency(
+                user_id
+            )
         data_obj.user_currency_id = user_currency.id
         data_obj.amount = to_minor_units(data_obj.amount, user_currency.currency.code)
         data_obj.amount_in_default = data_obj.amount
         data_obj.user_id = user_id
         data_obj.account_type = AccountTypeEnum.MANUAL
-        return self.crud_account.create(data_obj.model_dump())
+        account = await self.crud_account.create(data_obj.model_dump())
+        await user_context_cache.invalidate(user_id, ACCOUNTS)
+        return account
 
     async def update_account(
         self, account_id: int, data_obj: AccountCreate, user_id: int
     ) -> Account:
-        account = self.crud_account.get_account_by_id(
+        account = await self.crud_account.get_account_by_id(
             account_id=account_id, user_id=user_id
         )
         if not account:
@@ -64,27 +69,31 @@ class AccountService:
         if data_obj.credit_amount < 0:
             data_obj.credit_amount = 0
 
-        user_currency = self.crud_user_currency.get_user_currency(
+        user_currency = await self.crud_user_currency.get_user_currency(
             user_id, data_obj.user_currency_id
         )
         if not user_currency:
             raise MissingResource(message="User currency not found")
 
         data_obj.amount = to_minor_units(data_obj.amount, user_currency.currency.code)
-        return self.crud_account.update(id=account_id, data_obj=data_obj)
+        account = await self.crud_account.update(id=account_id, data_obj=data_obj)
+        await user_context_cache.invalidate(user_id, ACCOUNTS)
+        return account
 
     async def delete_account(self, account_id: int, user_id: int) -> Account:
-        account = self.crud_account.get_account_by_id(
+        account = await self.crud_account.get_account_by_id(
             account_id=account_id, user_id=user_id
         )
         if not account:
             raise MissingResource(message="Account not found")
-        return self.crud_account.update(
+        account = await self.crud_account.update(
             id=account_id, data_obj={AccountCreate.IS_DELETED: True}
         )
+        await user_context_cache.invalidate(user_id, ACCOUNTS)
+        return account
 
     async def list_accounts(self, user_id: int):
-        accounts = self.crud_account.get_public_accounts(user_id=user_id)
+        accounts = await self.crud_account.get_public_accounts(user_id=user_id)
         accounts = [convert_sql_models_to_dict(account) for account in accounts]
 
         total_balance = await self.calculate_account_balance(user_id=user_id)
@@ -92,7 +101,7 @@ class AccountService:
         return {"total_balance": total_balance, "accounts": accounts}
 
     async def calculate_account_balance(self, user_id: int):
-        accounts = self.crud_account.get_public_accounts(user_id=user_id)
+        accounts = await self.crud_account.get_public_accounts(user_id=user_id)
 
         accounts = [convert_sql_models_to_dict(account) for account in accounts]
         total_balance = Decimal(0)
@@ -107,13 +116,21 @@ class AccountService:
 
         return total_balance
 
+    async def _get_cached_accounts(self, user_id: int, account_id: int | None):
+        return await user_context_cache.get_including(
+            user_id,
+            ACCOUNTS,
+            loader=lambda: self.crud_account.get_accounts(user_id),
+            id=account_id,
+        )
+
     async def validate_user_account(
         self,
         user_id: Column[int],
         account_id: int,
         is_paid: bool = True,
     ):
-        user_accounts = self.crud_account.get_accounts(user_id)
+        user_accounts = await self._get_cached_accounts(user_id, account_id)
         if not user_accounts:
             raise MissingResource(message="No accounts found for the user.")
         if account_id:
@@ -1,14 +1,15 @@
 from datetime import datetime, timedelta, timezone
 from decimal import ROUND_HALF_UP, Decimal
 from uuid import uuid4
-from httpx import AsyncClient, HTTPError
+from httpx import HTTPError
 
 import logfire
 
 from core.exceptions import InvalidRequest, MissingResource
+from core.http import get_http_client
 from crud.chat import CRUDChat, CRUDSession
 from crud.currency import CRUDUserCurrency
-from crud.transaction import CRUDTransaction
+from crud.transaction import AsyncCRUDTransaction
 from schemas.ai_schemas import NLResolveResult
 from schemas.chat import ChatMessageCreate, SessionChatCreate
 from schemas.enums import ChatRoleEnum
@@ -20,12 +21,14 @@ from core import settings
 class AIInsightService:
     def __init__(
         self,
-        crud_transaction: CRUDTransaction,
+        crud_transaction: AsyncCRUDTransaction,
         crud_user_currency: CRUDUserCurrency,
         crud_chat: CRUDChat,
         crud_session: CRUDSession,
     ):
-        self.http_client = AsyncClient(base_url=settings.AI_SERVICE_URL, timeout=600.0)
+        self.http_client = get_http_client(
+            "ai_service", settings.AI_SERVICE_URL, timeout=600.0
+        )
         self.crud_transaction = crud_transaction
         self.crud_user_currency = crud_user_currency
         self.crud_chat = crud_chat
@@ -83,7 +86,7 @@ class AIInsightService:
         if rsp.resolved_category_id is None:
             raise InvalidRequest(message="No category resolved for the query")
 
-        transactions = self.crud_transaction.get_transaction_by_category_id(
+        transactions = await self.crud_transaction.get_transaction_by_category_id(
             category_id=rsp.resolved_category_id, user_id=user_id
         )
 
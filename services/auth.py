@@ -3,22 +3,22 @@ from crud.currency import (
     CRUDCurrency,
     CRUDUserCurrency,
 )
-from crud.user import CRUDAuthUser
 from fastapi import HTTPException, status, Request
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from firebase_admin import auth as firebase_auth
 
-from core.exceptions import ResourceExists
+from core.exceptions import InvalidRequest, ResourceExists
 from core.externals.mono.mono_client import MonoClient
 from crud.account import CRUDAccount
-from crud.user import CRUDAuthUser
-from schemas.user import RegisterCreate, RegisterPayload
+from crud.user import AsyncCRUDAuthUser
+from schemas.user import RegisterCreate, RegisterPayload, UserUpdate
 
 
 class AuthService:
     def __init__(
         self,
-        crud_auth_user: CRUDAuthUser,
+        crud_auth_user: AsyncCRUDAuthUser,
         crud_account: CRUDAccount,
         crud_currency: CRUDCurrency,
         crud_user_currency: CRUDUserCurrency,
@@ -53,10 +53,12 @@ class AuthService:
             email=decoded.get("email"),
             name=data_obj.name,
         )
-        if self.crud_auth_user.get_by_email(user_data.email):
+        if data_obj.timezone:
+            user_data.timezone = self._validate_timezone(data_obj.timezone)
+        if await self.crud_auth_user.get_by_email(user_data.email):
             raise ResourceExists(message="Account with email already exists")
 
-        new_user = self.crud_auth_user.create(user_data.model_dump())
+        new_user = await self.crud_auth_user.create(user_data.model_dump())
         await self.queue_connection.enqueue_job(
             "add_default_currency",
             user_id=new_user.id,
@@ -69,4 +71,17 @@ class AuthService:
             "add_user_default_categories",
             user_id=new_user.id,
         )
-        return new_user
+        return await self.crud_auth_user.get_user_profile(new_user.id)
+
+    async def update_user(self, user_id: int, data_obj: UserUpdate):
+        timezone = self._validate_timezone(data_obj.timezone)
+        return await self.crud_auth_user.update_timezone(
+            user_id=user_id, timezone=timezone
+        )
+
+    def _validate_timezone(self, timezone: str) -> str:
+        try:
+            ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise InvalidRequest(message=f"Unknown timezone {timezone}")
+        return timezone
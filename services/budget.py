@@ -1,26 +1,25 @@
-from datetime import datetime, timedelta, timezone
 from core.exceptions import InvalidRequest
-from crud.budget import CRUDBudget
-from crud.transaction import CRUDTransaction
+from crud.budget import AsyncCRUDBudget, AsyncCRUDDailySpend
 from schemas.budget import BudgetCreate, TotalBudgetCreate
-from schemas.enums import BudgetPeriodEnum, BudgetTypeEnum, TransactionTypeEnum
+from schemas.enums import BudgetPeriodEnum, BudgetTypeEnum
 from services.category import CategoryService
 from services.currency import CurrencyService
 from services.transaction import TransactionService
 from utils.currency_conversion import to_minor_units
+from utils.datetime_helper import get_period_bounds
 from utils.helper import convert_sql_models_to_dict
 
 
 class BudgetService:
     def __init__(
         self,
-        crud_budget: CRUDBudget,
-        crud_transaction: CRUDTransaction,
+        crud_budget: AsyncCRUDBudget,
+        crud_daily_spend: AsyncCRUDDailySpend,
         currency_service: CurrencyService,
         category_service: CategoryService,
     ):
         self.crud_budget = crud_budget
-        self.crud_transaction = crud_transaction
+        self.crud_daily_spend = crud_daily_spend
         self.currency_service = currency_service
         self.category_service = category_service
 
@@ -39,69 +38,88 @@ class BudgetService:
         data_obj.name = selected_category.category.name
         data_obj.user_currency_id = selected_currency.id
 
-        return self.crud_budget.create(data_obj)
+        budget = await self.crud_budget.create(data_obj)
+        return await self.crud_budget.get_budget_by_id(budget.id)
 
     async def calculate_budget(
         self,
         user_id: int,
         period: BudgetPeriodEnum,
+        timezone: str,
     ):
-        budgets = self.crud_budget.get_budget_by_period(user_id=user_id, period=period)
+        budgets = await self.crud_budget.get_budget_by_period(user_id=user_id, period=period)
 
         if not budgets:
             return []
 
-        transaction_date = await self._get_budget_period_start_date(period=period)
-        budgets_dict_list = [convert_sql_models_to_dict(budget) for budget in budgets]
-        category_ids = [budget.category_id for budget in budgets]
-
-        transactions = self.crud_transaction.get_transactions_by_category_ids(
-            category_ids=category_ids,
+        period = BudgetPeriodEnum(period)
+        spend, _ = await self.crud_daily_spend.get_spend_by_period(
             user_id=user_id,
-            transaction_date=transaction_date,
+            bounds={period: self._get_budget_period(period=period, timezone=timezone)},
         )
 
+        budgets_dict_list = [convert_sql_models_to_dict(budget) for budget in budgets]
         for budget in budgets_dict_list:
-
-            budget_id = budget["category_id"]
-            filtered_trans = [t for t in transactions if t.category_id == budget_id]
-            print(f"second length of transactions: {len(filtered_trans)}")
-            transaction_amount_sum = (
-                sum(t.amount for t in filtered_trans) if filtered_trans else 0
-            )
-
-            budget["spent_amount"] = transaction_amount_sum
+            budget["spent_amount"] = spend.get(budget["id"], 0)
         return budgets_dict_list
 
     async def get_total_budget(
         self,
         user_id: int,
         period: BudgetPeriodEnum,
+        timezone: str,
         budget_type: BudgetTypeEnum = BudgetTypeEnum.TOTAL,
     ):
-
-        transaction_date = await self._get_budget_period_start_date(period=period)
-
-        budget = self.crud_budget.get_budget_by_period(
+        budget = await self.crud_budget.get_budget_by_period(
             user_id=user_id,
             period=period,
             type=budget_type,
         )
         total_budget = budget.amount if budget else 0
 
-        transactions = await self.crud_transaction.get_transaction_by_type_and_date(
+        period = BudgetPeriodEnum(period)
+        spend, totals = await self.crud_daily_spend.get_spend_by_period(
             user_id=user_id,
-            type=TransactionTypeEnum.EXPENSE,
-            transaction_date=transaction_date,
+            bounds={period: self._get_budget_period(period=period, timezone=timezone)},
         )
-
-        total_spent = sum(t.amount for t in transactions) if transactions else 0
+        # In the total budget's currency if there is one, like the overview
+        total_spent = spend.get(budget.id, 0) if budget else totals[period]
         total_budget = {"total_budget": total_budget, "total_spent": total_spent}
 
         return total_budget
 
+    async def get_budget_overview(self, user_id: int, timezone: str):
+        """Every budget with its spend, and the totals, for each period at once."""
+        bounds = {
+            period: self._get_budget_period(period=period, timezone=timezone)
+            for period in BudgetPeriodEnum
+        }
+        budgets = await self.crud_budget.get_budgets_by_user_id(user_id=user_id)
+        spend, totals = await self.crud_daily_spend.get_spend_by_period(
+            user_id=user_id, bounds=bounds
+        )
+
+        overview = {
+            period.value: {
+                "budgets": [],
+                "total_budget": 0,
+                "total_spent": totals[period],
+            }
+            for period in bounds
+        }
+        for budget in budgets:
+            budget_dict = convert_sql_models_to_dict(budget)
+            budget_dict["spent_amount"] = spend.get(budget.id, 0)
+            period_overview = overview[BudgetPeriodEnum(budget.period).value]
+            period_overview["budgets"].append(budget_dict)
+            if budget.type == BudgetTypeEnum.TOTAL:
+                # Same as get_total_budget, in the total budget's currency
+                period_overview["total_budget"] = budget.amount
+                period_overview["total_spent"] = budget_dict["spent_amount"]
+        return overview
+
     async def create_total_budget(self, user_id: int, data_obj: TotalBudgetCreate):
-        budget = self.crud_budget.get_budget_by_period(
+        budget = await self.crud_budget.get_budget_by_period(
             user_id=user_id,
             period=data_obj.period,
             type=BudgetTypeEnum.TOTAL,
@@ -121,18 +139,14 @@ class BudgetService:
         return budget
 
     async def delete_budget(self, budget_id: int, user_id: int):
-        budget = self.crud_budget.get(budget_id)
+        budget = await self.crud_budget.get(budget_id)
         if not budget or budget.user_id != user_id:
             raise InvalidRequest("Budget not found")
-        return self.crud_budget.delete(budget_id)
-
-    async def _get_budget_period_start_date(self, period: BudgetPeriodEnum):
-        today = datetime.now(timezone.utc)
-        if period == BudgetPeriodEnum.WEEKLY:
-            return today - timedelta(weeks=1)
-        elif period == BudgetPeriodEnum.DAILY:
-            return today - timedelta(days=1)
-        elif period == BudgetPeriodEnum.MONTHLY:
-            return today - timedelta(days=30)
-        else:
+        return await self.crud_budget.delete(budget_id)
+
+    def _get_budget_period(self, period: BudgetPeriodEnum, timezone: str):
+        # Calendar day, week or month in the user's timezone
+        try:
+            return get_period_bounds(period, timezone)
+        except ValueError:
             raise InvalidRequest("Invalid budget type")
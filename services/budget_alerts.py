@@ -0,0 +1,384 @@
+"""Budget threshold alerts from the transaction event stream.
+
+Runs as its own process:
+
+    python -m services.budget_alerts
+"""
+
+import logging
+import signal
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Iterable, Optional
+
+import logfire
+from confluent_kafka import Consumer, KafkaException, Message, TopicPartition
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+from zoneinfo import ZoneInfo
+
+from core import settings
+from core.cache import TTLCache
+from core.db import SessionLocal
+from core.topics.budgets import BUDGET_ALERT
+from core.topics.transactions import TRANSACTION_CREATED
+from crud.budget import get_crud_budget
+from models.kafka_models import BudgetAlert, TransactionDoc
+from schemas.enums import BudgetPeriodEnum, BudgetTypeEnum, TransactionTypeEnum
+from services.kafka_producer import (
+    close_producer,
+    flush_producer,
+    kafka_config,
+    publish_many,
+)
+from utils.datetime_helper import get_period_bounds
+
+logger = logging.getLogger(__name__)
+
+CONSUMER_GROUP = "budget-alerts"
+# Covers the start of any current period in any timezone
+SEED_DAYS = 40
+
+events_applied = logfire.metric_counter(
+    "budget_alerts.events", unit="1", description="Expense events applied to totals"
+)
+alerts_sent = logfire.metric_counter(
+    "budget_alerts.sent", unit="1", description="Budget alerts acked by the broker"
+)
+
+
+class BudgetLimit(BaseModel):
+    id: int
+    category_id: int
+    name: str
+    period: BudgetPeriodEnum
+    type: BudgetTypeEnum
+    amount: int
+    exchange_rate: Decimal
+
+
+class UserBudgets:
+    """One user's budgets and the spend against each in its current period,
+    kept in the default currency."""
+
+    def __init__(
+        self,
+        timezone: str,
+        budgets: list[BudgetLimit],
+        rates: Optional[dict[int, Decimal]] = None,
+        last_transaction_id: int = 0,
+        spend: Iterable[tuple[int, date, Decimal]] = (),
+    ):
+        self.timezone = timezone
+        self.budgets = budgets
+        # Exchange rate per user currency id, amount_in_default is divided by it
+        self.rates = rates or {}
+        # Transactions up to this id are already in the seeded totals
+        self.last_transaction_id = last_transaction_id
+        # Ids applied since the seed, the outbox can deliver an event twice.
+        # Reseeding after the state TTL starts it over.
+        self.applied: set[int] = set()
+        self.totals: dict[int, tuple[date, Decimal]] = {}
+
+        spend = list(spend)
+        today = datetime.now(ZoneInfo(timezone)).date()
+        for budget in budgets:
+            start, end = get_period_bounds(budget.period, timezone, today)
+            self.totals[budget.id] = (
+                start,
+                sum(
+                    (
+                        spent
+                        for category_id, day, spent in spend
+                        if start <= day < end and self._counts(budget, category_id)
+                    ),
+                    Decimal(0),
+                ),
+            )
+
+    @staticmethod
+    def _counts(budget: BudgetLimit, category_id: int) -> bool:
+        return budget.type == BudgetTypeEnum.TOTAL or budget.category_id == category_id
+
+    def is_missing_rate(self, event: TransactionDoc) -> bool:
+        return (
+            bool(self.budgets)
+            and event.user_currency_id is not None
+            and event.user_currency_id not in self.rates
+        )
+
+    def apply(
+        self, event: TransactionDoc, thresholds: list[float]
+    ) -> list[BudgetAlert]:
+        alerts = []
+        if (
+            not self.budgets
+            or event.transaction_id <= self.last_transaction_id
+            or event.transaction_id in self.applied
+            or event.user_currency_id not in self.rates
+        ):
+            return alerts
+        self.applied.add(event.transaction_id)
+        amount = Decimal(event.amount_in_default) / self.rates[event.user_currency_id]
+        for budget in self.budgets:
+            if not self._counts(budget, event.category_id):
+                continue
+            start, _ = get_period_bounds(budget.period, self.timezone, event.local_date)
+            period_start, spent = self.totals[budget.id]
+            if start < period_start:
+                # A late event for a period that is already over
+                continue
+            if start > period_start:
+                spent = Decimal(0)
+            before = round(spent * budget.exchange_rate)
+            spent += amount
+            self.totals[budget.id] = (start, spent)
+
+            after = round(spent * budget.exchange_rate)
+            for threshold in thresholds:
+                if before < budget.amount * threshold <= after:
+                    alerts.append(
+                        BudgetAlert(
+                            user_id=event.user_id,
+                            budget_id=budget.id,
+                            category_id=budget.category_id,
+                            name=budget.name,
+                            period=budget.period,
+                            period_start=start,
+                            threshold=threshold,
+                            spent=after,
+                            amount=budget.amount,
+                        )
+                    )
+        return alerts
+
+
+class BudgetAlertEngine:
+    """Running budget totals per user, updated from TRANSACTION_CREATED events.
+
+    A user's budgets and current spend are seeded from daily_spend the first
+    time they show up, in one query per batch for every new user, and
+    reseeded after state_ttl. Events in between only touch memory.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        thresholds: list[float],
+        state: TTLCache,
+    ):
+        self.session_factory = session_factory
+        self.thresholds = sorted(thresholds)
+        self.state = state
+
+    def reset(self):
+        self.state.clear()
+
+    def process(self, events: list[TransactionDoc]) -> list[BudgetAlert]:
+        events = [
+            event
+            for event in events
+            if event.transaction_type == TransactionTypeEnum.EXPENSE
+            and event.local_date
+        ]
+        users = {event.user_id: self.state.get(event.user_id) for event in events}
+        # A currency added since the user was seeded needs its rate loaded too
+        for event in events:
+            budgets = users[event.user_id]
+            if budgets is not None and budgets.is_missing_rate(event):
+                users[event.user_id] = None
+        missing = [user_id for user_id, budgets in users.items() if budgets is None]
+        if missing:
+            loaded = self._load(missing)
+            for user_id, budgets in loaded.items():
+                self.state.set(user_id, budgets)
+            users.update(loaded)
+
+        alerts = []
+        for event in events:
+            alerts.extend(users[event.user_id].apply(event, self.thresholds))
+        events_applied.add(len(events))
+        return alerts
+
+    def _load(self, user_ids: list[int]) -> dict[int, UserBudgets]:
+        since = datetime.now(ZoneInfo("UTC")).date() - timedelta(days=SEED_DAYS)
+        budgets: dict[int, list] = {user_id: [] for user_id in user_ids}
+        timezones = {}
+        spend: dict[int, list] = {user_id: [] for user_id in user_ids}
+        rates: dict[int, dict] = {user_id: {} for user_id in user_ids}
+
+        with self.session_factory() as db:
+            # One snapshot, so the seeded spend and last ids agree
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            crud_budget = get_crud_budget(db=db)
+            for row in crud_budget.get_alert_budgets(user_ids):
+                budgets[row.user_id].append(BudgetLimit.model_validate(row._asdict()))
+                timezones[row.user_id] = row.timezone
+            users_with_budgets = list(timezones)
+            last_ids = {}
+            if users_with_budgets:
+                for row in crud_budget.get_daily_spend(users_with_budgets, since):
+                    spend[row.user_id].append((row.category_id, row.day, row.spent))
+                for row in crud_budget.get_currency_rates(users_with_budgets):
+                    rates[row.user_id][row.id] = row.exchange_rate
+                last_ids = crud_budget.get_last_transaction_ids(users_with_budgets)
+
+        return {
+            user_id: UserBudgets(
+                timezone=timezones.get(user_id, "UTC"),
+                budgets=budgets[user_id],
+                rates=rates[user_id],
+                last_transaction_id=last_ids.get(user_id, 0),
+                spend=spend[user_id],
+            )
+            for user_id in user_ids
+        }
+
+
+def _consumer_config() -> dict:
+    # Same brokers and TLS files as the producer
+    config = {
+        key: value
+        for key, value in kafka_config.items()
+        if key == "bootstrap.servers" or key.startswith(("security.", "ssl."))
+    }
+    config.update(
+        {
+            "group.id": CONSUMER_GROUP,
+            # Offsets are committed once a batch and its alerts are done
+            "enable.auto.commit": False,
+            "auto.offset.reset": "latest",
+        }
+    )
+    return config
+
+
+def deliver_alerts(alerts: list[BudgetAlert]) -> list[BudgetAlert]:
+    """Publish the alerts and wait for the broker, returning the ones it did
+    not ack."""
+    acked: set[int] = set()
+
+    def on_delivery(index, err):
+        if err is None:
+            acked.add(index)
+
+    try:
+        publish_many(topic=BUDGET_ALERT, events=alerts, on_delivery=on_delivery)
+    except (BufferError, KafkaException):
+        # Already logged, whatever was queued before it is still flushed
+        pass
+    flush_producer(settings.KAFKA_CONFIG.KAFKA_FLUSH_TIMEOUT)
+    alerts_sent.add(len(acked))
+    return [alert for index, alert in enumerate(alerts) if index not in acked]
+
+
+def commit_offsets(consumer: Consumer):
+    try:
+        consumer.commit(asynchronous=False)
+    except KafkaException as e:
+        logger.warning(f"Could not commit offsets: {e}")
+
+
+def rewind(consumer: Consumer, messages: list[Message]):
+    """Seek back so the messages are consumed again."""
+    offsets: dict[tuple[str, int], int] = {}
+    for message in messages:
+        if message.error():
+            continue
+        key = (message.topic(), message.partition())
+        offsets[key] = min(offsets.get(key, message.offset()), message.offset())
+    for (topic, partition), offset in offsets.items():
+        consumer.seek(TopicPartition(topic, partition, offset))
+
+
+def process_batch(
+    consumer: Consumer, engine: BudgetAlertEngine, messages: list[Message]
+) -> list[BudgetAlert]:
+    """Apply a batch and publish its alerts, returning the ones that were not
+    delivered. Offsets are only committed once every alert is acked, the
+    totals already include the batch so it can't simply be replayed."""
+    events = []
+    for message in messages:
+        if message.error():
+            logger.error(f"Consumer error: {message.error()}")
+            continue
+        try:
+            events.append(TransactionDoc.model_validate_json(message.value()))
+        except ValidationError as e:
+            logger.warning(
+                f"Skipping malformed event {message.topic()}[{message.partition()}]"
+                f"@{message.offset()}: {e}"
+            )
+
+    alerts = engine.process(events)
+    undelivered = deliver_alerts(alerts) if alerts else []
+    if undelivered:
+        logger.error(f"{len(undelivered)} budget alerts were not delivered")
+    else:
+        commit_offsets(consumer)
+    return undelivered
+
+
+def run():
+    engine = BudgetAlertEngine(
+        session_factory=SessionLocal,
+        thresholds=settings.BUDGET_ALERT_THRESHOLDS,
+        state=TTLCache(
+            maxsize=settings.BUDGET_ALERT_STATE_MAXSIZE,
+            ttl=settings.BUDGET_ALERT_STATE_TTL,
+        ),
+    )
+    consumer = Consumer(_consumer_config())
+    # Totals for partitions handed to another consumer would go stale here
+    consumer.subscribe(
+        [TRANSACTION_CREATED], on_revoke=lambda consumer, partitions: engine.reset()
+    )
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    logger.info(f"Consuming {TRANSACTION_CREATED} for budget alerts")
+    # Alerts the broker has not acked yet. Consumption is paused until they
+    # are, polling on meanwhile keeps the consumer in its group.
+    pending: list[BudgetAlert] = []
+    try:
+        while not stopping:
+            messages = consumer.consume(
+                num_messages=settings.BUDGET_ALERT_BATCH_SIZE,
+                timeout=settings.BUDGET_ALERT_POLL_TIMEOUT,
+            )
+            if pending:
+                # Only partitions assigned since the pause can return any
+                rewind(consumer, messages)
+                pending = deliver_alerts(pending)
+                if not pending:
+                    commit_offsets(consumer)
+                    consumer.resume(consumer.assignment())
+            elif messages:
+                try:
+                    pending = process_batch(consumer, engine, messages)
+                except Exception:
+                    # engine.process only raises while seeding, before any
+                    # totals move, so the batch is safe to consume again
+                    logger.exception("Budget alert batch failed, retrying it")
+                    rewind(consumer, messages)
+                    time.sleep(settings.BUDGET_ALERT_POLL_TIMEOUT)
+                    continue
+                if pending:
+                    consumer.pause(consumer.assignment())
+        if pending:
+            logger.error(f"Stopping with {len(pending)} budget alerts undelivered")
+    finally:
+        consumer.close()
+        close_producer()
+
+
+if __name__ == "__main__":
+    run()
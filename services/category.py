@@ -1,16 +1,19 @@
+from operator import attrgetter
 from sqlalchemy import Column
 from core.exceptions import MissingResource, ResourceExists
 from crud.category import (
-    CRUDCategory,
-    CRUDUserCategory,
+    AsyncCRUDCategory,
+    AsyncCRUDUserCategory,
 )
-from models.category import UserCategory
 from schemas.category import CategoryCreate, UserCategoryCreate, UserCategoryUpdate
+from services.user_context import CATEGORIES, CachedUserCategory, user_context_cache
 
 
 class CategoryService:
     def __init__(
-        self, crud_category: CRUDCategory, crud_user_category: CRUDUserCategory
+        self,
+        crud_category: AsyncCRUDCategory,
+        crud_user_category: AsyncCRUDUserCategory,
     ):
         self.crud_category = crud_category
         self.crud_user_category = crud_user_category
@@ -19,23 +22,24 @@ class CategoryService:
         self, data_obj: CategoryCreate, user_id: Column[int]
     ):
         data_obj.name = data_obj.name.title()
-        if self.crud_user_category.check_user_category_name_exists(
+        if await self.crud_user_category.check_user_category_name_exists(
             user_id, data_obj.name
         ):
             raise ResourceExists(
                 message="Category with this name already exists for the user"
             )
 
-        new_category = self.crud_category.create(data_obj)
+        new_category = await self.crud_category.create(data_obj)
         user_category_data = UserCategoryCreate(
             user_id=user_id, category_id=new_category.id
         )
-        self.crud_user_category.create(user_category_data)
+        await self.crud_user_category.create(user_category_data)
+        await user_context_cache.invalidate(user_id, CATEGORIES)
 
         return new_category
 
     async def get_user_categories(self, user_id: int):
-        return self.crud_user_category.get_user_categories(user_id)
+        return await self.crud_user_category.get_user_categories(user_id)
 
     async def update_user_category(
         self,
@@ -44,33 +48,50 @@ class CategoryService:
         data_obj: UserCategoryUpdate,
         category_id: int,
     ):
-        category = self.crud_user_category.get_user_category_by_id(user_id, category_id)
+        category = await self.crud_user_category.get_user_category_by_id(
+            user_id, category_id
+        )
         if not category:
             raise MissingResource(message="User category not found")
 
         data_obj.name = data_obj.name.title()
-        updated_category = self.crud_category.update(
+        updated_category = await self.crud_category.update(
             id=category.category_id, data_obj=data_obj
         )
-        self.crud_user_category.update(
+        await self.crud_user_category.update(
             id=category_id,
             data_obj={"user_id": user_id, "category_id": updated_category.id},
         )
-        return category
+        await user_context_cache.invalidate(user_id, CATEGORIES)
+        return await self.crud_user_category.get_user_category_by_id(
+            user_id, category_id
+        )
 
     async def delete_user_category(self, *, user_id: int, category_id: int):
-        category = self.crud_user_category.get_user_category_by_id(user_id, category_id)
+        category = await self.crud_user_category.get_user_category_by_id(
+            user_id, category_id
+        )
         if not category:
             raise MissingResource(message="User category not found")
 
-        self.crud_category.delete(category.category_id)
-        self.crud_user_category.delete(category_id)
+        await self.crud_category.delete(category.category_id)
+        await self.crud_user_category.delete(category_id)
+        await user_context_cache.invalidate(user_id, CATEGORIES)
         return None
 
+    async def _get_cached_categories(self, user_id: int, category_id: int | None):
+        return await user_context_cache.get_including(
+            user_id,
+            CATEGORIES,
+            loader=lambda: self.crud_user_category.get_user_categories(user_id),
+            id=category_id,
+            key=attrgetter("category_id"),
+        )
+
     async def validate_user_category(
         self, user_id: int, category_id: int | None
-    ) -> UserCategory:
-        user_categories = self.crud_user_category.get_user_categories(user_id)
+    ) -> CachedUserCategory:
+        user_categories = await self._get_cached_categories(user_id, category_id)
         selected_category = None
         # TODO: Use default category if no user categories exist instead of the first one
         if category_id not in [cat.category_id for cat in user_categories]:
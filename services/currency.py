@@ -2,18 +2,18 @@ from typing import Tuple
 from arq import ArqRedis
 from core.exceptions import MissingResource, ResourceExists
 from crud.currency import (
-    CRUDCurrency,
-    CRUDUserCurrency,
+    AsyncCRUDCurrency,
+    AsyncCRUDUserCurrency,
 )
-from models.currency import UserCurrency
 from schemas.currency import UserCurrencyCreate, UserCurrencyUpdate
+from services.user_context import CURRENCIES, CachedUserCurrency, user_context_cache
 
 
 class CurrencyService:
     def __init__(
         self,
-        crud_currency: CRUDCurrency,
-        crud_user_currency: CRUDUserCurrency,
+        crud_currency: AsyncCRUDCurrency,
+        crud_user_currency: AsyncCRUDUserCurrency,
         queue_connection: ArqRedis,
     ):
         self.crud_currency = crud_currency
@@ -22,47 +22,61 @@ class CurrencyService:
 
     # TODO: Add a currency check here and also update other currencies to false if is_default is true
     async def add_currency(self, *, data_obj: UserCurrencyCreate, user_id: int):
-        currency = self.crud_currency.get(data_obj.currency_id)
+        currency = await self.crud_currency.get(data_obj.currency_id)
 
         if not currency:
             raise MissingResource(message="Currency not found")
-        if self.crud_user_currency.get_user_currency_by_currency_id(
+        if await self.crud_user_currency.get_user_currency_by_currency_id(
             user_id, data_obj.currency_id
         ):
             raise ResourceExists(message="Currency already added")
 
         if data_obj.is_default:
-            self.crud_user_currency.update_by_user_id(
+            await self.crud_user_currency.update_by_user_id(
                 user_id=user_id, data_obj=UserCurrencyUpdate(is_default=False)
             )
             await self.queue_connection.enqueue_job(
                 "update_currencies_exchange_rate", user_id, currency.code
             )
         data_obj.user_id = user_id
-        currency = self.crud_user_currency.create(data_obj.model_dump())
+        currency = await self.crud_user_currency.create(data_obj.model_dump())
+        await user_context_cache.invalidate(user_id, CURRENCIES)
         return currency
 
     async def update_default_currency(self, user_id: int, data_obj: UserCurrencyUpdate):
-        user_currency = self.crud_user_currency.get_user_currency(user_id, data_obj.id)
+        user_currency = await self.crud_user_currency.get_user_currency(
+            user_id, data_obj.id
+        )
         if not user_currency:
             raise MissingResource(message="User currency not found")
 
         if data_obj.is_default and not user_currency.is_default:
-            self.crud_user_currency.update_by_user_id(
+            await self.crud_user_currency.update_by_user_id(
                 user_id=user_id, data_obj=UserCurrencyUpdate(is_default=False)
             )
 
             await self.queue_connection.enqueue_job(
                 "update_currencies_exchange_rate", user_id, user_currency.currency.code
             )
-        self.crud_user_currency.update(id=data_obj.id, data_obj=data_obj)
+        await self.crud_user_currency.update(id=data_obj.id, data_obj=data_obj)
+        await user_context_cache.invalidate(user_id, CURRENCIES)
 
         return user_currency
 
+    async def get_user_currencies(
+        self, user_id: int, user_currency_id: int | None = None
+    ) -> list[CachedUserCurrency]:
+        return await user_context_cache.get_including(
+            user_id,
+            CURRENCIES,
+            loader=lambda: self.crud_user_currency.get_user_currencies(user_id),
+            id=user_currency_id,
+        )
+
     async def get_user_currency(
         self, user_id: int, user_currency_id: int | None
-    ) -> Tuple[UserCurrency, UserCurrency]:
-        user_currencies = self.crud_user_currency.get_user_currencies(user_id)
+    ) -> Tuple[CachedUserCurrency, CachedUserCurrency]:
+        user_currencies = await self.get_user_currencies(user_id, user_currency_id)
         default_currency = sorted(
             user_currencies, key=lambda x: x.is_default, reverse=True
         )[0]
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from core.cache import TTLCache, redis_client
+from core.config import settings
+from core.exceptions import InvalidRequest
+from core.externals.exchange_rate.exchangerate_api import get_exchange_rate
+
+logger = logging.getLogger(__name__)
+
+# Every rate is stored against this one base; cross rates are derived
+RATE_BASE = "USD"
+RATES_KEY = f"exchange_rates:{RATE_BASE}"
+
+
+class ExchangeRateCache:
+    """One USD rate vector for every currency the upstream API quotes, served
+    from memory, then Redis.
+
+    Any other base is derived by division, so a single upstream call keeps
+    every pair fresh. The worker refreshes the vector on a cron. A vector
+    older than EXCHANGE_RATE_STALE_AFTER is still served while one process
+    refreshes it in the background, so callers never wait on the upstream
+    API unless nothing has been cached yet.
+    """
+
+    def __init__(self, local_cache: TTLCache, stale_after: float, redis_ttl: int):
+        self.local_cache = local_cache
+        self.stale_after = stale_after
+        self.redis_ttl = redis_ttl
+        self._revalidating: set[asyncio.Task] = set()
+
+    async def _get_usd_rates(self) -> dict[str, float]:
+        entry = self.local_cache.get(RATE_BASE)
+        if entry is None:
+            entry = await self._read()
+        if entry is None:
+            return await self.refresh()
+
+        if time.time() - entry["fetched_at"] > self.stale_after:
+            self._revalidate()
+        return entry["rates"]
+
+    async def get_rate(self, base: str, quote: str) -> Optional[float]:
+        """Units of quote per one unit of base, None if either is unknown."""
+        usd_rates = await self._get_usd_rates()
+        base_rate = usd_rates.get(base.upper())
+        quote_rate = usd_rates.get(quote.upper())
+        if not base_rate or quote_rate is None:
+            return None
+        return quote_rate / base_rate
+
+    async def get_rates(self, base: str) -> dict[str, float]:
+        usd_rates = await self._get_usd_rates()
+        base_rate = usd_rates.get(base.upper())
+        if not base_rate:
+            raise InvalidRequest(message=f"Unsupported currency {base}")
+        return {code: rate / base_rate for code, rate in usd_rates.items()}
+
+    async def refresh(self) -> dict[str, float]:
+        # The full upstream vector, /config/exchange-rates serves all of it
+        rates = await get_exchange_rate(RATE_BASE)
+        entry = {"fetched_at": time.time(), "rates": rates}
+        self.local_cache.set(RATE_BASE, entry)
+        try:
+            await redis_client.set(RATES_KEY, json.dumps(entry), ex=self.redis_ttl)
+        except RedisError as e:
+            logger.warning(f"Exchange rate cache write failed: {e}")
+        return rates
+
+    async def _read(self):
+        try:
+            raw = await redis_client.get(RATES_KEY)
+        except RedisError as e:
+            logger.warning(f"Exchange rate cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        self.local_cache.set(RATE_BASE, entry)
+        return entry
+
+    def _revalidate(self):
+        task = asyncio.create_task(self._revalidate_once())
+        self._revalidating.add(task)
+        task.add_done_callback(self._revalidating.discard)
+
+    async def _revalidate_once(self):
+        # Only one process refreshes stale rates, the rest keep serving them
+        try:
+            acquired = await redis_client.set(
+                f"{RATES_KEY}:refreshing", 1, nx=True, ex=30
+            )
+            if acquired:
+                await self.refresh()
+            else:
+                self.local_cache.pop(RATE_BASE)
+        except Exception as e:
+            logger.warning(f"Exchange rate refresh failed: {e}")
+
+
+exchange_rate_cache = ExchangeRateCache(
+    local_cache=TTLCache(maxsize=1, ttl=settings.EXCHANGE_RATE_LOCAL_TTL),
+    stale_after=settings.EXCHANGE_RATE_STALE_AFTER,
+    redis_ttl=settings.EXCHANGE_RATE_CACHE_TTL,
+)
@@ -2,7 +2,6 @@ from datetime import date
 
 from arq import ArqRedis
 from core.exceptions import MissingResource, ResourceExists
-from core.externals.exchange_rate.exchangerate_api import get_exchange_rate
 from core.externals.mono.mono_client import MonoClient
 from core.externals.plaid.plaid_client import PlaidClient
 from crud.account import CRUDAccount
@@ -11,9 +10,11 @@ from crud.currency import (
     CRUDUserCurrency,
 )
 from crud.user import CRUDAuthUser
-from models.user import User
+from schemas.user import AuthUser
 from schemas.account import MonoAccountCreate
 from schemas.currency import UserCurrencyCreate
+from services.exchange_rate import exchange_rate_cache
+from services.user_context import ACCOUNTS, CURRENCIES, user_context_cache
 from utils.currency_conversion import from_minor_units
 
 
@@ -39,7 +40,7 @@ class ExternalService:
     async def mono_exchange_code(
         self,
         code: str,
-        user: User,
+        user: AuthUser,
         transaction_start_date: date = None,
     ):
 
@@ -64,8 +65,12 @@ class ExternalService:
         )
         default_currency = max(user_currencies, key=lambda uc: uc.is_default)
 
-        currency_rates = await get_exchange_rate(default_currency.currency.code)
-        exchange_rate = currency_rates.get(currency.code, 1)
+        exchange_rate = (
+            await exchange_rate_cache.get_rate(
+                default_currency.currency.code, currency.code
+            )
+            or 1
+        )
         if not user_currency:
             user_currency_obj = UserCurrencyCreate(
                 user_id=user.id,
@@ -85,6 +90,7 @@ class ExternalService:
             ext_account_id=account.account.id,
         )
         new_account = self.crud_account.create(account_data.model_dump())
+        await user_context_cache.invalidate(user.id, CURRENCIES, ACCOUNTS)
         self.crud_user.update(user.id, {"mono_customer_id": account.customer.id})
         await self.queue_connection.enqueue_job(
             "retrieve_user_mono_transactions",
@@ -115,6 +121,7 @@ class ExternalService:
         created_accounts = self.create_plaid_accounts_from_response(
             plaid_accounts_response, access_token, user_id
         )
+        await user_context_cache.invalidate(user_id, CURRENCIES, ACCOUNTS)
         return created_accounts
 
     def create_plaid_accounts_from_response(
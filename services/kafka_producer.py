@@ -1,13 +1,16 @@
 import tempfile
 import threading
+import time
 import logging
-from confluent_kafka import Producer
 import json
-from confluent_kafka import Producer
+from typing import Callable, Iterable, Optional, Union
+
+import logfire
+from confluent_kafka import KafkaError, Message, Producer
+from pydantic import BaseModel
 from core import settings
 from base64 import b64decode
 
-
 if not logging.getLogger().handlers:
     logging.basicConfig(
         level=logging.INFO,
@@ -32,6 +35,11 @@ key_path = write_temp_file(settings.KAFKA_CONFIG.KAFKA_SERVICE_KEY)
 kafka_config = {
     "bootstrap.servers": "localhost:9092",
     "acks": "all",
+    # Let messages sit briefly so bursts go out as compressed batches
+    "linger.ms": settings.KAFKA_CONFIG.KAFKA_LINGER_MS,
+    "batch.size": settings.KAFKA_CONFIG.KAFKA_BATCH_SIZE,
+    "compression.type": settings.KAFKA_CONFIG.KAFKA_COMPRESSION_TYPE,
+    "queue.buffering.max.messages": settings.KAFKA_CONFIG.KAFKA_QUEUE_MAX_MESSAGES,
 }
 
 if settings.ENVIRONMENT == "prod":
@@ -43,25 +51,137 @@ if settings.ENVIRONMENT == "prod":
 
 producer = Producer(kafka_config)
 
-
-def publish(topic: str, event: dict):
+messages_queued = logfire.metric_counter(
+    "kafka.producer.queued", unit="1", description="Messages handed to librdkafka"
+)
+messages_delivered = logfire.metric_counter(
+    "kafka.producer.delivered", unit="1", description="Messages acked by the broker"
+)
+messages_failed = logfire.metric_counter(
+    "kafka.producer.failed", unit="1", description="Messages that failed delivery"
+)
+queue_full = logfire.metric_counter(
+    "kafka.producer.queue_full",
+    unit="1",
+    description="Times produce() found the local queue full",
+)
+delivery_latency = logfire.metric_histogram(
+    "kafka.producer.delivery_latency",
+    unit="ms",
+    description="Time from produce() to broker ack",
+)
+
+
+def _on_delivery(err: KafkaError, msg: Message):
+    attributes = {"topic": msg.topic()}
+    if err is not None:
+        messages_failed.add(1, attributes)
+        logger.error(f"Failed to deliver message to {msg.topic()}: {err}")
+        return
+    messages_delivered.add(1, attributes)
+    latency = msg.latency()
+    if latency is not None:
+        delivery_latency.record(latency * 1000, attributes)
+
+
+def _encode(event: Union[dict, BaseModel]) -> tuple[bytes, bytes]:
+    if isinstance(event, BaseModel):
+        return str(event.user_id).encode(), event.model_dump_json().encode()
+    return str(event["user_id"]).encode(), json.dumps(event).encode()
+
+
+def _produce(
+    topic: str,
+    key: bytes,
+    value: bytes,
+    on_delivery=_on_delivery,
+    queue_full_timeout: float = settings.KAFKA_CONFIG.KAFKA_QUEUE_FULL_TIMEOUT,
+):
+    deadline = time.monotonic() + queue_full_timeout
+    while True:
+        try:
+            producer.produce(topic=topic, key=key, value=value, on_delivery=on_delivery)
+            messages_queued.add(1, {"topic": topic})
+            return
+        except BufferError:
+            # Local queue is full, serve delivery reports to make room
+            queue_full.add(1, {"topic": topic})
+            if time.monotonic() >= deadline:
+                raise
+            producer.poll(0.1)
+
+
+def publish(topic: str, event: Union[dict, BaseModel]):
+    """Queue one event, raising BufferError straight away if the local queue
+    is full. Safe to call from the event loop, retries are left to the outbox
+    relay."""
     logger.info(f"Publishing message to topic: {topic}")
     try:
-        producer.produce(
-            topic=topic,
-            key=str(event["user_id"]).encode(),
-            value=json.dumps(event).encode(),
-        )
+        _produce(topic, *_encode(event), queue_full_timeout=0)
         logger.debug(f"Successfully published message: {event}")
     except Exception as e:
-        print(f"*****Error: {str(e)}")
         logger.error(f"Failed to publish message: {str(e)}")
         raise
 
 
+def _notify_delivery(index: int, on_delivery: Callable):
+    def callback(err: KafkaError, msg: Message):
+        _on_delivery(err, msg)
+        on_delivery(index, err)
+
+    return callback
+
+
+def publish_many(
+    topic: str,
+    events: Iterable[Union[dict, BaseModel]],
+    on_delivery: Optional[Callable[[int, Optional[KafkaError]], None]] = None,
+) -> int:
+    """Queue a batch of events.
+
+    Waits up to KAFKA_QUEUE_FULL_TIMEOUT whenever the local queue is full, so
+    async callers should run it in a thread.
+
+    on_delivery, if given, is called from the poll thread with each event's
+    position in the batch and the delivery error (None once acked).
+    """
+    count = 0
+    try:
+        for event in events:
+            callback = (
+                _notify_delivery(count, on_delivery) if on_delivery else _on_delivery
+            )
+            _produce(topic, *_encode(event), on_delivery=callback)
+            count += 1
+    except Exception as e:
+        logger.error(f"Failed to publish message {count + 1} of batch: {str(e)}")
+        raise
+    finally:
+        producer.poll(0)
+    logger.info(f"Published {count} messages to topic: {topic}")
+    return count
+
+
+_stop_polling = threading.Event()
+
+
 def poll_loop():
-    while True:
-        producer.poll(0.1)
+    while not _stop_polling.is_set():
+        producer.poll(1.0)
+
+
+_poll_thread = threading.Thread(target=poll_loop, daemon=True)
+_poll_thread.start()
+
+
+def flush_producer(timeout: float) -> int:
+    """Wait for queued messages to be acked, returning how many are still pending."""
+    return producer.flush(timeout)
 
 
-threading.Thread(target=poll_loop, daemon=True).start()
+def close_producer():
+    _stop_polling.set()
+    _poll_thread.join()
+    remaining = producer.flush(settings.KAFKA_CONFIG.KAFKA_FLUSH_TIMEOUT)
+    if remaining:
+        logger.warning(f"{remaining} messages were not delivered before shutdown")
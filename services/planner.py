@@ -2,8 +2,8 @@ from decimal import Decimal
 from sqlalchemy import Column
 from core.exceptions import MissingResource
 from crud.category import (
-    CRUDCategory,
-    CRUDUserCategory,
+    AsyncCRUDCategory,
+    AsyncCRUDUserCategory,
 )
 from crud.currency import CRUDUserCurrency
 from crud.planner import CRUDPlanner
@@ -24,8 +24,8 @@ class PlannerService:
         self,
         crud_planner: CRUDPlanner,
         crud_user_currency: CRUDUserCurrency,
-        crud_category: CRUDCategory,
-        crud_user_category: CRUDUserCategory,
+        crud_category: AsyncCRUDCategory,
+        crud_user_category: AsyncCRUDUserCategory,
         transaction_service: TransactionService,
         category_service: CategoryService,
         currency_service: CurrencyService,
@@ -116,11 +116,9 @@ class PlannerService:
         planner = self.crud_planner.get_planner_by_id(id=id)
         if not planner or planner.user_id != user_id:
             raise MissingResource(message="Planner not found")
-        transactions = (
-            self.transaction_service.crud_transaction.get_transaction_by_category_id(
-                category_id=planner.category_id,
-                user_id=user_id,
-            )
+        transactions = await self.transaction_service.crud_transaction.get_transaction_by_category_id(
+            category_id=planner.category_id,
+            user_id=user_id,
         )
         planner = convert_sql_models_to_dict(planner)
         planner["transactions"] = transactions
@@ -183,11 +181,11 @@ class PlannerService:
         if not planner or planner.user_id != user_id:
             raise MissingResource(message="Planner not found")
         if data_obj.name:
-            category = self.crud_category.get(id=planner.category_id)
+            category = await self.crud_category.get(id=planner.category_id)
             if not category:
                 raise MissingResource(message="Category not found")
             if category.name != data_obj.name.title():
-                self.crud_category.update(
+                await self.crud_category.update(
                     id=category.id, data_obj={PlannerUpdate.NAME: data_obj.name.title()}
                 )
         if data_obj.required_amount_in_default > 0 and data_obj.required_amount <= 0:
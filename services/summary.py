@@ -1,23 +1,22 @@
 from datetime import date
-from crud.summary import CRUDTotalSummary
+from crud.summary import AsyncCRUDTotalSummary
 from services.account import AccountService
-from services.transaction import TransactionService
 
 
 class AccountSummaryService:
     def __init__(
         self,
-        crud_total_summary: CRUDTotalSummary,
+        crud_total_summary: AsyncCRUDTotalSummary,
         account_service: AccountService,
-        transaction_service: TransactionService,
     ):
         self.crud_total_summary = crud_total_summary
         self.account_service = account_service
-        self.transaction_service = transaction_service
 
     async def get_account_summary(self, user_id: int, date: date):
-
-        summary = self.crud_total_summary.get_total_summary(user_id=user_id, date=date)
+        # Totals come from the monthly rollup, so this doesn't grow with history
+        summary = await self.crud_total_summary.get_total_summary(
+            user_id=user_id, date=date
+        )
         if not summary:
             return {
                 "user_id": user_id,
@@ -31,16 +30,7 @@ class AccountSummaryService:
                 "month": date.month,
                 "year": date.year,
             }
-        # summary = await self.calculate_account_balance(user_id=user_id)
-
-        net_total = await self.get_total_income_and_expenses(user_id=user_id)
-
         return summary
 
     async def get_account_balance(self, user_id: int):
         return await self.account_service.calculate_account_balance(user_id=user_id)
-
-    async def get_total_income_and_expenses(self, user_id: int):
-        return await self.transaction_service.calculate_total_income_and_expenses(
-            user_id=user_id
-        )
@@ -1,17 +1,18 @@
 from datetime import date, datetime, timezone
 from decimal import ROUND_HALF_UP, Decimal
-from typing import Dict, List, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from arq import ArqRedis
 from sqlalchemy import Column
-from core.exceptions import MissingResource
+from core.exceptions import InvalidRequest, MissingResource
 from core.externals.mono.mono_client import MonoClient
 from core.externals.schema import MonoTransactionSchema
 from core.topics.transactions import TRANSACTION_CREATED
-from crud.account import CRUDAccount
-from crud.category import CRUDCategory, CRUDUserCategory
-from crud.currency import CRUDUserCurrency
-from crud.rules import CRUDRules
-from crud.transaction import CRUDTransaction
+from crud.account import AsyncCRUDAccount
+from crud.category import AsyncCRUDCategory, AsyncCRUDUserCategory
+from crud.currency import AsyncCRUDUserCurrency
+from crud.outbox import AsyncCRUDOutbox
+from crud.rules import AsyncCRUDRules
+from crud.transaction import AsyncCRUDTransaction
 from models.account import Account
 from models.category import Category, UserCategory
 from models.currency import UserCurrency
@@ -20,26 +21,31 @@ from models.rules import TransactionRule
 from models.transaction import Transaction
 from schemas.account import MonoAccountCreate
 from schemas.enums import AccountTypeEnum, MonoTransactionTypeEnum, TransactionTypeEnum
-from schemas.transaction import MonoTransactionCreate, TransactionCreate
+from schemas.transaction import TransactionCreate
 from services.account import AccountService
 from services.category import CategoryService
 from services.currency import CurrencyService
-from services.kafka_producer import publish
-from utils.currency_conversion import from_minor_units, to_minor_units
-from utils.helper import convert_sql_models_to_dict, extract_beneficiary
+from utils.currency_conversion import to_minor_units
+from utils.helper import (
+    convert_sql_models_to_dict,
+    decode_cursor,
+    encode_cursor,
+    extract_beneficiary,
+)
 
 
 class TransactionService:
     def __init__(
         self,
-        crud_transaction: CRUDTransaction,
+        crud_transaction: AsyncCRUDTransaction,
         queue_connection: ArqRedis,
-        crud_user_currency: CRUDUserCurrency,
-        crud_account: CRUDAccount,
-        crud_user_category: CRUDUserCategory,
+        crud_user_currency: AsyncCRUDUserCurrency,
+        crud_account: AsyncCRUDAccount,
+        crud_user_category: AsyncCRUDUserCategory,
         mono_client: MonoClient,
-        crud_rules: CRUDRules,
-        crud_category: CRUDCategory,
+        crud_rules: AsyncCRUDRules,
+        crud_category: AsyncCRUDCategory,
+        crud_outbox: AsyncCRUDOutbox,
         currency_service=CurrencyService,
         account_service=AccountService,
         category_service=CategoryService,
@@ -52,6 +58,7 @@ class TransactionService:
         self.mono_client = mono_client
         self.crud_rules = crud_rules
         self.crud_category = crud_category
+        self.crud_outbox = crud_outbox
         self.currency_service = currency_service
         self.account_service = account_service
         self.category_service = category_service
@@ -91,98 +98,100 @@ class TransactionService:
         )
         category = await self.category_service.validate_user_category(user_id, data_obj.category_id)  # type: ignore
         data_obj.category_id = category.category_id  # type: ignore
-        transaction = self.crud_transaction.create(data_obj)
-
-        await self._publish_created_transaction(transaction)
+        transaction = await self.crud_transaction.create(data_obj, commit=False)
+        # Reload with relationships, lazy loading isn't available on AsyncSession
+        transaction = await self.crud_transaction.get_transaction_by_id(
+            transaction.id, user_id
+        )
+        # Commits the transaction and its event together
+        await self.crud_outbox.add_events(
+            topic=TRANSACTION_CREATED,
+            events=[self._to_transaction_doc(transaction)],
+        )
+        await self._relay_outbox_events()
         return transaction
 
     async def list_user_transactions(
         self, user_id: int, date: date
     ) -> List[Transaction]:
-        transactions = self.crud_transaction.get_user_transactions_by_id(user_id, date)
-        transactions = [convert_sql_models_to_dict(t) for t in transactions]
+        transactions = await self.crud_transaction.get_user_transactions_by_id(
+            user_id, date
+        )
+        return [self._convert_to_default_amount(t) for t in transactions]
 
-        for trans in transactions:
-            account_currency = trans["user_currency"]["exchange_rate"]
-            amount = Decimal(trans["amount_in_default"])
-            rate = Decimal(str(account_currency))
+    async def list_user_transactions_page(
+        self,
+        user_id: int,
+        date: date,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Dict:
+        try:
+            position = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise InvalidRequest(message="Invalid pagination cursor")
 
-            trans["amount_in_default"] = (amount / rate).quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
-            )
-        return transactions
+        # Fetch one extra row to know whether another page exists
+        transactions = await self.crud_transaction.get_user_transactions_page(
+            user_id, date, limit=limit + 1, cursor=position
+        )
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            next_cursor = encode_cursor(transactions[-1].date, transactions[-1].id)
+
+        return {
+            "transactions": [self._convert_to_default_amount(t) for t in transactions],
+            "next_cursor": next_cursor,
+        }
+
+    async def stream_user_transactions(
+        self, user_id: int, date: date
+    ) -> AsyncIterator[Dict]:
+        async for transaction in self.crud_transaction.stream_user_transactions(
+            user_id, date
+        ):
+            yield self._convert_to_default_amount(transaction)
+
+    def _convert_to_default_amount(self, transaction: Transaction) -> Dict:
+        transaction = convert_sql_models_to_dict(transaction)
+        account_currency = transaction["user_currency"]["exchange_rate"]
+        amount = Decimal(transaction["amount_in_default"])
+        rate = Decimal(str(account_currency))
+        transaction["amount_in_default"] = (amount / rate).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+        return transaction
 
     async def delete_transaction(self, transaction_id: int, user_id: int) -> None:
-        transaction = self.crud_transaction.get_transaction_by_id(
+        transaction = await self.crud_transaction.get_transaction_by_id(
             transaction_id, user_id
         )
         if transaction:
-            return self.crud_transaction.delete(transaction_id)
+            return await self.crud_transaction.delete(transaction_id)
         raise MissingResource(message="Transaction not found or access denied.")
 
     async def get_one_account_transactions(
         self, account_id: int, user_id: int
     ) -> List[Transaction]:
-        account = self.crud_account.get_account_by_id(
+        account = await self.crud_account.get_account_by_id(
             account_id=account_id, user_id=user_id
         )
         if not account:
             raise MissingResource(message="Account not found or access denied.")
-        return self.crud_transaction.get_transactions_by_account_id(
+        return await self.crud_transaction.get_transactions_by_account_id(
             account_id=account_id, user_id=user_id
         )
 
     async def get_single_transaction(
         self, transaction_id: int, user_id: int
     ) -> Transaction:
-        transaction = self.crud_transaction.get_transaction_by_id(
+        transaction = await self.crud_transaction.get_transaction_by_id(
             transaction_id, user_id
         )
         if not transaction:
             raise MissingResource(message="Transaction not found or access denied.")
-        transaction = convert_sql_models_to_dict(transaction)
-        account_currency = transaction["user_currency"]["exchange_rate"]
-        amount = Decimal(transaction["amount_in_default"])
-        rate = Decimal(str(account_currency))
-        transaction["amount_in_default"] = (amount / rate).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
-        return transaction
-
-    async def calculate_total_income_and_expenses(
-        self, user_id: int
-    ) -> Dict[str, Decimal]:
-        transactions = self.crud_transaction.get_all_transactions_by_user_id(
-            user_id=user_id
-        )
-        transactions = [convert_sql_models_to_dict(t) for t in transactions]
-
-        for trans in transactions:
-            transaction_currency_exchange_rate = trans["user_currency"]["exchange_rate"]
-            amount = Decimal(trans["amount_in_default"])
-            rate = Decimal(str(transaction_currency_exchange_rate))
-            trans["amount_in_default"] = (amount / rate).quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
-            )
-
-        income = sum(
-            [
-                Decimal(trans["amount_in_default"])
-                for trans in transactions
-                if trans["transaction_type"] == "income"
-            ]
-        )
-        expense = sum(
-            [
-                Decimal(trans["amount_in_default"])
-                for trans in transactions
-                if trans["transaction_type"] == "expense"
-            ]
-        )
-        return {
-            "total_income": income or Decimal(0),
-            "total_expense": expense or Decimal(0),
-        }
+        return self._convert_to_default_amount(transaction)
 
     async def create_mono_transactions(
         self,
@@ -191,21 +200,12 @@ class TransactionService:
         account_id: int,
         start_date: date = None,
     ) -> None:
-        user_currency, user_default_currency = (
-            await self.currency_service.get_user_currency(
-                user_id=user_id,
-                user_currency_id=None,
-            )
-        )
-        transactions = await self.get_deduped_transactions(
-            mono_account_id=mono_account_id,
+        user_currency, _ = await self.currency_service.get_user_currency(
             user_id=user_id,
-            start_date=start_date,
+            user_currency_id=None,
         )
-        if not transactions:
-            return
         income_category, expense_category = (
-            self.crud_category.get_uncategorized_income_and_expense()
+            await self.crud_category.get_uncategorized_income_and_expense()
         )
         type_map = {
             MonoTransactionTypeEnum.CREDIT: TransactionTypeEnum.INCOME,
@@ -213,21 +213,48 @@ class TransactionService:
         }
 
         user_rules = (
-            self.crud_rules.list_rules_by_user_id(user_id) if self.crud_rules else []
-        )
-        transaction_objs = await self._prepare_transaction_data(
-            transactions=transactions,
-            user_currency=user_currency,
-            user_default_currency=user_default_currency,
-            user_id=user_id,
-            account_id=account_id,
-            user_rules=user_rules,
-            income_category=income_category,
-            expense_category=expense_category,
-            type_map=type_map,
+            await self.crud_rules.list_rules_by_user_id(user_id)
+            if self.crud_rules
+            else []
         )
-        self.crud_transaction.bulk_insert(transaction_objs)
-        self.crud_account.update(
+        created_count = 0
+        # Each page is committed on its own, a retry after a failure skips the
+        # pages already stored
+        async for transactions in self.mono_client.get_transaction_pages(
+            account_id=mono_account_id,
+            start_date=start_date,
+        ):
+            transaction_objs = await self._prepare_transaction_data(
+                transactions=transactions,
+                user_currency=user_currency,
+                user_id=user_id,
+                account_id=account_id,
+                user_rules=user_rules,
+                income_category=income_category,
+                expense_category=expense_category,
+                type_map=type_map,
+            )
+            # Rows already synced are skipped by the unique index, not compared here
+            created_ids = await self.crud_transaction.insert_mono_transactions(
+                transaction_objs
+            )
+            if not created_ids:
+                continue
+            # Reload with category/currency joined, bulk inserted rows don't have them
+            created_transactions = await self.crud_transaction.get_transactions_by_ids(
+                user_id=user_id, transaction_ids=created_ids
+            )
+            # Commits the transactions and their events together
+            await self.crud_outbox.add_events(
+                topic=TRANSACTION_CREATED,
+                events=[self._to_transaction_doc(t) for t in created_transactions],
+            )
+            await self._relay_outbox_events()
+            created_count += len(created_ids)
+
+        if not created_count:
+            return
+        await self.crud_account.update(
             id=account_id,
             data_obj={MonoAccountCreate.LAST_SYNC_DATE: datetime.now(timezone.utc)},
         )
@@ -237,23 +264,17 @@ class TransactionService:
         *,
         transactions: List[MonoTransactionSchema],
         user_currency: UserCurrency,
-        user_default_currency: UserCurrency,
         user_id: Column[int],
         account_id: Column[int],
         user_rules: List[TransactionRule],
         income_category: Category,
         expense_category: Category,
         type_map: Dict[MonoTransactionTypeEnum, TransactionTypeEnum],
-    ) -> List[Dict]:
+    ) -> List[tuple]:
         prepared_transactions = []
         rules_map = {rule.beneficiary_name: rule.category_id for rule in user_rules}
 
         for transaction in transactions:
-            amount = from_minor_units(transaction.amount, transaction.currency)
-            amount_in_default = amount / user_currency.exchange_rate
-            amount_in_default = to_minor_units(
-                amount_in_default, user_default_currency.currency.code
-            )
             # Extract beneficiary name from narration
             beneficiary_name = extract_beneficiary(transaction.narration)
             category_id = None
@@ -267,25 +288,28 @@ class TransactionService:
                     else expense_category.id
                 )
 
+            # Laid out as MONO_TRANSACTION_COLUMNS
             prepared_transactions.append(
-                MonoTransactionCreate(
-                    **transaction.model_dump(),
-                    mono_transaction_id=transaction.id,
-                    mono_type=transaction.type,
-                    account_id=account_id,
-                    transaction_type=type_map.get(
-                        transaction.type, TransactionTypeEnum.DEFAULT
-                    ),
-                    user_id=user_id,
-                    user_currency_id=user_currency.id,
-                    amount_in_default=amount_in_default,
-                    category_id=category_id,
-                ).model_dump()
+                (
+                    transaction.id,
+                    transaction.type,
+                    transaction.narration,
+                    transaction.amount,
+                    # Like manual transactions, readers divide by the rate
+                    transaction.amount,
+                    transaction.balance,
+                    type_map.get(transaction.type, TransactionTypeEnum.DEFAULT).value,
+                    category_id,
+                    account_id,
+                    user_currency.id,
+                    user_id,
+                    datetime.fromisoformat(transaction.date),
+                )
             )
         return prepared_transactions
 
-    async def _publish_created_transaction(self, transaction: Transaction):
-        event_dict = TransactionDoc(
+    def _to_transaction_doc(self, transaction: Transaction) -> TransactionDoc:
+        return TransactionDoc(
             doc_id=transaction.id,  # type: ignore
             doc_type="transaction",
             user_id=transaction.user_id,  # type: ignore
@@ -293,35 +317,17 @@ class TransactionService:
             account_id=transaction.account_id,  # type: ignore
             category=transaction.category.name.lower(),
             amount=transaction.amount,  # type: ignore
+            amount_in_default=transaction.amount_in_default or 0,  # type: ignore
+            user_currency_id=transaction.user_currency_id,  # type: ignore
+            local_date=transaction.local_date,  # type: ignore
             # date_utc=transaction.created_at,
             category_id=transaction.category_id,  # type: ignore
             currency=transaction.user_currency.currency.code,
             transaction_type=transaction.transaction_type,
-        ).model_dump()
-        print(f"Event dict: {event_dict}")
-        print(f"Publishing to topic: {TRANSACTION_CREATED}")
-        publish(event=event_dict, topic=TRANSACTION_CREATED)
-
-    async def get_deduped_transactions(
-        self,
-        mono_account_id: str,
-        user_id: int,
-        start_date: date = None,
-    ) -> List[Transaction]:
-
-        new_transactions = await self.mono_client.get_transactions(
-            account_id=mono_account_id,
-            start_date=start_date,
-        )
-        old_transactions = self.crud_transaction.get_automatic_transactions(
-            user_id=user_id
         )
 
-        existing_mono_transaction_ids = [
-            t.mono_transaction_id for t in old_transactions if t.mono_transaction_id
-        ]
-        deduped_transactions = [
-            t for t in new_transactions if t.id not in existing_mono_transaction_ids
-        ]
-
-        return deduped_transactions
+    async def _relay_outbox_events(self):
+        # The fixed job id collapses a burst of writes into one relay run
+        await self.queue_connection.enqueue_job(
+            "relay_outbox_events", _job_id="relay_outbox_events"
+        )
@@ -0,0 +1,44 @@
+import logging
+import time
+from datetime import datetime, timezone
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from core.cache import TTLCache, redis_client
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# user_id -> unix time of the latest request not yet written to the database
+USER_ACTIVITY_KEY = "user_activity"
+
+# Users already recorded by this process in the current window
+_recorded_users = TTLCache(
+    maxsize=settings.USER_CONTEXT_LOCAL_MAXSIZE,
+    ttl=settings.USER_ACTIVITY_INTERVAL,
+)
+
+
+async def record_user_activity(user_id: int):
+    if _recorded_users.get(user_id):
+        return
+    try:
+        await redis_client.zadd(USER_ACTIVITY_KEY, {str(user_id): time.time()})
+    except RedisError as e:
+        logger.warning(f"Could not record activity for user {user_id}: {e}")
+        return
+    _recorded_users.set(user_id, True)
+
+
+async def pop_user_activity(redis: Redis) -> dict[int, datetime]:
+    """Take every pending entry off the set in one transaction."""
+    cutoff = time.time()
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.zrangebyscore(USER_ACTIVITY_KEY, "-inf", cutoff, withscores=True)
+        pipe.zremrangebyscore(USER_ACTIVITY_KEY, "-inf", cutoff)
+        entries, _ = await pipe.execute()
+    return {
+        int(user_id): datetime.fromtimestamp(score, tz=timezone.utc)
+        for user_id, score in entries
+    }
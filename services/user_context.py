@@ -0,0 +1,158 @@
+import logging
+from decimal import Decimal
+from operator import attrgetter
+from typing import Any, Awaitable, Callable, Optional
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from redis.exceptions import RedisError
+
+from core.cache import TTLCache, redis_client
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CachedModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class CachedCurrency(CachedModel):
+    id: int
+    code: str
+    name: str
+    symbol: Optional[str] = None
+
+
+class CachedUserCurrency(CachedModel):
+    id: int
+    user_id: int
+    currency_id: int
+    exchange_rate: Decimal
+    is_default: Optional[bool] = False
+    currency: CachedCurrency
+
+
+class CachedAccount(CachedModel):
+    id: int
+    user_id: int
+    name: str
+    account_type: str
+    user_currency_id: int
+
+
+class CachedCategory(CachedModel):
+    id: int
+    name: str
+    type: str
+
+
+class CachedUserCategory(CachedModel):
+    id: int
+    user_id: int
+    category_id: int
+    category: CachedCategory
+
+
+CURRENCIES = "currencies"
+ACCOUNTS = "accounts"
+CATEGORIES = "categories"
+
+_adapters = {
+    CURRENCIES: TypeAdapter(list[CachedUserCurrency]),
+    ACCOUNTS: TypeAdapter(list[CachedAccount]),
+    CATEGORIES: TypeAdapter(list[CachedUserCategory]),
+}
+
+
+class UserContextCache:
+    """Read-only snapshots of a user's currencies, accounts and categories.
+
+    Checked in process first, then Redis, then loaded from the database.
+    Writers call invalidate(); the short local TTL bounds how long another
+    process can keep serving a snapshot after that.
+    """
+
+    def __init__(self, local_cache: TTLCache, redis_ttl: int, refreshed: TTLCache):
+        self.local_cache = local_cache
+        self.redis_ttl = redis_ttl
+        # (user_id, part) reloaded for a missing id lately, see get_including()
+        self.refreshed = refreshed
+
+    @staticmethod
+    def _redis_key(user_id: int, part: str) -> str:
+        return f"user_context:{user_id}:{part}"
+
+    async def get(
+        self,
+        user_id: int,
+        part: str,
+        loader: Callable[[], Awaitable[list]],
+        refresh: bool = False,
+    ) -> list:
+        adapter = _adapters[part]
+        key = self._redis_key(user_id, part)
+        if not refresh:
+            value = self.local_cache.get((user_id, part))
+            if value is not None:
+                return value
+            try:
+                raw = await redis_client.get(key)
+            except RedisError as e:
+                logger.warning(f"User context cache read failed: {e}")
+                raw = None
+            if raw is not None:
+                value = adapter.validate_json(raw)
+                self.local_cache.set((user_id, part), value)
+                return value
+
+        value = adapter.validate_python(await loader(), from_attributes=True)
+        # Don't pin an empty context, the defaults may still be on their way
+        if value:
+            self.local_cache.set((user_id, part), value)
+            try:
+                await redis_client.set(key, adapter.dump_json(value), ex=self.redis_ttl)
+            except RedisError as e:
+                logger.warning(f"User context cache write failed: {e}")
+        return value
+
+    async def get_including(
+        self,
+        user_id: int,
+        part: str,
+        loader: Callable[[], Awaitable[list]],
+        id: Optional[int],
+        key: Callable[[Any], int] = attrgetter("id"),
+    ) -> list:
+        """The snapshot, reloaded once if id isn't in it since the item could
+        be newer than the snapshot. Reloads for a (user, part) are spaced by
+        the refreshed TTL, so unknown ids can't force one on every request."""
+        value = await self.get(user_id, part, loader)
+        if not id or any(key(item) == id for item in value):
+            return value
+        if self.refreshed.get((user_id, part)):
+            return value
+        self.refreshed.set((user_id, part), True)
+        return await self.get(user_id, part, loader, refresh=True)
+
+    async def invalidate(self, user_id: int, *parts: str):
+        parts = parts or tuple(_adapters)
+        for part in parts:
+            self.local_cache.pop((user_id, part))
+            self.refreshed.pop((user_id, part))
+        try:
+            await redis_client.delete(*[self._redis_key(user_id, p) for p in parts])
+        except RedisError as e:
+            logger.warning(f"User context cache invalidation failed: {e}")
+
+
+user_context_cache = UserContextCache(
+    local_cache=TTLCache(
+        maxsize=settings.USER_CONTEXT_LOCAL_MAXSIZE,
+        ttl=settings.USER_CONTEXT_LOCAL_TTL,
+    ),
+    redis_ttl=settings.USER_CONTEXT_CACHE_TTL,
+    refreshed=TTLCache(
+        maxsize=settings.USER_CONTEXT_LOCAL_MAXSIZE,
+        ttl=settings.USER_CONTEXT_REFRESH_INTERVAL,
+    ),
+)
@@ -1,52 +1,124 @@
 import logging
+from typing import Optional
 
-from arq import ArqRedis, create_pool
+import logfire
+from arq import ArqRedis, create_pool, cron
 from arq.connections import RedisSettings
+from opentelemetry.metrics import CallbackOptions, Observation
 
 from core import settings
+from core.db import AsyncSessionLocal, SessionLocal
 from crud.category import get_crud_category, get_crud_user_category
-from crud.rules import get_crud_rules
-from crud.transaction import get_crud_transaction
 from crud.user import get_crud_auth_user
+from core.http import close_http_clients
+from services.kafka_producer import close_producer
 from .tasks import registered_tasks
+from .tasks.budget import reconcile_daily_spend
+from .tasks.exchange_rate import refresh_exchange_rates
+from .tasks.outbox import relay_outbox_events
+from .tasks.user import update_user_last_activity
 
 from crud.account import get_crud_account
 from crud.currency import get_crud_currency, get_crud_user_currency
 
-
 logging.basicConfig(level=logging.INFO)
 
 REDIS_SETTINGS = RedisSettings(
     host=settings.REDIS_HOST,
     port=settings.REDIS_PORT,
     password=settings.REDIS_PASSWORD,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+)
+
+# One pool per process: opened by the API lifespan, or handed over by the
+# arq worker, and shared by every dependency and task
+queue_pool: Optional[ArqRedis] = None
+
+
+def _pool_connections(options: CallbackOptions):
+    if queue_pool is None:
+        return
+    pool = queue_pool.connection_pool
+    # Private to redis-py's ConnectionPool, skip the gauge if they move
+    in_use = getattr(pool, "_in_use_connections", None)
+    idle = getattr(pool, "_available_connections", None)
+    if in_use is None or idle is None:
+        return
+    yield Observation(len(in_use), {"state": "in_use"})
+    yield Observation(len(idle), {"state": "idle"})
+
+
+logfire.metric_gauge_callback(
+    "redis.pool.connections",
+    [_pool_connections],
+    unit="1",
+    description="Connections held by the shared arq Redis pool",
 )
 
 
+async def open_queue_pool() -> ArqRedis:
+    global queue_pool
+    if queue_pool is None:
+        logging.info(
+            f"Starting Redis connection pool {settings.REDIS_HOST}:{settings.REDIS_PORT}",
+        )
+        queue_pool = await create_pool(REDIS_SETTINGS)
+    return queue_pool
+
+
+async def close_queue_pool():
+    global queue_pool
+    if queue_pool is not None:
+        await queue_pool.aclose()
+        queue_pool = None
+
+
 async def get_queue_connection() -> ArqRedis:
-    return await create_pool(REDIS_SETTINGS)
+    return queue_pool or await open_queue_pool()
 
 
 async def startup(ctx):
-    logging.info(
-        f"Starting Redis connection pool {settings.REDIS_HOST}:{settings.REDIS_PORT}",
-    )
-    ctx["session"] = await get_queue_connection()
-    ctx["crud_account"] = get_crud_account()
-    ctx["crud_currency"] = get_crud_currency()
-    ctx["crud_user_currency"] = get_crud_user_currency()
-    ctx["crud_transaction"] = get_crud_transaction()
-    ctx["crud_category"] = get_crud_category()
-    ctx["crud_user_category"] = get_crud_user_category()
-    ctx["crud_rules"] = get_crud_rules()
-    ctx["crud_user"] = get_crud_auth_user()
+    global queue_pool
+    # arq already opened a pool for the worker, reuse it rather than a second one
+    queue_pool = ctx["redis"]
+    ctx["session"] = queue_pool
+
+
+async def on_job_start(ctx):
+    # arq hands every job its own copy of ctx, so these sessions are job-scoped
+    db = SessionLocal()
+    ctx["db"] = db
+    ctx["async_db"] = AsyncSessionLocal()
+    ctx["crud_account"] = get_crud_account(db=db)
+    ctx["crud_currency"] = get_crud_currency(db=db)
+    ctx["crud_user_currency"] = get_crud_user_currency(db=db)
+    ctx["crud_category"] = get_crud_category(db=db)
+    ctx["crud_user_category"] = get_crud_user_category(db=db)
+    ctx["crud_user"] = get_crud_auth_user(db=db)
+
+
+async def on_job_end(ctx):
+    ctx["db"].close()
+    await ctx["async_db"].close()
 
 
 async def shutdown(ctx):
-    await ctx["session"]
+    # The pool itself belongs to the worker, which closes it after this
+    await close_http_clients()
+    close_producer()
 
 
 class WorkerSettings:
     on_startup = startup
+    on_shutdown = shutdown
+    on_job_start = on_job_start
+    on_job_end = on_job_end
     redis_settings = REDIS_SETTINGS
     functions = registered_tasks
+    # Backstop for relay jobs that were never enqueued or ran out of time
+    cron_jobs = [
+        cron(relay_outbox_events, second=set(range(0, 60, 10)), run_at_startup=True),
+        cron(update_user_last_activity),
+        cron(refresh_exchange_rates, minute=0, run_at_startup=True),
+        cron(reconcile_daily_spend, hour=3, minute=30),
+    ]
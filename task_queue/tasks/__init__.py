@@ -1,8 +1,11 @@
+from arq import func
+
 from task_queue.tasks.account import add_default_accounts, add_default_currency
+from task_queue.tasks.budget import reconcile_daily_spend_users
 from task_queue.tasks.category import add_user_default_categories
 from task_queue.tasks.currency import update_currencies_exchange_rate
 from task_queue.tasks.mono import retrieve_user_mono_transactions
-from task_queue.tasks.user import update_user_last_activity
+from task_queue.tasks.outbox import relay_outbox_events
 
 
 registered_tasks = [
@@ -11,5 +14,7 @@ registered_tasks = [
     add_default_accounts,
     update_currencies_exchange_rate,
     add_user_default_categories,
-    update_user_last_activity,
+    reconcile_daily_spend_users,
+    # No stored result, so the fixed job id can be reused straight away
+    func(relay_outbox_events, keep_result=0),
 ]
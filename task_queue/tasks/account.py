@@ -4,6 +4,7 @@ from crud.currency import CRUDCurrency, CRUDUserCurrency
 from schemas.account import AccountCreate
 from schemas.currency import UserCurrencyCreate
 from schemas.enums import AccountCategoryEnum, AccountCategoryEnum, AccountTypeEnum
+from services.user_context import ACCOUNTS, CURRENCIES, user_context_cache
 
 
 async def add_default_currency(ctx, user_id):
@@ -19,6 +20,7 @@ async def add_default_currency(ctx, user_id):
         is_default=True,
     )
     crud_user_currency.create(user_currency)
+    await user_context_cache.invalidate(user_id, CURRENCIES)
 
 
 async def add_default_accounts(ctx, user_id):
@@ -46,3 +48,4 @@ async def add_default_accounts(ctx, user_id):
             amount_in_default=0,
         )
         crud_account.create(account_obj)
+    await user_context_cache.invalidate(user_id, ACCOUNTS)
@@ -0,0 +1,43 @@
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+from arq import ArqRedis
+
+from core import settings
+from crud.budget import get_async_crud_daily_spend
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_daily_spend(ctx):
+    # The triggers keep daily_spend exact, this catches anything that bypassed them
+    crud_daily_spend = get_async_crud_daily_spend(db=ctx["async_db"])
+    queue_connection: ArqRedis = ctx["session"]
+    since = (
+        datetime.now(timezone.utc) - timedelta(days=settings.DAILY_SPEND_RECONCILE_DAYS)
+    ).date()
+
+    user_ids = await crud_daily_spend.get_users_to_reconcile(since=since)
+    chunk_size = settings.DAILY_SPEND_RECONCILE_CHUNK_SIZE
+    # One job per chunk, so a large user base can't run the cron past its
+    # timeout and leave the users at the end unreconciled
+    for start in range(0, len(user_ids), chunk_size):
+        await queue_connection.enqueue_job(
+            "reconcile_daily_spend_users",
+            user_ids=user_ids[start : start + chunk_size],
+            since=since,
+            _job_id=f"reconcile_daily_spend:{since}:{start}",
+        )
+    logger.info(f"Queued daily spend reconcile for {len(user_ids)} users")
+
+
+async def reconcile_daily_spend_users(ctx, user_ids: list[int], since: date):
+    crud_daily_spend = get_async_crud_daily_spend(db=ctx["async_db"])
+    corrected = 0
+    for user_id in user_ids:
+        corrected += await crud_daily_spend.reconcile(user_id=user_id, since=since)
+
+    if corrected:
+        logger.warning(f"Corrected {corrected} daily spend rows")
+    logger.info(f"Reconciled daily spend for {len(user_ids)} users")
+    return corrected
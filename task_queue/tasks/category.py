@@ -1,4 +1,5 @@
 from crud.category import CRUDCategory, CRUDUserCategory
+from services.user_context import CATEGORIES, user_context_cache
 
 
 async def add_user_default_categories(ctx, user_id: int):
@@ -9,4 +10,5 @@ async def add_user_default_categories(ctx, user_id: int):
     user_default_categories = [
         {"user_id": user_id, "category_id": cat.id} for cat in default_categories
     ]
-    crud_user_category.bulk_insert(user_default_categories)
\ No newline at end of file
+    crud_user_category.bulk_insert(user_default_categories)
+    await user_context_cache.invalidate(user_id, CATEGORIES)
\ No newline at end of file
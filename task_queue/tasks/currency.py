@@ -1,6 +1,7 @@
 from core.exceptions import MissingResource
 from crud.currency import CRUDCurrency, CRUDUserCurrency
 from schemas.currency import UserCurrencyUpdate
+from services.user_context import CURRENCIES, user_context_cache
 from utils.currency_conversion import change_default_currency
 from utils.helper import convert_sql_models_to_dict
 
@@ -24,3 +25,4 @@ async def update_currencies_exchange_rate(ctx, user_id, currency_code: str):
             exchange_rate=rates["exchange_rate"],
         )
         crud_user_currency.update(id=rates["id"], data_obj=user_currency_update)
+    await user_context_cache.invalidate(user_id, CURRENCIES)
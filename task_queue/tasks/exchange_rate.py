@@ -0,0 +1,10 @@
+import logging
+
+from services.exchange_rate import exchange_rate_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_exchange_rates(ctx):
+    rates = await exchange_rate_cache.refresh()
+    logger.info(f"Refreshed exchange rates for {len(rates)} currencies")
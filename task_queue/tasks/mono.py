@@ -1,5 +1,11 @@
 from datetime import date
 from core.externals.mono.mono_client import get_mono_client
+from crud.account import get_async_crud_account
+from crud.category import get_async_crud_category, get_async_crud_user_category
+from crud.currency import get_async_crud_currency, get_async_crud_user_currency
+from crud.outbox import get_async_crud_outbox
+from crud.rules import get_async_crud_rules
+from crud.transaction import get_async_crud_transaction
 
 
 # TODO: Rename this function
@@ -10,19 +16,45 @@ async def retrieve_user_mono_transactions(
     account_id: int,
     start_date: date = None,
 ) -> None:
-    from api.dependencies.service import get_transaction_service
+    from api.dependencies.service import (
+        get_account_service,
+        get_category_service,
+        get_currency_service,
+        get_transaction_service,
+    )
 
     mono_client = get_mono_client()
+    db = ctx["async_db"]
+    crud_account = get_async_crud_account(db=db)
+    crud_currency = get_async_crud_currency(db=db)
+    crud_user_currency = get_async_crud_user_currency(db=db)
+    crud_category = get_async_crud_category(db=db)
+    crud_user_category = get_async_crud_user_category(db=db)
     transaction_service = get_transaction_service(
-        crud_transaction=ctx["crud_transaction"],
-        crud_user_currency=ctx["crud_user_currency"],
-        crud_account=ctx["crud_account"],
-        crud_user_category=ctx["crud_user_category"],
+        crud_transaction=get_async_crud_transaction(db=db),
+        queue_connection=ctx["session"],
+        crud_user_currency=crud_user_currency,
+        crud_account=crud_account,
+        crud_user_category=crud_user_category,
         mono_client=mono_client,
-        crud_rules=ctx["crud_rules"],
-        crud_category=ctx["crud_category"],
+        crud_rules=get_async_crud_rules(db=db),
+        crud_category=crud_category,
+        crud_outbox=get_async_crud_outbox(db=db),
+        account_service=get_account_service(
+            crud_account=crud_account,
+            crud_currency=crud_currency,
+            crud_user_currency=crud_user_currency,
+        ),
+        currency_service=get_currency_service(
+            crud_currency=crud_currency,
+            crud_user_currency=crud_user_currency,
+            queue_connection=ctx["session"],
+        ),
+        category_service=get_category_service(
+            crud_category=crud_category,
+            crud_user_category=crud_user_category,
+        ),
     )
-    # TODO: Handle deduplication of transactions here
     await transaction_service.create_mono_transactions(
         mono_account_id=mono_account_id,
         user_id=user_id,
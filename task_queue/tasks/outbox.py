@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from itertools import groupby
+from operator import attrgetter
+
+from core import settings
+from crud.outbox import get_async_crud_outbox
+from models.outbox import OutboxEvent
+from services.kafka_producer import flush_producer, publish_many
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = 500
+
+
+def _collect_delivered(events: list[OutboxEvent], delivered: list[int]):
+    def on_delivery(index, err):
+        if err is None:
+            delivered.append(events[index].id)
+
+    return on_delivery
+
+
+async def relay_outbox_events(ctx):
+    crud_outbox = get_async_crud_outbox(db=ctx["async_db"])
+    relayed = 0
+    while True:
+        events = await crud_outbox.claim_pending_events(limit=OUTBOX_BATCH_SIZE)
+        if not events:
+            break
+
+        delivered: list[int] = []
+        for topic, batch in groupby(events, key=attrgetter("topic")):
+            batch = list(batch)
+            # Blocks while librdkafka's queue is full, keep it off the event loop
+            await asyncio.to_thread(
+                publish_many,
+                topic=topic,
+                events=[event.payload for event in batch],
+                on_delivery=_collect_delivered(batch, delivered),
+            )
+        # Wait for broker acks off the event loop, unacked rows stay for the next run
+        await asyncio.to_thread(
+            flush_producer, settings.KAFKA_CONFIG.KAFKA_FLUSH_TIMEOUT
+        )
+        await crud_outbox.delete_events(delivered)
+        relayed += len(delivered)
+
+        if len(delivered) < len(events):
+            logger.warning(
+                f"{len(events) - len(delivered)} outbox events were not delivered, "
+                "leaving them for the next run"
+            )
+            break
+        if len(events) < OUTBOX_BATCH_SIZE:
+            break
+
+    if relayed:
+        logger.info(f"Relayed {relayed} outbox events")
+    return relayed
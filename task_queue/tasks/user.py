@@ -1,30 +1,32 @@
 import logging
 from datetime import datetime, timedelta, timezone
+from arq import ArqRedis
 from crud.account import CRUDAccount
 from crud.user import CRUDAuthUser
+from services.user_activity import pop_user_activity
 
 logger = logging.getLogger(__name__)
 
 
-async def update_user_last_activity(ctx, user_id: int):
-
-    from task_queue.main import get_queue_connection
-
+async def update_user_last_activity(ctx):
+    # Runs on a cron, writing everything the API recorded since the last run
     crud_user: CRUDAuthUser = ctx["crud_user"]
     crud_account: CRUDAccount = ctx["crud_account"]
-    queue_connection = await get_queue_connection()
-    user = crud_user.get(id=user_id)
-    user_automatic_accounts = crud_account.get_automatic_accounts(user_id=user_id)
+    queue_connection: ArqRedis = ctx["session"]
 
-    if not user_automatic_accounts:
-        logger.info(f"No automatic accounts found for user {user_id}")
+    activity = await pop_user_activity(queue_connection)
+    if not activity:
         return
+    previous = crud_user.update_last_activity(activity)
 
-    if user.last_activity_time and (
-        datetime.now(timezone.utc) - user.last_activity_time
-    ) > timedelta(days=1):
+    for user_id, last_activity_time in previous.items():
+        # Users returning after a day away get their bank transactions synced
+        if not last_activity_time or (
+            datetime.now(timezone.utc) - last_activity_time
+        ) <= timedelta(days=1):
+            continue
 
-        for account in user_automatic_accounts:
+        for account in crud_account.get_automatic_accounts(user_id=user_id):
             await queue_connection.enqueue_job(
                 "retrieve_user_mono_transactions",
                 user_id=user_id,
@@ -33,8 +35,5 @@ async def update_user_last_activity(ctx, user_id: int):
                 start_date=datetime.now(timezone.utc),
             )
 
-    crud_user.update(
-        id=user_id, data_obj={"last_activity_time": datetime.now(timezone.utc)}
-    )
-    logger.info(f"Updated last activity time for user {user_id}")
+    logger.info(f"Updated last activity time for {len(previous)} users")
     return
@@ -1,5 +1,30 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from dateutil.relativedelta import relativedelta
+
+from schemas.enums import BudgetPeriodEnum
 
 
 def get_utc_now():
     return datetime.now(timezone.utc)
+
+
+def get_period_bounds(
+    period: BudgetPeriodEnum, tz: str, today: Optional[date] = None
+) -> tuple[date, date]:
+    """First local day of the calendar period containing today in tz, and
+    the first day after it. Weeks start on Monday.
+
+    Raises ValueError for an unknown period.
+    """
+    period = BudgetPeriodEnum(period)
+    today = today or datetime.now(ZoneInfo(tz)).date()
+    if period == BudgetPeriodEnum.DAILY:
+        return today, today + timedelta(days=1)
+    if period == BudgetPeriodEnum.WEEKLY:
+        start = today - timedelta(days=today.weekday())
+        return start, start + timedelta(weeks=1)
+    start = today.replace(day=1)
+    return start, start + relativedelta(months=1)
@@ -1,3 +1,5 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
 from sqlalchemy.inspection import inspect
 import json
 from pathlib import Path
@@ -44,6 +46,20 @@ def convert_sql_models_to_dict(obj, visited=None) -> dict:
     return result
 
 
+def encode_cursor(date: datetime, id: int) -> str:
+    """Encode a (date, id) keyset position into an opaque pagination cursor."""
+    return urlsafe_b64encode(f"{date.isoformat()}|{id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor made by encode_cursor, raising ValueError if it is malformed."""
+    try:
+        date, id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(date), int(id)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
 def extract_beneficiary(narration: str) -> str:
     """
     Extracts the beneficiary from Mono bank transaction narration.